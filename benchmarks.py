@@ -0,0 +1,951 @@
+"""
+USB Safe Ejector Pro - Benchmarks
+Mede detecção, varredura de bloqueios, ejeção e montagem sobre o SimulatedBackend
+(sem hardware real; roda em Linux sem pywin32/psutil).
+
+Uso:
+    python benchmarks.py                       # tabela legível
+    python benchmarks.py --json                # resultados em JSON
+    python benchmarks.py --json --output r.json  # gravar para comparar entre commits
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import platform
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+from usb_ejector import USBEjector, WMITopology, LockScanner, EjectMetrics, ProgressAnimator
+from simulated_backend import SimulatedBackend
+from linux_backend import LinuxBackend, LinuxEjector, ProcLockScanner
+from usage_chart import UsageChart, ChartImageCache, RING_RADIUS, INNER_RADIUS, CHART_FONT
+
+
+# =========================
+# FAKE WMI
+# =========================
+
+class FakeWMIService:
+    """SWbemServices falso: conta consultas e simula latência por round trip"""
+
+    def __init__(self, n_devices: int, partitions_per_disk: int = 2,
+                 unmounted_every: int = 4, latency: float = 0.002):
+        self.latency = latency
+        self.queries = 0
+        self.disks = []
+        self.disk_parts = []
+        self.logical_parts = []
+
+        # Disco 0 = disco interno do sistema
+        self._add_disk(0, "NVMe SSD", "SCSI", "Fixed hard disk media", 1, mounted=True)
+        for i in range(1, n_devices + 1):
+            mounted = unmounted_every <= 0 or i % unmounted_every != 0
+            self._add_disk(i, f"USB Stick {i}", "USB", "Removable Media",
+                           partitions_per_disk, mounted=mounted)
+
+    def _add_disk(self, index, model, interface, media, n_parts, mounted):
+        disk_id = f"\\\\.\\PHYSICALDRIVE{index}"
+        self.disks.append(SimpleNamespace(
+            DeviceID=disk_id, Index=index, Model=model, Size=16 * 1024 ** 3,
+            InterfaceType=interface, MediaType=media
+        ))
+        escaped_disk = disk_id.replace("\\", "\\\\")
+        for p in range(n_parts):
+            part_id = f"Disk #{index}, Partition #{p}"
+            self.disk_parts.append(SimpleNamespace(
+                Antecedent=f'\\\\BENCH\\root\\cimv2:Win32_DiskDrive.DeviceID="{escaped_disk}"',
+                Dependent=f'\\\\BENCH\\root\\cimv2:Win32_DiskPartition.DeviceID="{part_id}"',
+            ))
+            if mounted:
+                letter = chr(ord("C") + (index * n_parts + p) % 24)
+                self.logical_parts.append(SimpleNamespace(
+                    Antecedent=f'\\\\BENCH\\root\\cimv2:Win32_DiskPartition.DeviceID="{part_id}"',
+                    Dependent=f'\\\\BENCH\\root\\cimv2:Win32_LogicalDisk.DeviceID="{letter}:"',
+                ))
+
+    def ExecQuery(self, wql: str):
+        self.queries += 1
+        time.sleep(self.latency)
+        if "FROM Win32_DiskDriveToDiskPartition" in wql:
+            return list(self.disk_parts)
+        if "FROM Win32_LogicalDiskToPartition" in wql:
+            return list(self.logical_parts)
+        if wql.startswith("ASSOCIATORS OF {Win32_DiskDrive."):
+            disk_id = wql.split("'")[1].replace("\\\\", "\\")
+            return [
+                SimpleNamespace(DeviceID=WMITopology._path_device_id(a.Dependent))
+                for a in self.disk_parts
+                if WMITopology._path_device_id(a.Antecedent) == disk_id
+            ]
+        if wql.startswith("ASSOCIATORS OF {Win32_DiskPartition."):
+            part_id = wql.split("'")[1]
+            return [
+                SimpleNamespace(DeviceID=WMITopology._path_device_id(a.Dependent))
+                for a in self.logical_parts
+                if WMITopology._path_device_id(a.Antecedent) == part_id
+            ]
+        if "FROM Win32_DiskDrive" in wql:
+            if "InterfaceType='USB'" in wql:
+                return [d for d in self.disks if d.InterfaceType == "USB"]
+            return list(self.disks)
+        return []
+
+
+def _legacy_refresh(svc) -> None:
+    """Padrão antigo: ASSOCIATORS OF por disco e por partição (referência)"""
+    for query in (
+        "SELECT * FROM Win32_DiskDrive WHERE InterfaceType='USB' AND MediaType='Removable Media'",
+        "SELECT * FROM Win32_DiskDrive WHERE InterfaceType='USB'",
+    ):
+        for disk in svc.ExecQuery(query):
+            disk_id = disk.DeviceID.replace("\\", "\\\\")
+            for partition in svc.ExecQuery(
+                f"ASSOCIATORS OF {{Win32_DiskDrive.DeviceID='{disk_id}'}} "
+                f"WHERE AssocClass=Win32_DiskDriveToDiskPartition"
+            ):
+                svc.ExecQuery(
+                    f"ASSOCIATORS OF {{Win32_DiskPartition.DeviceID='{partition.DeviceID}'}} "
+                    f"WHERE AssocClass=Win32_LogicalDiskToPartition"
+                )
+    # get_unmounted_usb_drives repetia a consulta de discos
+    svc.ExecQuery("SELECT * FROM Win32_DiskDrive WHERE InterfaceType='USB'")
+
+
+def _topology_refresh(svc) -> None:
+    """Padrão novo: um snapshot serve detecção montada e não montada"""
+    topology = WMITopology.query(svc)
+    for disk in topology.usb_disks(removable_only=True):
+        topology.letters_for(disk)
+    [d for d in topology.usb_disks() if not topology.is_mounted(d)]
+
+
+def bench_wmi_topology(device_counts=(1, 2, 4, 8, 16, 32, 64),
+                       latency: float = 0.002) -> List[Dict]:
+    results = []
+    for n in device_counts:
+        row = {"devices": n, "latency_per_query_ms": latency * 1000}
+        for name, fn in (("legacy", _legacy_refresh), ("topology", _topology_refresh)):
+            svc = FakeWMIService(n, latency=latency)
+            start = time.perf_counter()
+            fn(svc)
+            row[f"{name}_queries"] = svc.queries
+            row[f"{name}_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        results.append(row)
+    return results
+
+
+# =========================
+# LOCK SCAN
+# =========================
+
+def process_backend(n: int, lockers: int = 2, latency: float = 0.0005) -> SimulatedBackend:
+    """n processos; `lockers` deles (espalhados pela tabela) seguram arquivos em E:"""
+    backend = SimulatedBackend(latencies={"open_files": latency})
+    locker_slots = {(i + 1) * n // (lockers + 1) for i in range(lockers)}
+    for i in range(n):
+        files = [f"C:\\Users\\bench\\file{i}.txt"]
+        if i in locker_slots:
+            files.append(f"E:\\dados\\planilha{i}.xlsx")
+        backend.add_process(f"proc{i}.exe", files, denied=(i % 10 == 0))
+    return backend
+
+
+def _legacy_lock_scan(procs, drive_path: str = "E:\\") -> int:
+    """Varredura serial original de find_locking_processes (referência)"""
+    found = 0
+    for proc in procs:
+        try:
+            for f in proc.open_files():
+                if f.path.upper().startswith(drive_path):
+                    found += 1
+                    break
+        except Exception:
+            pass
+    return found
+
+
+def bench_lock_scan(process_counts=(50, 200, 500, 1000, 2000),
+                    latency: float = 0.0005) -> List[Dict]:
+    results = []
+    for n in process_counts:
+        backend = process_backend(n, latency=latency)
+        row = {"processes": n, "open_files_ms": latency * 1000}
+        
+        start = time.perf_counter()
+        row["legacy_found"] = _legacy_lock_scan(backend.process_iter())
+        row["legacy_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        
+        scanner = LockScanner.for_backend(backend)
+        start = time.perf_counter()
+        row["parallel_found"] = len(scanner.scan({"E"})["E"])
+        row["parallel_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        
+        scanner = LockScanner.for_backend(backend)
+        start = time.perf_counter()
+        scanner.scan({"E"}, first_only=True)
+        row["any_lock_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        results.append(row)
+    return results
+
+
+# =========================
+# BACKEND SIMULADO (fluxos completos)
+# =========================
+
+# Latências por chamada aproximando um Windows real com pendrives USB 3.0
+SIM_LATENCIES = {
+    "logical_drives": 0.0002, "drive_type": 0.0003, "volume_information": 0.001,
+    "disk_free_space": 0.001, "disk_partitions": 0.002, "wmi_connect": 0.02,
+    "wmi_query": 0.004, "open_files": 0.0003, "open_volume": 0.002, "flush": 0.02,
+    "ioctl": 0.001, "lock": 0.005, "dismount": 0.01, "eject": 0.05, "diskpart": 0.3,
+    "physical_drives": 0.0002, "open_disk": 0.002, "query_property": 0.001,
+    "disk_length": 0.001, "drive_layout": 0.001, "disk_extents": 0.001,
+}
+
+
+def _sim_backend(mounted: int, unmounted: int = 0, processes: int = 0) -> SimulatedBackend:
+    backend = SimulatedBackend(latencies=SIM_LATENCIES)
+    for i in range(mounted):
+        backend.add_disk(f"USB Stick {i + 1}", removable=(i % 3 != 2))
+    for i in range(unmounted):
+        backend.add_disk(f"USB Offline {i + 1}", mounted=False)
+    for i in range(processes):
+        backend.add_process(f"proc{i}.exe", [f"C:\\Users\\bench\\file{i}.txt"])
+    USBEjector.use_backend(backend)
+    return backend
+
+
+def bench_refresh(device_counts=(1, 2, 4, 8, 16)) -> List[Dict]:
+    """get_removable_drives + get_unmounted_usb_drives (um refresh do GUI)"""
+    results = []
+    for n in device_counts:
+        backend = _sim_backend(mounted=n, unmounted=max(n // 4, 1))
+        start = time.perf_counter()
+        devices = USBEjector.get_removable_drives(deadline=10.0)
+        mounted_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        unmounted = USBEjector.get_unmounted_usb_drives()
+        unmounted_ms = (time.perf_counter() - start) * 1000
+        results.append({
+            "devices": n, "found": len(devices), "unmounted_found": len(unmounted),
+            "mounted_ms": round(mounted_ms, 2), "unmounted_ms": round(unmounted_ms, 2),
+            "total_ms": round(mounted_ms + unmounted_ms, 2),
+            "backend_calls": sum(backend.calls.values()),
+        })
+    return results
+
+
+def bench_eject(trials: int = 5, processes: int = 200) -> List[Dict]:
+    """Latência de ejeção por modo (seguro inclui a varredura de bloqueios)"""
+    results = []
+    for mode in ("fast", "safe"):
+        USBEjector.eject_metrics = EjectMetrics()
+        timings = []
+        ok = 0
+        for _ in range(trials):
+            _sim_backend(mounted=1, processes=processes)
+            letter = USBEjector.backend.logical_drives()[-1]
+            start = time.perf_counter()
+            success, _, _ = USBEjector.eject_drives([letter], safe_mode=(mode == "safe"))[letter]
+            timings.append((time.perf_counter() - start) * 1000)
+            ok += success
+        steps = USBEjector.eject_metrics.summary().get(mode, {})
+        timings.sort()
+        results.append({
+            "mode": mode, "trials": trials, "ok": ok,
+            "p50_ms": round(timings[len(timings) // 2], 2), "max_ms": round(timings[-1], 2),
+            **{f"{step}_p50_ms": data["p50_ms"] for step, data in steps.items() if step != "total"},
+        })
+    return results
+
+
+def bench_lock_retry(hold_times=(0.0, 0.2, 0.8, 2.0), trials: int = 3) -> List[Dict]:
+    """Modo seguro com um handle transitório no volume: tentativa única × lock com prazo"""
+    results = []
+    saved = USBEjector.lock_deadline
+    try:
+        for deadline in (0.0, saved):
+            USBEjector.lock_deadline = deadline
+            for hold in hold_times:
+                timings = []
+                ok = 0
+                for _ in range(trials):
+                    backend = _sim_backend(mounted=1)
+                    letter = backend.logical_drives()[-1]
+                    if hold:
+                        backend.add_process("MsMpEng.exe", [f"{letter}:\\scan.tmp"], lifetime=hold)
+                    start = time.perf_counter()
+                    success, _ = USBEjector.eject_drive(letter, safe_mode=True)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    ok += success
+                timings.sort()
+                results.append({
+                    "lock_deadline_s": deadline, "hold_s": hold, "trials": trials,
+                    "first_attempt_ok": ok, "lock_calls": backend.calls.get("lock", 0),
+                    "p50_ms": round(timings[len(timings) // 2], 2),
+                })
+    finally:
+        USBEjector.lock_deadline = saved
+    return results
+
+
+def bench_flush_progress(dirty_mb=(16, 64, 256), write_rate_mb: float = 128.0) -> List[Dict]:
+    """Flush de dados pendentes: atualizações de progresso e maior intervalo com a barra parada"""
+    results = []
+    for mb in dirty_mb:
+        backend = _sim_backend(mounted=1)
+        letter = backend.logical_drives()[-1]
+        backend.add_dirty(letter, mb * 1024 ** 2, write_rate_mb * 1024 ** 2)
+        stamps = []
+        infos = []
+        
+        def progress(percent, info=None):
+            stamps.append(time.perf_counter())
+            if info and info.get("stage") == "flush":
+                infos.append(info)
+        
+        start = time.perf_counter()
+        success, _ = USBEjector.eject_drive(letter, progress)
+        total = time.perf_counter() - start
+        gaps = [b - a for a, b in zip([start] + stamps, stamps)]
+        first_eta = next((i["eta"] for i in infos if i["eta"] is not None), None)
+        results.append({
+            "dirty_mb": mb, "ok": success, "total_ms": round(total * 1000, 1),
+            "updates": len(stamps), "flush_updates": len(infos),
+            "max_frozen_ms": round(max(gaps) * 1000, 1),
+            "first_eta_s": round(first_eta, 2) if first_eta is not None else None,
+            "flush_mb": round(infos[-1]["bytes"] / 1024 ** 2, 1) if infos else 0,
+        })
+    return results
+
+
+def bench_auto_mode(trials: int = 3) -> List[Dict]:
+    """Modo auto: caminho escolhido e latência por cenário, comparado a rápido e seguro"""
+    def idle(backend, letter):
+        pass
+
+    def writing(backend, letter):
+        backend.start_writes(letter, duration=5.0)
+
+    def written_recently(backend, letter):
+        backend.start_writes(letter, duration=0.05)
+        USBEjector.io_activity.observe()
+        time.sleep(0.1)
+
+    def dirty_cache(backend, letter):
+        backend.add_dirty(letter, 8 * 1024 ** 2, 64 * 1024 ** 2)
+
+    scenarios = {"idle": idle, "writing": writing, "written_recently": written_recently,
+                 "dirty_cache": dirty_cache}
+    results = []
+    for name, setup in scenarios.items():
+        for mode in ("fast", "safe", "auto"):
+            for warm in ((False, True) if mode == "auto" else (False,)):
+                USBEjector.eject_metrics = EjectMetrics()
+                timings = []
+                ok = 0
+                for _ in range(trials):
+                    backend = _sim_backend(mounted=1, processes=200)
+                    letter = backend.logical_drives()[-1]
+                    setup(backend, letter)
+                    if warm:
+                        USBEjector.io_activity.observe()  # Leitura periódica do GUI
+                    start = time.perf_counter()
+                    success, _, _ = USBEjector.eject_drives([letter], mode=mode)[letter]
+                    timings.append((time.perf_counter() - start) * 1000)
+                    ok += success
+                timings.sort()
+                summary = USBEjector.eject_metrics.summary()
+                results.append({
+                    "scenario": name, "mode": mode + (" (base recente)" if warm else ""),
+                    "ok": ok, "path": "/".join(sorted(summary)) or "-",
+                    "p50_ms": round(timings[len(timings) // 2], 2),
+                })
+    return results
+
+
+class _UILoop:
+    """Loop de eventos mínimo no estilo Tk: after(ms, fn) chamável de qualquer thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue: list = []
+        self._seq = 0
+        self.handlers = 0
+
+    def after(self, ms: int, fn):
+        with self._lock:
+            heapq.heappush(self._queue, (time.perf_counter() + ms / 1000, self._seq, fn))
+            self._seq += 1
+
+    def run(self, until):
+        """Executar callbacks até until() e a fila esvaziar"""
+        while True:
+            with self._lock:
+                due = self._queue[0][0] if self._queue else None
+                if due is not None and due <= time.perf_counter():
+                    _, _, fn = heapq.heappop(self._queue)
+                else:
+                    fn = None
+            if fn is not None:
+                fn()
+                self.handlers += 1
+            elif due is None and until():
+                return
+            else:
+                time.sleep(0.001 if due is None else min(max(due - time.perf_counter(), 0), 0.005))
+
+
+def bench_progress_animation(drive_counts=(1, 4, 8), fps: int = 30,
+                             apply_cost: float = 0.0002) -> List[Dict]:
+    """Ejeção simultânea com dados pendentes: quadros, quadros perdidos e CPU do animador"""
+    results = []
+    for n in drive_counts:
+        backend = _sim_backend(mounted=n)
+        letters = backend.logical_drives()[-n:]
+        for i, letter in enumerate(letters):
+            backend.add_dirty(letter, (16 + 16 * i) * 1024 ** 2, 64 * 1024 ** 2)
+        loop = _UILoop()
+        
+        def apply(letter, value):
+            time.sleep(apply_cost)  # place_configure + redesenho da barra
+        
+        anim = ProgressAnimator(loop.after, apply, fps=fps)
+        callbacks = [0]
+        done = threading.Event()
+        
+        def progress(letter, percent, info=None):
+            callbacks[0] += 1
+            loop.after(0, lambda: anim.set_target(letter, percent))
+        
+        def _eject():
+            try:
+                USBEjector.eject_drives(letters, progress)
+            finally:
+                done.set()
+        
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        threading.Thread(target=_eject, daemon=True).start()
+        loop.run(lambda: done.is_set() and not anim.running)
+        stats = anim.stats()
+        results.append({
+            "drives": n, "callbacks": callbacks[0], "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+            "process_cpu_ms": round((time.process_time() - cpu_start) * 1000, 1),
+            **stats,
+        })
+    return results
+
+
+class _ChartTheme:
+    """Cores usadas pelo gráfico (mesmos nomes do DesignSystem.Colors.Dark)"""
+    BG_SECONDARY = "#1a1a1a"
+    TEXT_PRIMARY = "#ffffff"
+    SPACE_OK = "#1e88e5"
+    SPACE_WARNING = "#ffa726"
+    SPACE_CRITICAL = "#e53935"
+    SPACE_FREE = "#2a2a2a"
+
+
+class _RecordingCanvas:
+    """Canvas falso: conta as operações que chegariam ao Tcl"""
+
+    def __init__(self):
+        self.ops = 0
+        self._next = 0
+
+    def _create(self, *args, **kwargs) -> int:
+        self.ops += 1
+        self._next += 1
+        return self._next
+
+    create_oval = create_arc = create_text = create_image = _create
+
+    def itemconfigure(self, *args, **kwargs):
+        self.ops += 1
+
+    def delete(self, *args):
+        self.ops += 1
+
+
+def _legacy_draw_chart(canvas, percent: int, color: str, theme) -> None:
+    """draw_chart original: apaga tudo e recria os itens (referência)"""
+    canvas.delete("all")
+    c, r, ir = 16, RING_RADIUS, INNER_RADIUS
+    canvas.create_oval(c - r, c - r, c + r, c + r, fill=theme.SPACE_FREE, outline="")
+    if percent > 0:
+        canvas.create_arc(c - r, c - r, c + r, c + r, start=90, extent=-360 * (percent / 100),
+                          fill=color, outline="")
+    canvas.create_oval(c - ir, c - ir, c + ir, c + ir, fill=theme.BG_SECONDARY, outline="")
+    canvas.create_text(c, c, text=f"{percent}%", fill=theme.TEXT_PRIMARY, font=CHART_FONT)
+
+
+def _chart_usage(card: int, refresh: int) -> int:
+    """Uso do card em cada refresh: ~1 em 10 cards muda de percentual por refresh"""
+    return (card * 7 + (refresh + card) // 10) % 101
+
+
+def _chart_color(percent: int, theme) -> str:
+    return theme.SPACE_CRITICAL if percent >= 90 else theme.SPACE_WARNING if percent >= 80 else theme.SPACE_OK
+
+
+def _tk_canvases(n: int):
+    """n canvases reais num Tk oculto; None sem display"""
+    try:
+        import tkinter
+        root = tkinter.Tk()
+    except Exception:
+        return None, None
+    root.withdraw()
+    return root, [tkinter.Canvas(root, width=32, height=32) for _ in range(n)]
+
+
+def bench_chart_render(card_counts=(1, 10, 25, 50, 100), refreshes: int = 20) -> List[Dict]:
+    """Tempo de render dos gráficos por refresh: redesenho completo × UsageChart em cache"""
+    theme = _ChartTheme
+    results = []
+    for n in card_counts:
+        row: Dict = {"cards": n}
+        for name in ("legacy", "cached"):
+            canvases = [_RecordingCanvas() for _ in range(n)]
+            charts = [UsageChart(c) for c in canvases]
+            start = time.perf_counter()
+            for r in range(refreshes):
+                for i in range(n):
+                    percent = _chart_usage(i, r)
+                    if name == "legacy":
+                        _legacy_draw_chart(canvases[i], percent, _chart_color(percent, theme), theme)
+                    else:
+                        charts[i].render(percent, _chart_color(percent, theme), theme)
+            row[f"{name}_ops_per_refresh"] = round(sum(c.ops for c in canvases) / refreshes, 1)
+            row[f"{name}_py_ms"] = round((time.perf_counter() - start) * 1000 / refreshes, 3)
+        
+        root, canvases = _tk_canvases(n)
+        if root is None:
+            row["tk"] = "indisponível (sem display)"
+        else:
+            try:
+                images = ChartImageCache.shared()
+                for name in ("legacy", "cached"):
+                    charts = [UsageChart(c, images if name == "cached" else None) for c in canvases]
+                    start = time.perf_counter()
+                    for r in range(refreshes):
+                        for i in range(n):
+                            percent = _chart_usage(i, r)
+                            if name == "legacy":
+                                _legacy_draw_chart(canvases[i], percent, _chart_color(percent, theme), theme)
+                            else:
+                                charts[i].render(percent, _chart_color(percent, theme), theme)
+                        root.update_idletasks()
+                    row[f"{name}_tk_ms"] = round((time.perf_counter() - start) * 1000 / refreshes, 3)
+                    for c in canvases:
+                        c.delete("all")
+                row["pillow"] = images is not None
+            finally:
+                root.destroy()
+        results.append(row)
+    return results
+
+
+def _widget_names(root) -> set:
+    names, stack = set(), [root]
+    while stack:
+        widget = stack.pop()
+        names.add(str(widget))
+        stack.extend(widget.winfo_children())
+    return names
+
+
+def _open_gui(backend: SimulatedBackend):
+    """Janela real sobre o backend simulado (mesma montagem dos testes); str se indisponível"""
+    try:
+        from tests.conftest import open_gui
+    except ImportError as e:
+        return f"indisponível ({type(e).__name__})"
+    return open_gui(backend)
+
+
+def bench_theme_switch(device_counts=(4, 16), switches: int = 6) -> List[Dict]:
+    """Troca de tema com a janela aberta: chamadas ao backend e widgets recriados devem ser 0"""
+    results = []
+    for n in device_counts:
+        backend = _sim_backend(n)
+        gui = _open_gui(backend)
+        if isinstance(gui, str):
+            return [{"gui": gui}]
+        try:
+            calls_before = sum(backend.calls.values())
+            widgets_before = _widget_names(gui.root)
+            start = time.perf_counter()
+            for _ in range(switches):
+                gui.toggle_theme()
+            elapsed = time.perf_counter() - start
+            gui.root.update()
+            results.append({
+                "devices": n,
+                "switch_ms": round(elapsed * 1000 / switches, 2),
+                "backend_calls": sum(backend.calls.values()) - calls_before,
+                "widgets_recreated": len(widgets_before ^ _widget_names(gui.root)),
+            })
+        finally:
+            gui.root.destroy()
+    return results
+
+
+def bench_device_list(device_counts=(8, 20, 40, 60), refreshes: int = 10) -> List[Dict]:
+    """Lista virtual com muitos pendrives: widgets vivos, refresh e rolagem até o fim"""
+    results = []
+    for n in device_counts:
+        mounted = min(n, 20)  # Letras acabam: o resto aparece como disco não montado
+        gui = _open_gui(_sim_backend(mounted, unmounted=n - mounted))
+        if isinstance(gui, str):
+            return [{"gui": gui}]
+        try:
+            gui.show_unmounted = True
+            gui.unmounted_devices = USBEjector.get_unmounted_usb_drives()
+            start = time.perf_counter()
+            for _ in range(refreshes):
+                gui.rerender_devices()
+            refresh_ms = (time.perf_counter() - start) * 1000 / refreshes
+            device_list = gui.device_list
+            steps = 0
+            start = time.perf_counter()
+            while device_list.top < device_list.content_height - device_list._height():
+                device_list.scroll_to(device_list.top + device_list.SCROLL_UNIT)
+                gui.root.update_idletasks()
+                steps += 1
+            results.append({
+                "devices": n,
+                "compact": device_list.compact,
+                "cards": len(device_list.all_cards()),
+                "widgets": len(_widget_names(gui.root)),
+                "refresh_ms": round(refresh_ms, 2),
+                "scroll_step_ms": round((time.perf_counter() - start) * 1000 / max(steps, 1), 2),
+            })
+        finally:
+            gui.root.destroy()
+    return results
+
+
+def _legacy_unmounted_fallback() -> int:
+    """Cadeia antiga sem resultado do WMI: diskpart list disk + uma consulta WMI por disco offline (referência)"""
+    output = USBEjector.backend.run_diskpart("list disk\n", timeout=10)
+    found = 0
+    for line in output.splitlines():
+        match = re.match(r"Disk\s+(\d+)\s+(\w+)", line.strip())
+        if match and match.group(2).lower() != "online":
+            query = f"SELECT Index FROM Win32_DiskDrive WHERE Index={match.group(1)} AND InterfaceType='USB'"
+            if USBEjector.wmi.run(lambda svc: list(svc.ExecQuery(query))):
+                found += 1
+    return found
+
+
+def bench_disk_probe(device_counts=(2, 8, 16), trials: int = 3) -> List[Dict]:
+    """Detecção de USB não montados sem WMI: diskpart + WMI por disco × sondagem por IOCTL"""
+    results = []
+    for n in device_counts:
+        backend = _sim_backend(2, unmounted=n)
+        row: Dict = {"unmounted": n}
+        for name, detect in (("legacy", _legacy_unmounted_fallback),
+                             ("probe", lambda: len(USBEjector._detect_via_ioctl()))):
+            timings = []
+            for _ in range(trials):
+                opens = backend.calls.get("open_disk", 0)
+                start = time.perf_counter()
+                found = detect()
+                timings.append(time.perf_counter() - start)
+            row[f"{name}_ms"] = round(min(timings) * 1000, 1)
+            row[f"{name}_found"] = found
+        row["disk_opens"] = backend.calls.get("open_disk", 0) - opens
+        results.append(row)
+    return results
+
+
+def bench_mount(trials: int = 3) -> List[Dict]:
+    """mount_drive de um disco offline (diskpart online + letra automática)"""
+    timings = []
+    ok = 0
+    for _ in range(trials):
+        _sim_backend(mounted=0, unmounted=1)
+        device = USBEjector.get_unmounted_usb_drives()[0]
+        start = time.perf_counter()
+        success, _ = USBEjector.mount_drive(device)
+        timings.append((time.perf_counter() - start) * 1000)
+        ok += success
+    timings.sort()
+    return [{
+        "trials": trials, "ok": ok,
+        "p50_ms": round(timings[len(timings) // 2], 2), "max_ms": round(timings[-1], 2),
+    }]
+
+
+# =========================
+# LINUX (sysfs/procfs falsos)
+# =========================
+
+def _write(root: str, rel: str, content: str = "") -> None:
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _link(root: str, target_rel: str, link_rel: str) -> None:
+    """Symlink relativo dentro da árvore (como o sysfs real)"""
+    link = os.path.join(root, link_rel)
+    os.makedirs(os.path.dirname(link), exist_ok=True)
+    os.symlink(os.path.relpath(os.path.join(root, target_rel), os.path.dirname(link)), link)
+
+
+def _disk_suffix(n: int) -> str:
+    """0 → a, 25 → z, 26 → aa (nomes sdX do kernel)"""
+    suffix = ""
+    n += 1
+    while n:
+        n, rem = divmod(n - 1, 26)
+        suffix = chr(ord("a") + rem) + suffix
+    return suffix
+
+
+def build_fake_sysfs(root: str, usb_devices: int, internal_disks: int = 2) -> None:
+    """Árvore sys/proc/dev com pendrives USB (1 partição montada cada) e discos internos"""
+    os.makedirs(os.path.join(root, "sys/bus/usb"), exist_ok=True)
+    mountinfo = ["22 1 259:1 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p1 rw"]
+    for i in range(internal_disks):
+        disk = f"sys/devices/pci0000:00/0000:00:1d.0/nvme/nvme{i}/nvme{i}n1"
+        name = f"nvme{i}n1"
+        _write(root, f"{disk}/dev", f"259:{i * 8}")
+        _write(root, f"{disk}/size", "1000215216")
+        _write(root, f"{disk}/removable", "0")
+        _write(root, f"{disk}/{name}p1/partition", "1")
+        _write(root, f"{disk}/{name}p1/dev", f"259:{i * 8 + 1}")
+        _write(root, f"{disk}/{name}p1/size", "1000213168")
+        _link(root, disk, f"sys/block/{name}")
+    for i in range(usb_devices):
+        name = "sd" + _disk_suffix(i + 1)
+        usb = f"sys/devices/pci0000:00/0000:00:14.0/usb2/2-{i + 1}"
+        _write(root, f"{usb}/idVendor", "0781")
+        _write(root, f"{usb}/remove")
+        _link(root, "sys/bus/usb", f"{usb}/subsystem")
+        _link(root, "sys/bus/usb", f"{usb}/2-{i + 1}:1.0/subsystem")
+        scsi = f"{usb}/2-{i + 1}:1.0/host{i}/target{i}:0:0/{i}:0:0:0"
+        _write(root, f"{scsi}/model", "Cruzer Blade")
+        _write(root, f"{scsi}/vendor", "SanDisk")
+        _write(root, f"{scsi}/delete")
+        block = f"{scsi}/block/{name}"
+        _write(root, f"{block}/dev", f"8:{i * 16}")
+        _write(root, f"{block}/size", "30031872")
+        _write(root, f"{block}/removable", "1")
+        _write(root, f"{block}/{name}1/partition", "1")
+        _write(root, f"{block}/{name}1/dev", f"8:{i * 16 + 1}")
+        _write(root, f"{block}/{name}1/size", "30029824")
+        _link(root, scsi, f"{block}/device")
+        _link(root, block, f"sys/block/{name}")
+        _link(root, f"dev/{name}1", f"dev/disk/by-label/STICK{i}")
+        mountinfo.append(f"{100 + i} 22 8:{i * 16 + 1} / /media/kiosk/STICK{i} rw,nosuid shared:{50 + i}"
+                         f" - vfat /dev/{name}1 rw,fmask=0022")
+    _write(root, "proc/self/mountinfo", "\n".join(mountinfo) + "\n")
+
+
+def bench_linux_enumeration(device_counts=(1, 4, 16, 48), rounds: int = 20) -> List[Dict]:
+    """LinuxEjector.get_removable_drives sobre uma árvore sysfs falsa (sem subprocessos)"""
+    results = []
+    statvfs = lambda path: SimpleNamespace(f_bavail=1 << 20, f_frsize=4096, f_blocks=1 << 22)
+    for n in device_counts:
+        root = tempfile.mkdtemp(prefix="usb-sysfs-")
+        try:
+            build_fake_sysfs(root, n)
+            LinuxEjector.use_backend(LinuxBackend(root=root, statvfs=statvfs))
+            found = 0
+            start = time.perf_counter()
+            for _ in range(rounds):
+                found = len(LinuxEjector.get_removable_drives())
+            elapsed = (time.perf_counter() - start) / rounds
+            results.append({"devices": n, "found": found, "ms": round(elapsed * 1000, 3)})
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def build_fake_proc(root: str, processes: int, fds_per_process: int = 24, lockers: int = 2,
+                    mountpoint: str = "/media/kiosk/STICK0", dev: str = "08:01") -> None:
+    """proc/<pid>/{comm,exe,cwd,fd/*,maps}; `lockers` PIDs espalhados abrem arquivos no pendrive"""
+    locker_slots = {(i + 1) * processes // (lockers + 1) for i in range(lockers)}
+    for i in range(processes):
+        base = os.path.join(root, "proc", str(1000 + i))
+        os.makedirs(os.path.join(base, "fd"))
+        _write(root, f"proc/{1000 + i}/comm", f"proc{i}\n")
+        os.symlink(f"/usr/bin/proc{i}", os.path.join(base, "exe"))
+        os.symlink(f"/home/kiosk/work{i}", os.path.join(base, "cwd"))
+        for fd in range(fds_per_process):
+            target = f"/home/kiosk/work{i}/file{fd}.dat" if fd > 2 else "/dev/pts/0"
+            if i in locker_slots and fd == fds_per_process - 1:
+                target = f"{mountpoint}/dados/planilha{i}.ods"
+            os.symlink(target, os.path.join(base, "fd", str(fd)))
+        maps = [f"7f0000{n:02x}000-7f0000{n:02x}fff r-xp 00000000 103:02 {4000 + n}  /usr/lib/lib{n}.so"
+                for n in range(8)]
+        _write(root, f"proc/{1000 + i}/maps", "\n".join(maps) + "\n")
+
+
+def _serial_proc_scan(root: str, mountpoint: str) -> int:
+    """Referência: um PID por vez, os.listdir + readlink (o que um fuser em Python faria)"""
+    found = 0
+    proc = os.path.join(root, "proc")
+    prefix = mountpoint.rstrip("/") + "/"
+    for pid in os.listdir(proc):
+        if not pid.isdigit():
+            continue
+        fd_dir = os.path.join(proc, pid, "fd")
+        try:
+            targets = [os.readlink(os.path.join(fd_dir, fd)) for fd in os.listdir(fd_dir)]
+        except OSError:
+            continue
+        if any(t.startswith(prefix) for t in targets):
+            found += 1
+    return found
+
+
+def bench_proc_scan(process_counts=(100, 500, 1000, 2000)) -> List[Dict]:
+    """ProcLockScanner sobre uma árvore /proc sintética"""
+    results = []
+    mountpoint = "/media/kiosk/STICK0"
+    targets = {mountpoint: "8:1"}
+    for n in process_counts:
+        root = tempfile.mkdtemp(prefix="usb-proc-")
+        try:
+            build_fake_proc(root, n, mountpoint=mountpoint)
+            row = {"processes": n}
+
+            start = time.perf_counter()
+            row["serial_found"] = _serial_proc_scan(root, mountpoint)
+            row["serial_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+            scanner = ProcLockScanner(root=root)
+            start = time.perf_counter()
+            row["threaded_found"] = len(scanner.scan(targets)[mountpoint])
+            row["threaded_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+            start = time.perf_counter()
+            first = next(scanner.iter_scan(targets), None)
+            row["first_result_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            row["first_found"] = first is not None
+            results.append(row)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+# =========================
+# STARTUP
+# =========================
+
+STARTUP_COMMANDS = {
+    "cli_list": ["usb_ejector.py", "--list", "--json", "--simulate"],
+    "core_import": ["-c", "import usb_ejector"],
+    "gui_import": ["-c", "import usb_ejector_gui"],
+}
+
+
+def bench_startup(runs: int = 5) -> List[Dict]:
+    """Tempo de processo (python → saída) do caminho CLI e do caminho GUI"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for name, cmd in STARTUP_COMMANDS.items():
+        timings = []
+        ok = True
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = subprocess.run([sys.executable] + cmd, cwd=here, capture_output=True)
+            timings.append((time.perf_counter() - start) * 1000)
+            ok = ok and proc.returncode == 0
+        timings.sort()
+        results.append({
+            "path": name, "ok": ok, "runs": runs,
+            "p50_ms": round(timings[len(timings) // 2], 1), "min_ms": round(timings[0], 1),
+        })
+    return results
+
+
+# =========================
+# RUNNER
+# =========================
+
+BENCHMARKS = {
+    "wmi_topology": bench_wmi_topology,
+    "lock_scan": bench_lock_scan,
+    "refresh": bench_refresh,
+    "eject": bench_eject,
+    "lock_retry": bench_lock_retry,
+    "flush_progress": bench_flush_progress,
+    "auto_mode": bench_auto_mode,
+    "progress_animation": bench_progress_animation,
+    "chart_render": bench_chart_render,
+    "theme_switch": bench_theme_switch,
+    "device_list": bench_device_list,
+    "disk_probe": bench_disk_probe,
+    "mount": bench_mount,
+    "linux_enumeration": bench_linux_enumeration,
+    "proc_scan": bench_proc_scan,
+    "startup": bench_startup,
+}
+
+
+def _metadata() -> Dict:
+    """Identificação da execução (para comparar resultados entre commits)"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "commit": commit, "python": platform.python_version(),
+        "platform": sys.platform, "timestamp": time.time(),
+    }
+
+
+def _print_table(name: str, rows: List[Dict]) -> None:
+    print(f"\n== {name} ==")
+    if not rows:
+        return
+    cols = list(rows[0].keys())
+    print("  ".join(f"{c:>14}" for c in cols))
+    for row in rows:
+        print("  ".join(f"{row[c]!s:>14}" for c in cols))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks USB Safe Ejector Pro")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append",
+                        help="executar apenas o benchmark indicado")
+    parser.add_argument("--output", help="gravar os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+    logging.getLogger("usb_ejector").setLevel(logging.WARNING)
+
+    results = {name: fn() for name, fn in BENCHMARKS.items()
+               if not args.only or name in args.only}
+    report = {"meta": _metadata(), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, rows in results.items():
+            _print_table(name, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,715 @@
+"""
+USB Safe Ejector Pro - Backend Linux
+Detecção por sysfs (/sys/block) + /proc/self/mountinfo e ejeção via umount → sync → sysfs.
+
+Sem subprocessos: a enumeração lê alguns diretórios e arquivos pequenos. Todos os
+caminhos são relativos a `root`, então uma árvore sys/proc/dev falsa num diretório
+temporário serve para testes:
+
+    backend = LinuxBackend(root="/tmp/fake", umount=lambda target: None)
+    LinuxEjector.use_backend(backend)
+    LinuxEjector.get_removable_drives()
+"""
+
+import ctypes
+import os
+import threading
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from usb_ejector import (
+    USBDevice, ProcessInfo, EjectMetrics, EjectTrace, EjectStepRecord, FlushProgress,
+    IOActivityMonitor, EJECT_MODE_NAMES, logger,
+)
+
+SECTOR_SIZE = 512
+
+
+# =========================
+# MODELO
+# =========================
+
+class LinuxMount:
+    """Uma linha de /proc/self/mountinfo"""
+
+    def __init__(self, dev: str, mountpoint: str, fstype: str, source: str, options: str):
+        self.dev = dev  # "maj:min"
+        self.mountpoint = mountpoint
+        self.fstype = fstype
+        self.source = source
+        self.options = options
+
+
+class LinuxPartition:
+    """Partição (ou disco sem tabela de partições) com seus pontos de montagem"""
+
+    def __init__(self, name: str, dev: str, size: int):
+        self.name = name
+        self.dev = dev
+        self.size = size
+        self.label = ""
+        self.mounts: List[LinuxMount] = []
+
+    @property
+    def mountpoint(self) -> str:
+        return self.mounts[0].mountpoint if self.mounts else ""
+
+
+class LinuxBlockDevice:
+    """Disco de /sys/block com a ancestralidade resolvida"""
+
+    def __init__(self, name: str, dev: str, size: int, removable: bool,
+                 model: str, vendor: str, usb_path: Optional[str]):
+        self.name = name
+        self.dev = dev
+        self.size = size
+        self.removable = removable
+        self.model = model
+        self.vendor = vendor
+        self.usb_path = usb_path  # Diretório do usb_device ancestral (None se não for USB)
+        self.partitions: List[LinuxPartition] = []
+        self.whole_disk = LinuxPartition(name, dev, size)
+
+    @property
+    def is_usb(self) -> bool:
+        return self.usb_path is not None
+
+    @property
+    def display_name(self) -> str:
+        return " ".join(p for p in (self.vendor, self.model) if p) or self.name
+
+    def volumes(self) -> List[LinuxPartition]:
+        """Partições; o próprio disco quando ele é formatado sem tabela"""
+        return self.partitions or [self.whole_disk]
+
+    def all_mounts(self) -> List[LinuxMount]:
+        mounts = list(self.whole_disk.mounts)
+        for part in self.partitions:
+            mounts.extend(part.mounts)
+        return mounts
+
+
+def _unescape_mount(path: str) -> str:
+    """mountinfo escapa espaço/tab/\\n/\\ como \\040, \\011, \\012, \\134"""
+    if "\\" not in path:
+        return path
+    out = []
+    i = 0
+    while i < len(path):
+        if path[i] == "\\" and i + 3 < len(path) and path[i + 1:i + 4].isdigit():
+            out.append(chr(int(path[i + 1:i + 4], 8)))
+            i += 4
+        else:
+            out.append(path[i])
+            i += 1
+    return "".join(out)
+
+
+def _unescape_label(name: str) -> str:
+    """/dev/disk/by-label escapa caracteres como \\x20"""
+    if "\\x" not in name:
+        return name
+    out = []
+    i = 0
+    while i < len(name):
+        if name.startswith("\\x", i) and i + 4 <= len(name):
+            try:
+                out.append(chr(int(name[i + 2:i + 4], 16)))
+                i += 4
+                continue
+            except ValueError:
+                pass
+        out.append(name[i])
+        i += 1
+    return "".join(out)
+
+
+def parse_mountinfo(text: str) -> List[LinuxMount]:
+    """Linhas: id pai maj:min raiz ponto opções [opcionais...] - fstype origem superopções"""
+    mounts: List[LinuxMount] = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            sep = fields.index("-", 6)
+        except ValueError:
+            continue
+        if len(fields) < sep + 3:
+            continue
+        mounts.append(LinuxMount(
+            dev=fields[2], mountpoint=_unescape_mount(fields[4]),
+            fstype=fields[sep + 1], source=_unescape_mount(fields[sep + 2]), options=fields[5],
+        ))
+    return mounts
+
+
+# =========================
+# BACKEND
+# =========================
+
+def _libc_umount(target: str):
+    """umount2(target, 0) direto na libc (sem chamar /bin/umount)"""
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.umount2(os.fsencode(target), 0) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), target)
+
+
+class LinuxBackend:
+    """Primitivas sysfs/procfs; `root` permite apontar para uma árvore falsa"""
+
+    name = "linux"
+
+    def __init__(self, root: str = "/", umount=None, sync=None, statvfs=None):
+        self.root = root
+        self._umount = umount or _libc_umount
+        self._sync = sync or os.sync
+        self._statvfs = statvfs or os.statvfs
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.root, *[p.lstrip("/") for p in parts])
+
+    def _read(self, path: str, default: str = "") -> str:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read().strip()
+        except OSError:
+            return default
+
+    def _usb_ancestor(self, block_dir: str) -> Optional[str]:
+        """Subir pela árvore de /sys/devices até um usb_device (subsystem → usb)"""
+        sys_devices = os.path.realpath(self.path("sys/devices"))
+        current = os.path.dirname(os.path.realpath(block_dir))
+        while current.startswith(sys_devices) and current != sys_devices:
+            subsystem = os.path.join(current, "subsystem")
+            if os.path.islink(subsystem) and os.path.basename(os.readlink(subsystem)) == "usb":
+                # Interfaces (2-1:1.0) também são "usb"; o dispositivo tem idVendor
+                if os.path.exists(os.path.join(current, "idVendor")):
+                    return current
+            current = os.path.dirname(current)
+        return None
+
+    def _labels(self) -> Dict[str, str]:
+        """Nome do kernel → rótulo (symlinks de /dev/disk/by-label)"""
+        labels: Dict[str, str] = {}
+        try:
+            with os.scandir(self.path("dev/disk/by-label")) as entries:
+                for entry in entries:
+                    try:
+                        labels[os.path.basename(os.readlink(entry.path))] = _unescape_label(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return labels
+
+    def mounts(self) -> List[LinuxMount]:
+        return parse_mountinfo(self._read(self.path("proc/self/mountinfo")))
+
+    def block_devices(self) -> List[LinuxBlockDevice]:
+        """Discos de /sys/block com partições, rótulos e montagens"""
+        devices: List[LinuxBlockDevice] = []
+        try:
+            entries = list(os.scandir(self.path("sys/block")))
+        except OSError as e:
+            logger.debug(f"Erro sysfs: {e}")
+            return devices
+
+        for entry in entries:
+            name = entry.name
+            if name.startswith(("loop", "ram", "zram", "dm-", "md", "sr")):
+                continue
+            base = entry.path
+            device = LinuxBlockDevice(
+                name=name,
+                dev=self._read(os.path.join(base, "dev")),
+                size=int(self._read(os.path.join(base, "size"), "0") or 0) * SECTOR_SIZE,
+                removable=self._read(os.path.join(base, "removable")) == "1",
+                model=self._read(os.path.join(base, "device", "model")),
+                vendor=self._read(os.path.join(base, "device", "vendor")),
+                usb_path=self._usb_ancestor(base),
+            )
+            try:
+                with os.scandir(base) as children:
+                    for child in children:
+                        if child.name.startswith(name) and os.path.exists(os.path.join(child.path, "partition")):
+                            device.partitions.append(LinuxPartition(
+                                child.name,
+                                self._read(os.path.join(child.path, "dev")),
+                                int(self._read(os.path.join(child.path, "size"), "0") or 0) * SECTOR_SIZE,
+                            ))
+            except OSError:
+                pass
+            device.partitions.sort(key=lambda p: p.name)
+            devices.append(device)
+
+        labels = self._labels()
+        by_dev: Dict[str, LinuxPartition] = {}
+        by_name: Dict[str, LinuxPartition] = {}
+        for device in devices:
+            for part in device.partitions + [device.whole_disk]:
+                part.label = labels.get(part.name, "")
+                by_dev[part.dev] = part
+                by_name[part.name] = part
+        for mount in self.mounts():
+            part = by_dev.get(mount.dev)
+            if part is None and mount.source.startswith("/dev/"):
+                part = by_name.get(os.path.basename(mount.source))
+            if part is not None:
+                part.mounts.append(mount)
+        return sorted(devices, key=lambda d: d.name)
+
+    def disk_usage(self, mountpoint: str) -> Tuple[int, int]:
+        """(livre, total) em bytes"""
+        st = self._statvfs(mountpoint)
+        return st.f_bavail * st.f_frsize, st.f_blocks * st.f_frsize
+
+    def unmount(self, target: str):
+        self._umount(target)
+
+    def sync(self):
+        self._sync()
+
+    def disk_io_counters(self) -> Dict[str, SimpleNamespace]:
+        """/proc/diskstats: nome do kernel → write_bytes (setores de 512 bytes)"""
+        counters: Dict[str, SimpleNamespace] = {}
+        for line in self._read(self.path("proc/diskstats")).splitlines():
+            fields = line.split()
+            if len(fields) >= 10:
+                counters[fields[2]] = SimpleNamespace(
+                    read_bytes=int(fields[5]) * SECTOR_SIZE, write_bytes=int(fields[9]) * SECTOR_SIZE)
+        return counters
+
+    def pending_write_bytes(self) -> Optional[int]:
+        """Dirty + Writeback de /proc/meminfo (todo o sistema: limite superior para o disco)"""
+        total = None
+        for line in self._read(self.path("proc/meminfo")).splitlines():
+            key, _, value = line.partition(":")
+            if key in ("Dirty", "Writeback"):
+                total = (total or 0) + int(value.split()[0]) * 1024
+        return total
+
+    def write_attr(self, path: str, value: str = "1"):
+        with open(path, "w") as f:
+            f.write(value)
+
+
+# =========================
+# PROCESSOS (/proc)
+# =========================
+
+def _parse_dev(dev: str) -> Optional[Tuple[int, int]]:
+    """"8:17" (mountinfo, decimal) → (8, 17)"""
+    try:
+        major, minor = dev.split(":")
+        return int(major), int(minor)
+    except ValueError:
+        return None
+
+
+class ProcLockScanner:
+    """Processos com fd/cwd/exe/maps dentro de pontos de montagem (sem lsof/fuser)"""
+
+    def __init__(self, root: str = "/", max_workers: int = 8, batch_size: int = 64):
+        self.root = root
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.last_stats: Dict[str, float] = {}
+
+    def _proc(self, *parts: str) -> str:
+        return os.path.join(self.root, "proc", *parts)
+
+    def pids(self) -> List[int]:
+        pids: List[int] = []
+        with os.scandir(self._proc()) as entries:
+            for entry in entries:
+                if entry.name.isdigit():
+                    pids.append(int(entry.name))
+        return pids
+
+    @staticmethod
+    def _compile(targets: Dict[str, Optional[str]]):
+        """Prefixos ("/media/x/") e chaves de maps ("08:11", hexadecimal) calculados uma vez"""
+        prefixes = {mp.rstrip("/") + "/": mp for mp in targets}
+        maps_devs = {}
+        for mp, dev in targets.items():
+            parsed = _parse_dev(dev) if dev else None
+            if parsed:
+                maps_devs[f"{parsed[0]:02x}:{parsed[1]:02x}"] = mp
+        return prefixes, tuple(prefixes), maps_devs
+
+    def _inspect(self, pid: int, compiled) -> List[Tuple[str, ProcessInfo]]:
+        """Um PID: readlink de exe/cwd/fd/* (relativo ao diretório) e dispositivos em maps"""
+        prefixes, prefix_tuple, maps_devs = compiled
+        matches: Dict[str, List[str]] = {}
+
+        def check(path: str):
+            if path.startswith(prefix_tuple) or path + "/" in prefixes:
+                for prefix, mountpoint in prefixes.items():
+                    if path.startswith(prefix) or path + "/" == prefix:
+                        matches.setdefault(mountpoint, []).append(path)
+
+        try:
+            base_fd = os.open(self._proc(str(pid)), os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return []  # Processo encerrou
+        try:
+            try:
+                exe = os.readlink("exe", dir_fd=base_fd)
+                check(exe)
+            except OSError:
+                exe = ""  # Thread do kernel ou sem permissão
+            try:
+                check(os.readlink("cwd", dir_fd=base_fd))
+            except OSError:
+                pass
+            try:
+                fd_dir = os.open("fd", os.O_RDONLY | os.O_DIRECTORY, dir_fd=base_fd)
+            except OSError:
+                fd_dir = None
+            if fd_dir is not None:
+                try:
+                    for fd in os.listdir(fd_dir):
+                        try:
+                            check(os.readlink(fd, dir_fd=fd_dir))
+                        except OSError:
+                            continue
+                finally:
+                    os.close(fd_dir)
+
+            if maps_devs:
+                try:
+                    with open(os.open("maps", os.O_RDONLY, dir_fd=base_fd), "r", errors="replace") as f:
+                        for line in f:
+                            fields = line.split(None, 5)
+                            mountpoint = maps_devs.get(fields[3]) if len(fields) == 6 else None
+                            if mountpoint:
+                                path = fields[5].strip()
+                                if path not in matches.get(mountpoint, ()):
+                                    matches.setdefault(mountpoint, []).append(path)
+                except OSError:
+                    pass
+
+            if not matches:
+                return []
+            try:
+                with open(os.open("comm", os.O_RDONLY, dir_fd=base_fd), "r", errors="replace") as f:
+                    name = f.read().strip()
+            except OSError:
+                name = os.path.basename(exe) or "Desconhecido"
+        finally:
+            os.close(base_fd)
+        return [(mp, ProcessInfo(pid, name, exe, files)) for mp, files in matches.items()]
+
+    def iter_scan(self, targets: Dict[str, Optional[str]], first_only: bool = False,
+                  pids: Optional[List[int]] = None) -> Iterator[Tuple[str, ProcessInfo]]:
+        """Gera (ponto de montagem, ProcessInfo) conforme cada lote de PIDs termina
+
+        targets: ponto de montagem → "maj:min" do dispositivo (ou None para só caminhos)
+        """
+        start = time.perf_counter()
+        compiled = self._compile(targets)
+        pids = self.pids() if pids is None else pids
+        batches = [pids[i:i + self.batch_size] for i in range(0, len(pids), self.batch_size)]
+        found = 0
+
+        def run(batch: List[int]) -> List[Tuple[str, ProcessInfo]]:
+            out: List[Tuple[str, ProcessInfo]] = []
+            for pid in batch:
+                out.extend(self._inspect(pid, compiled))
+            return out
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="proc-scan")
+        try:
+            futures = [pool.submit(run, batch) for batch in batches]
+            for future in as_completed(futures):
+                for item in future.result():
+                    found += 1
+                    yield item
+                if first_only and found:
+                    for f in futures:
+                        f.cancel()
+                    return
+        finally:
+            pool.shutdown(wait=False)
+            self.last_stats = {
+                "processes": len(pids), "found": found, "first_only": first_only,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+
+    def scan(self, targets: Dict[str, Optional[str]], first_only: bool = False) -> Dict[str, List[ProcessInfo]]:
+        results: Dict[str, List[ProcessInfo]] = {mp: [] for mp in targets}
+        for mountpoint, info in self.iter_scan(targets, first_only):
+            results[mountpoint].append(info)
+        return results
+
+
+# =========================
+# SERVIÇO
+# =========================
+
+class LinuxEjector:
+    """Equivalente do USBEjector para Linux (mesmos nomes de método e retornos)"""
+
+    backend = LinuxBackend()
+    lock_scanner = ProcLockScanner()
+    eject_metrics = EjectMetrics()
+    io_activity = IOActivityMonitor(backend.disk_io_counters)
+
+    @staticmethod
+    def use_backend(backend: LinuxBackend):
+        LinuxEjector.backend = backend
+        LinuxEjector.lock_scanner = ProcLockScanner(root=backend.root)
+        LinuxEjector.io_activity = IOActivityMonitor(backend.disk_io_counters)
+
+    @staticmethod
+    def get_usb_disks() -> List[LinuxBlockDevice]:
+        return [d for d in LinuxEjector.backend.block_devices() if d.is_usb]
+
+    @staticmethod
+    def _find_disk(name: str) -> Optional[LinuxBlockDevice]:
+        """Disco pelo nome do disco ou de uma partição dele"""
+        name = os.path.basename(name)
+        for disk in LinuxEjector.get_usb_disks():
+            if disk.name == name or any(p.name == name for p in disk.partitions):
+                return disk
+        return None
+
+    @staticmethod
+    def get_removable_drives(deadline: Optional[float] = None) -> List[USBDevice]:
+        start = time.perf_counter()
+        devices: List[USBDevice] = []
+        for disk in LinuxEjector.get_usb_disks():
+            for part in disk.volumes():
+                if not part.mounts:
+                    continue
+                try:
+                    free_bytes, total_bytes = LinuxEjector.backend.disk_usage(
+                        LinuxEjector.backend.path(part.mountpoint)
+                    )
+                except OSError:
+                    free_bytes, total_bytes = 0, part.size
+                devices.append(USBDevice(
+                    letter=part.name, label=part.label or disk.display_name,
+                    filesystem=part.mounts[0].fstype, total_size=total_bytes or part.size,
+                    free_size=free_bytes, source="USB", is_mounted=True,
+                    device=part.name, mountpoint=part.mountpoint,
+                ))
+        logger.info(f"⏱ Detecção Linux: {len(devices)} volume(s) em {(time.perf_counter() - start) * 1000:.1f}ms")
+        return devices
+
+    @staticmethod
+    def get_unmounted_usb_drives() -> List[USBDevice]:
+        return [
+            USBDevice(
+                letter="?", label=disk.display_name, filesystem="Não montado",
+                total_size=disk.size, free_size=0, source="USB",
+                is_mounted=False, device=disk.name,
+            )
+            for disk in LinuxEjector.get_usb_disks()
+            if not disk.all_mounts()
+        ]
+
+    @staticmethod
+    def _lock_targets(disk: LinuxBlockDevice) -> Dict[str, Optional[str]]:
+        targets: Dict[str, Optional[str]] = {}
+        for part in disk.volumes():
+            for mount in part.mounts:
+                targets[mount.mountpoint] = part.dev or None
+        return targets
+
+    @staticmethod
+    def find_locking_processes(name: str, first_only: bool = False) -> List[ProcessInfo]:
+        """Processos com arquivos, cwd, executável ou bibliotecas no disco"""
+        disk = LinuxEjector._find_disk(name)
+        if disk is None:
+            return []
+        targets = LinuxEjector._lock_targets(disk)
+        if not targets:
+            return []
+        procs: Dict[int, ProcessInfo] = {}
+        try:
+            for _, info in LinuxEjector.lock_scanner.iter_scan(targets, first_only):
+                if info.pid in procs:
+                    procs[info.pid].files.extend(info.files)
+                else:
+                    procs[info.pid] = info
+        except OSError as e:
+            logger.debug(f"Erro /proc: {e}")
+        return list(procs.values())
+
+    @staticmethod
+    def has_locks(name: str) -> bool:
+        return bool(LinuxEjector.find_locking_processes(name, first_only=True))
+
+    @staticmethod
+    def verify_safe_to_eject(name: str) -> Tuple[bool, str, List[ProcessInfo]]:
+        logger.info(f"🔍 Verificando {name}")
+        if LinuxEjector._find_disk(name) is None:
+            return False, "Inacessível", []
+        procs = LinuxEjector.find_locking_processes(name)
+        if procs:
+            logger.warning(f"⚠️ {len(procs)} processo(s) bloqueando")
+            return False, f"{len(procs)} processo(s)", procs
+        logger.info("✓ Seguro")
+        return True, "Seguro", []
+
+    @staticmethod
+    def kill_process(pid: int) -> bool:
+        try:
+            os.kill(pid, 15)
+            return True
+        except OSError as e:
+            logger.debug(f"Erro kill {pid}: {e}")
+            return False
+
+    @staticmethod
+    def _sync_progress(disk_name: str, report) -> FlushProgress:
+        """FlushProgress do sync lendo os setores escritos do disco em /proc/diskstats"""
+        backend = LinuxEjector.backend
+
+        def read_written() -> Optional[int]:
+            return getattr(backend.disk_io_counters().get(disk_name), "write_bytes", None)
+
+        return FlushProgress(read_written, report, backend.pending_write_bytes(), band=(60, 80))
+
+    @staticmethod
+    def eject_drive(name: str, progress_callback=None, safe_mode: bool = False) -> Tuple[bool, str]:
+        """umount (todas as montagens do disco) → sync → device/delete → usb remove"""
+        mode = "safe" if safe_mode else "fast"
+        logger.info(f"⏏ Ejetando {name} ({'SEGURO' if safe_mode else 'RÁPIDO'})")
+        backend = LinuxEjector.backend
+        disk = LinuxEjector._find_disk(name)
+        if disk is None:
+            return False, "Inacessível"
+        trace = EjectTrace(LinuxEjector.eject_metrics, f"{disk.name} {disk.display_name}", mode)
+        started = time.perf_counter()
+        success = False  # Resultado devolvido ao chamador (registrado no passo "total")
+
+        def report(percent: int, info: Optional[Dict] = None):
+            if progress_callback:
+                if info is None:
+                    progress_callback(percent)
+                else:
+                    progress_callback(percent, info)
+
+        try:
+            # Montagens mais profundas primeiro (ex.: /media/x/sub antes de /media/x)
+            mounts = sorted(disk.all_mounts(), key=lambda m: m.mountpoint.count("/"), reverse=True)
+            for i, mount in enumerate(mounts):
+                report(10 + 40 * i // max(len(mounts), 1))
+                with trace.step("unmount"):
+                    backend.unmount(backend.path(mount.mountpoint))
+                logger.info(f"     ✓ Desmontado {mount.mountpoint}")
+
+            report(60)
+            sync = LinuxEjector._sync_progress(disk.name, report)
+            with trace.step("sync"):
+                sync.run(backend.sync)
+
+            report(80)
+            delete_path = backend.path("sys/block", disk.name, "device", "delete")
+            if os.path.exists(delete_path):
+                with trace.step("delete"):
+                    backend.write_attr(delete_path)
+
+            report(90)
+            if disk.usb_path and os.path.exists(os.path.join(disk.usb_path, "remove")):
+                # Desliga a porta: o dispositivo some do barramento como no "Remover com segurança"
+                trace.optional("remove", lambda: backend.write_attr(os.path.join(disk.usb_path, "remove")))
+
+            report(100)
+            msg = f"✓ {disk.name} removido"
+            logger.info(msg)
+            success = True
+            return True, msg
+
+        except PermissionError:
+            return False, "Acesso negado"
+        except OSError as e:
+            if e.errno == 16:  # EBUSY
+                return False, "Em uso"
+            if e.errno in (1, 13):  # EPERM / EACCES
+                return False, "Acesso negado"
+            return False, f"Erro {e.errno}"
+        except Exception as e:
+            logger.error(f"Erro ejeção: {e}")
+            return False, "Erro"
+        finally:
+            failed = [r for r in trace.records if not r.ok]
+            trace.metrics.record(EjectStepRecord(
+                "total", time.perf_counter() - started,
+                None if success else (failed[-1].error_code if failed else -1),
+                trace.device, mode, success
+            ))
+            logger.info(f"⏱ Ejeção {trace.device} ({mode}): {trace.describe()}")
+
+    @staticmethod
+    def choose_safe_mode(name: str) -> Tuple[bool, str]:
+        """Modo auto: (usar modo seguro?, motivo) pelos setores escritos em /proc/diskstats"""
+        disk = LinuxEjector._find_disk(name)
+        if disk is None:
+            return True, "disco desconhecido"
+        # Dirty/Writeback do /proc/meminfo são do sistema todo: não servem por disco
+        busy, reason = LinuxEjector.io_activity.classify(disk.name)
+        logger.info(f"🤖 Auto {name}: {'SEGURO' if busy else 'RÁPIDO'} ({reason})")
+        return busy, reason
+
+    @staticmethod
+    def eject_drives(names, progress_callback=None, safe_mode: bool = False,
+                     mode: Optional[str] = None) -> Dict[str, Tuple[bool, str, List[ProcessInfo]]]:
+        """Ejeção em lote, um pipeline por disco físico em paralelo (`mode` como no USBEjector)"""
+        names = list(names)
+        results: Dict[str, Tuple[bool, str, List[ProcessInfo]]] = {}
+        mode = mode or ("safe" if safe_mode else "fast")
+        logger.info(f"⏏ Ejeção em lote: {', '.join(names)} ({EJECT_MODE_NAMES[mode]})")
+        if mode == "auto":
+            safe_names = {n for n in names if LinuxEjector.choose_safe_mode(n)[0]}
+        else:
+            safe_names = set(names) if mode == "safe" else set()
+        for name in names:
+            if name in safe_names:
+                safe, msg, procs = LinuxEjector.verify_safe_to_eject(name)
+                if not safe:
+                    results[name] = (False, msg, procs)
+        # Partições do mesmo disco compartilham um único pipeline (o disco sai inteiro);
+        # se uma delas foi barrada na verificação, o disco inteiro fica
+        disks = {n: LinuxEjector._find_disk(n) for n in names}
+        groups: Dict[str, List[str]] = {}
+        for name in names:
+            disk = disks[name]
+            if disk is None:
+                results.setdefault(name, (False, "Inacessível", []))
+            else:
+                groups.setdefault(disk.name, []).append(name)
+        for disk_name, members in list(groups.items()):
+            blocked = [results[m] for m in members if m in results]
+            if blocked:
+                for member in members:
+                    results.setdefault(member, blocked[0])
+                del groups[disk_name]
+        if not groups:
+            return results
+
+        def _eject(disk_name: str) -> Tuple[bool, str]:
+            members = groups[disk_name]
+            cb = None
+            if progress_callback:
+                def cb(p, info=None):
+                    for member in members:
+                        progress_callback(member, p, info)
+            safe = any(member in safe_names for member in members)
+            return LinuxEjector.eject_drive(disk_name, cb, safe_mode=safe)
+
+        with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="eject") as pool:
+            futures = {pool.submit(_eject, disk_name): disk_name for disk_name in groups}
+            for future in as_completed(futures):
+                try:
+                    success, msg = future.result()
+                except Exception as e:
+                    success, msg = False, f"Erro: {e}"
+                for member in groups[futures[future]]:
+                    results[member] = (success, msg, [])
+        return results
@@ -0,0 +1,563 @@
+"""
+USB Safe Ejector Pro - Backend simulado
+Discos, partições, letras e processos em memória para benchmarks e testes sem hardware.
+
+Uso:
+    from simulated_backend import SimulatedBackend
+    backend = SimulatedBackend(latencies={"ioctl": 0.005})
+    backend.add_disk("SanDisk Cruzer", 16 * 1024 ** 3)
+    USBEjector.use_backend(backend)
+"""
+
+import ctypes
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from usb_ejector import (
+    DeviceBackend, DeviceError, STORAGE_DEVICE_NUMBER, IOCTL_STORAGE_GET_DEVICE_NUMBER,
+    DRIVE_FIXED, DRIVE_REMOVABLE, DRIVE_NO_ROOT_DIR, GENERIC_READ, GENERIC_WRITE,
+    ERROR_ACCESS_DENIED, ERROR_SHARING_VIOLATION, ERROR_INSUFFICIENT_BUFFER, ERROR_MORE_DATA,
+    FSCTL_LOCK_VOLUME, FSCTL_DISMOUNT_VOLUME, IOCTL_STORAGE_EJECT_MEDIA,
+    IOCTL_STORAGE_QUERY_PROPERTY, IOCTL_DISK_GET_LENGTH_INFO, IOCTL_DISK_GET_DRIVE_LAYOUT_EX,
+    IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS, STORAGE_DEVICE_DESCRIPTOR, DRIVE_LAYOUT_INFORMATION_EX,
+    PARTITION_INFORMATION_EX, VOLUME_DISK_EXTENTS, DISK_EXTENT, PARTITION_STYLE_MBR,
+)
+
+ERROR_FILE_NOT_FOUND = 2
+FILE_DEVICE_DISK = 7
+PARTITION_OFFSET = 1024 ** 2  # Primeira partição alinhada em 1 MiB
+BUS_TYPES = {"SCSI": 1, "ATA": 3, "USB": 7, "SATA": 11, "NVME": 17}
+MBR_TYPES = {"FAT32": 0x0C, "EXFAT": 0x07, "NTFS": 0x07}
+
+
+# =========================
+# PAYLOADS DE IOCTL
+# =========================
+
+def encode_storage_device_descriptor(bus_type: int, removable: bool, vendor: str, product: str) -> bytes:
+    """STORAGE_DEVICE_DESCRIPTOR como o Windows devolve (strings ASCII após a estrutura)"""
+    header = ctypes.sizeof(STORAGE_DEVICE_DESCRIPTOR)
+    strings = vendor.encode("ascii") + b"\x00" + product.encode("ascii") + b"\x00"
+    descriptor = STORAGE_DEVICE_DESCRIPTOR(
+        Version=header, Size=header + len(strings), RemovableMedia=int(removable),
+        VendorIdOffset=header if vendor else 0,
+        ProductIdOffset=header + len(vendor) + 1 if product else 0,
+        BusType=bus_type,
+    )
+    return bytes(descriptor) + strings
+
+
+def encode_drive_layout(partitions: List[Tuple[int, int, int, int]]) -> bytes:
+    """DRIVE_LAYOUT_INFORMATION_EX MBR de [(nº, início, tamanho, tipo)] (entradas em múltiplos de 4)"""
+    count = max(4, -(-len(partitions) // 4) * 4)
+    layout = DRIVE_LAYOUT_INFORMATION_EX(PartitionStyle=PARTITION_STYLE_MBR, PartitionCount=count)
+    entries = b""
+    for i in range(count):
+        entry = PARTITION_INFORMATION_EX(PartitionStyle=PARTITION_STYLE_MBR)
+        if i < len(partitions):
+            number, offset, length, part_type = partitions[i]
+            entry.StartingOffset, entry.PartitionLength, entry.PartitionNumber = offset, length, number
+            entry.Info.Mbr.PartitionType = part_type
+            entry.Info.Mbr.RecognizedPartition = 1
+        entries += bytes(entry)
+    return bytes(layout)[:DRIVE_LAYOUT_INFORMATION_EX.PartitionEntry.offset] + entries
+
+
+def encode_volume_disk_extents(extents: List[Tuple[int, int, int]]) -> bytes:
+    """VOLUME_DISK_EXTENTS de [(nº do disco, início, tamanho)]"""
+    header = bytes(VOLUME_DISK_EXTENTS(NumberOfDiskExtents=len(extents)))[:VOLUME_DISK_EXTENTS.Extents.offset]
+    return header + b"".join(bytes(DISK_EXTENT(*extent)) for extent in extents)
+
+
+# =========================
+# MODELO
+# =========================
+
+class SimPartition:
+    """Partição simulada (letra=None quando não montada)"""
+
+    def __init__(self, number: int, size: int, used: int, label: str,
+                 filesystem: str, serial: int, letter: Optional[str] = None):
+        self.number = number
+        self.size = size
+        self.used = used
+        self.label = label
+        self.filesystem = filesystem
+        self.serial = serial
+        self.letter = letter
+
+
+class SimDisk:
+    """Disco físico simulado"""
+
+    def __init__(self, index: int, model: str, size: int, interface: str,
+                 media_type: str, online: bool = True):
+        self.index = index
+        self.model = model
+        self.size = size
+        self.interface = interface
+        self.media_type = media_type
+        self.online = online
+        self.partitions: List[SimPartition] = []
+        self.written = 0  # Bytes já gravados na mídia (contador de I/O)
+        self.dirty = 0  # Bytes no cache de escrita, drenados pelo flush
+        self.write_rate = 20 * 1024 ** 2  # Vazão da mídia em bytes/s
+        self.flushing: Optional[Tuple[float, int]] = None  # (início, bytes) do flush em curso
+        self.writing: Optional[Tuple[float, float, float]] = None  # (início, fim, bytes/s) de uma cópia
+
+    @property
+    def device_id(self) -> str:
+        return f"\\\\.\\PHYSICALDRIVE{self.index}"
+
+
+class SimProcess:
+    """Processo simulado no formato que o LockScanner espera (.info + open_files())"""
+
+    def __init__(self, backend: "SimulatedBackend", pid: int, name: str, exe: str,
+                 files: List[str], denied: bool = False):
+        self._backend = backend
+        self.info = {"pid": pid, "name": name, "exe": exe, "create_time": 1000.0 + pid}
+        self.files = files
+        self.denied = denied
+
+    def open_files(self):
+        self._backend._call("open_files")
+        if self.denied:
+            raise SimAccessDenied(self.info["pid"])
+        return [SimpleNamespace(path=p) for p in self.files]
+
+
+class SimAccessDenied(Exception):
+    """Equivalente simulado de psutil.AccessDenied"""
+
+
+class SimHandle:
+    """Handle de volume (letter) ou de disco físico (disk_index) aberto"""
+
+    def __init__(self, letter: Optional[str], disk_index: Optional[int] = None):
+        self.letter = letter
+        self.disk_index = disk_index
+        self.locked = False
+        self.dismounted = False
+        self.closed = False
+
+
+class SimulatedWMIService:
+    """SWbemServices derivado do modelo do backend (consultas usadas pelo WMITopology)"""
+
+    _INDEX_RE = re.compile(r"Index\s*=\s*(\d+)", re.IGNORECASE)
+
+    def __init__(self, backend: "SimulatedBackend"):
+        self.backend = backend
+
+    def ExecQuery(self, wql: str):
+        self.backend._call("wmi_query")
+        with self.backend._lock:
+            disks = list(self.backend.disks.values())
+        if "Win32_DiskDriveToDiskPartition" in wql:
+            return [
+                SimpleNamespace(
+                    Antecedent=self._path("Win32_DiskDrive", d.device_id),
+                    Dependent=self._path("Win32_DiskPartition", self._part_id(d, p)),
+                )
+                for d in disks for p in d.partitions
+            ]
+        if "Win32_LogicalDiskToPartition" in wql:
+            return [
+                SimpleNamespace(
+                    Antecedent=self._path("Win32_DiskPartition", self._part_id(d, p)),
+                    Dependent=self._path("Win32_LogicalDisk", f"{p.letter}:"),
+                )
+                for d in disks if d.online for p in d.partitions if p.letter
+            ]
+        if "Win32_DiskDrive" in wql:
+            match = self._INDEX_RE.search(wql)
+            if match:
+                disks = [d for d in disks if d.index == int(match.group(1))]
+            if "InterfaceType='USB'" in wql:
+                disks = [d for d in disks if d.interface == "USB"]
+            return [
+                SimpleNamespace(DeviceID=d.device_id, Index=d.index, Model=d.model, Size=d.size,
+                                InterfaceType=d.interface, MediaType=d.media_type)
+                for d in disks
+            ]
+        return []
+
+    @staticmethod
+    def _part_id(disk: SimDisk, part: SimPartition) -> str:
+        return f"Disk #{disk.index}, Partition #{part.number}"
+
+    @staticmethod
+    def _path(cls_name: str, device_id: str) -> str:
+        escaped = device_id.replace("\\", "\\\\")
+        return f'\\\\SIM\\root\\cimv2:{cls_name}.DeviceID="{escaped}"'
+
+
+# =========================
+# BACKEND
+# =========================
+
+class SimulatedBackend(DeviceBackend):
+    """Backend em memória com latência por chamada e injeção de falhas"""
+
+    name = "simulated"
+    denied_errors = (SimAccessDenied,)
+
+    def __init__(self, latencies: Optional[Dict[str, float]] = None, system_disk: bool = True):
+        self.latencies: Dict[str, float] = dict(latencies or {})
+        self.calls: Dict[str, int] = {}
+        self.disks: Dict[int, SimDisk] = {}
+        self.processes: Dict[int, SimProcess] = {}
+        self._failures: List[Dict] = []
+        self._lock = threading.RLock()
+        self._next_pid = 100
+        self._next_serial = 0x1A2B0000
+        if system_disk:
+            disk = self._new_disk("NVMe SSD", 512 * 1024 ** 3, "SCSI", "Fixed hard disk media", True)
+            self._new_partition(disk, disk.size, disk.size // 2, "Windows", "NTFS", "C")
+
+    # ---- construção do cenário ----
+
+    def _new_disk(self, model: str, size: int, interface: str, media_type: str, online: bool) -> SimDisk:
+        index = max(self.disks, default=-1) + 1
+        disk = SimDisk(index, model, size, interface, media_type, online)
+        self.disks[index] = disk
+        return disk
+
+    def _new_partition(self, disk: SimDisk, size: int, used: int, label: str,
+                       filesystem: str, letter: Optional[str]) -> SimPartition:
+        self._next_serial += 1
+        part = SimPartition(len(disk.partitions) + 1, size, used, label, filesystem,
+                            self._next_serial, letter)
+        disk.partitions.append(part)
+        return part
+
+    def free_letter(self) -> Optional[str]:
+        used = set(self._letters())
+        return next((l for l in "DEFGHIJKLMNOPQRSTUVWXYZ" if l not in used), None)
+
+    def add_disk(self, model: str = "USB Flash Drive", size: int = 16 * 1024 ** 3,
+                 partitions: int = 1, mounted: bool = True, removable: bool = True,
+                 interface: str = "USB", filesystem: str = "FAT32",
+                 used_ratio: float = 0.4, label: str = "") -> SimDisk:
+        """Disco USB; mounted=False deixa o disco offline e sem letras"""
+        with self._lock:
+            media = "Removable Media" if removable else "External hard disk media"
+            disk = self._new_disk(model, size, interface, media, online=mounted)
+            part_size = size // max(partitions, 1)
+            for _ in range(partitions):
+                letter = self.free_letter() if mounted else None
+                self._new_partition(disk, part_size, int(part_size * used_ratio),
+                                    label or model, filesystem, letter)
+            return disk
+
+    def add_process(self, name: str, files: List[str], exe: str = "",
+                    denied: bool = False, lifetime: Optional[float] = None) -> SimProcess:
+        """`lifetime`: segundos até o processo sair (handle transitório, ex.: antivírus)"""
+        with self._lock:
+            pid = self._next_pid
+            self._next_pid += 4
+            proc = SimProcess(self, pid, name, exe or f"C:\\Program Files\\{name}", files, denied)
+            self.processes[pid] = proc
+        if lifetime is not None:
+            timer = threading.Timer(lifetime, self._exit_process, args=(pid,))
+            timer.daemon = True
+            timer.start()
+        return proc
+
+    def _exit_process(self, pid: int):
+        with self._lock:
+            self.processes.pop(pid, None)
+
+    def add_dirty(self, letter: str, nbytes: int, write_rate: Optional[float] = None):
+        """Dados no cache de escrita do volume (o flush leva nbytes / write_rate segundos)"""
+        with self._lock:
+            disk, _ = self._volume(letter)
+            disk.dirty += nbytes
+            if write_rate:
+                disk.write_rate = write_rate
+
+    def inject_failure(self, op: str, winerror: int = ERROR_ACCESS_DENIED,
+                       count: int = 1, letter: Optional[str] = None):
+        """Próximas `count` chamadas de `op` (opcionalmente só para `letter`) falham"""
+        with self._lock:
+            self._failures.append({"op": op, "winerror": winerror, "count": count, "letter": letter})
+
+    def _call(self, op: str, letter: Optional[str] = None):
+        """Contar a chamada, aplicar latência e falhas injetadas"""
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+            failure = next(
+                (f for f in self._failures
+                 if f["op"] == op and f["count"] > 0 and f["letter"] in (None, letter)),
+                None
+            )
+            if failure:
+                failure["count"] -= 1
+        latency = self.latencies.get(op, 0.0)
+        if latency:
+            time.sleep(latency)
+        if failure:
+            raise DeviceError(failure["winerror"], f"Falha simulada em {op}")
+
+    def _volume(self, letter: str) -> Tuple[SimDisk, SimPartition]:
+        letter = letter.upper()
+        for disk in self.disks.values():
+            if not disk.online:
+                continue
+            for part in disk.partitions:
+                if part.letter == letter:
+                    return disk, part
+        raise DeviceError(ERROR_FILE_NOT_FOUND, f"{letter}: não existe")
+
+    def _holders(self, letter: str) -> List[SimProcess]:
+        prefix = f"{letter.upper()}:\\"
+        return [
+            p for p in self.processes.values()
+            if any(f.upper().startswith(prefix) for f in p.files)
+            or p.info["exe"].upper().startswith(prefix)
+        ]
+
+    # ---- volumes ----
+
+    def _letters(self) -> List[str]:
+        return sorted(
+            p.letter for d in self.disks.values() if d.online for p in d.partitions if p.letter
+        )
+
+    def logical_drives(self) -> List[str]:
+        self._call("logical_drives")
+        with self._lock:
+            return self._letters()
+
+    def drive_type(self, letter: str) -> int:
+        self._call("drive_type", letter)
+        with self._lock:
+            try:
+                disk, _ = self._volume(letter)
+            except DeviceError:
+                return DRIVE_NO_ROOT_DIR
+            return DRIVE_REMOVABLE if disk.media_type == "Removable Media" else DRIVE_FIXED
+
+    def volume_information(self, letter: str) -> tuple:
+        self._call("volume_information", letter)
+        with self._lock:
+            _, part = self._volume(letter)
+            return (part.label, part.serial, 255, 0, part.filesystem)
+
+    def disk_free_space(self, letter: str) -> Tuple[int, int]:
+        self._call("disk_free_space", letter)
+        with self._lock:
+            _, part = self._volume(letter)
+            return (part.size - part.used, part.size)
+
+    def disk_partitions(self) -> list:
+        self._call("disk_partitions")
+        with self._lock:
+            return [
+                SimpleNamespace(
+                    device=f"{p.letter}:\\", mountpoint=f"{p.letter}:\\", fstype=p.filesystem,
+                    opts="rw,removable" if d.media_type == "Removable Media" else "rw,fixed",
+                )
+                for d in self.disks.values() if d.online for p in d.partitions if p.letter
+            ]
+
+    def volume_exists(self, letter: str) -> bool:
+        with self._lock:
+            return letter.upper() in self._letters()
+
+    # ---- WMI ----
+
+    def wmi_connect(self):
+        self._call("wmi_connect")
+        return SimulatedWMIService(self)
+
+    # ---- processos ----
+
+    def process_iter(self):
+        self._call("process_iter")
+        with self._lock:
+            return list(self.processes.values())
+
+    def process(self, pid: int):
+        with self._lock:
+            proc = self.processes.get(pid)
+        if proc is None:
+            raise LookupError(pid)
+        return proc
+
+    def pids(self) -> List[int]:
+        with self._lock:
+            return list(self.processes)
+
+    def kill_process(self, pid: int) -> bool:
+        self._call("kill_process")
+        with self._lock:
+            return self.processes.pop(pid, None) is not None
+
+    # ---- handle de volume ----
+
+    def open_volume(self, letter: str, access: int = GENERIC_READ | GENERIC_WRITE) -> SimHandle:
+        self._call("open_volume", letter)
+        with self._lock:
+            self._volume(letter)
+        return SimHandle(letter.upper())
+
+    def start_writes(self, letter: str, duration: float, write_rate: float = 20 * 1024 ** 2):
+        """Cópia em andamento: o contador de escrita do disco sobe por `duration` segundos"""
+        with self._lock:
+            disk, _ = self._volume(letter)
+            now = time.perf_counter()
+            disk.writing = (now, now + duration, write_rate)
+
+    def flush(self, handle: SimHandle):
+        self._call("flush", handle.letter)
+        with self._lock:
+            disk, _ = self._volume(handle.letter)
+            nbytes = disk.dirty
+            if not nbytes:
+                return
+            disk.flushing = (time.perf_counter(), nbytes)
+        time.sleep(nbytes / disk.write_rate)
+        with self._lock:
+            disk.flushing = None
+            disk.dirty -= nbytes
+            disk.written += nbytes
+
+    def _written(self, disk: SimDisk) -> int:
+        now = time.perf_counter()
+        written = disk.written
+        if disk.writing is not None:
+            started, ends, rate = disk.writing
+            written += int((min(now, ends) - started) * rate)
+        if disk.flushing is not None:
+            started, nbytes = disk.flushing
+            written += min(int((now - started) * disk.write_rate), nbytes)
+        return written
+
+    def disk_io_counters(self) -> Dict[str, SimpleNamespace]:
+        self._call("disk_io_counters")
+        with self._lock:
+            return {
+                f"PhysicalDrive{d.index}": SimpleNamespace(write_bytes=self._written(d))
+                for d in self.disks.values()
+            }
+
+    def pending_write_bytes(self, letter: str) -> Optional[int]:
+        with self._lock:
+            disk, _ = self._volume(letter)
+            return disk.dirty
+
+    def ioctl(self, handle: SimHandle, code: int, in_buffer: Optional[bytes] = None, out_size: int = 0):
+        op = {
+            FSCTL_LOCK_VOLUME: "lock", FSCTL_DISMOUNT_VOLUME: "dismount",
+            IOCTL_STORAGE_EJECT_MEDIA: "eject", IOCTL_STORAGE_GET_DEVICE_NUMBER: "device_number",
+            IOCTL_STORAGE_QUERY_PROPERTY: "query_property", IOCTL_DISK_GET_LENGTH_INFO: "disk_length",
+            IOCTL_DISK_GET_DRIVE_LAYOUT_EX: "drive_layout",
+            IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS: "disk_extents",
+        }.get(code, "ioctl")
+        self._call(op, handle.letter)
+        with self._lock:
+            if handle.disk_index is not None:
+                return self._disk_ioctl(op, handle.disk_index, out_size)
+            if op == "disk_extents":
+                disk, part = self._volume(handle.letter)
+                offset = PARTITION_OFFSET + sum(p.size for p in disk.partitions if p.number < part.number)
+                payload = encode_volume_disk_extents([(disk.index, offset, part.size)])
+                if out_size < len(payload):
+                    raise DeviceError(ERROR_MORE_DATA, "Buffer pequeno")
+                return payload
+            if op == "device_number":
+                disk, part = self._volume(handle.letter)
+                return bytes(STORAGE_DEVICE_NUMBER(FILE_DEVICE_DISK, disk.index, part.number))[:out_size or None]
+            if op == "lock":
+                # Como no Windows: não trava com arquivos abertos por outros processos
+                if self._holders(handle.letter):
+                    raise DeviceError(ERROR_ACCESS_DENIED, "Volume em uso")
+                handle.locked = True
+            elif op == "dismount":
+                handle.dismounted = True
+            elif op == "eject":
+                if self._holders(handle.letter) and not handle.dismounted:
+                    raise DeviceError(ERROR_SHARING_VIOLATION, "Volume em uso")
+                disk, _ = self._volume(handle.letter)
+                del self.disks[disk.index]
+
+    def _disk_ioctl(self, op: str, index: int, out_size: int) -> bytes:
+        """IOCTLs de consulta num handle de PhysicalDriveN (payloads no formato do Windows)"""
+        disk = self.disks.get(index)
+        if disk is None:
+            raise DeviceError(ERROR_FILE_NOT_FOUND, f"PhysicalDrive{index} não existe")
+        if op == "query_property":
+            vendor, _, product = disk.model.partition(" ")
+            payload = encode_storage_device_descriptor(
+                BUS_TYPES.get(disk.interface.upper(), 0), disk.media_type == "Removable Media", vendor, product
+            )
+            return payload[:out_size]  # Como o Windows: descritor truncado ao buffer
+        if op == "disk_length":
+            return bytes(ctypes.c_int64(disk.size))[:out_size]
+        if op == "drive_layout":
+            offset, partitions = PARTITION_OFFSET, []
+            for part in disk.partitions:
+                partitions.append((part.number, offset, part.size, MBR_TYPES.get(part.filesystem.upper(), 0x07)))
+                offset += part.size
+            payload = encode_drive_layout(partitions)
+            if out_size < len(payload):
+                raise DeviceError(ERROR_INSUFFICIENT_BUFFER, "Buffer pequeno")
+            return payload
+        raise DeviceError(ERROR_ACCESS_DENIED, f"{op} não suportado em disco físico")
+
+    def close(self, handle: SimHandle):
+        handle.closed = True
+
+    # ---- discos físicos ----
+
+    def run_diskpart(self, script: str, timeout: float = 10) -> str:
+        """Interpreta o subconjunto de comandos diskpart que o USBEjector envia"""
+        self._call("diskpart")
+        out: List[str] = []
+        disk: Optional[SimDisk] = None
+        part: Optional[SimPartition] = None
+        with self._lock:
+            for raw in script.splitlines():
+                cmd = raw.strip().lower()
+                if cmd == "list disk":
+                    out.append("  Disk ###  Status         Size     Free")
+                    out.append("  --------  -------------  -------  -------")
+                    for d in self.disks.values():
+                        status = "Online" if d.online else "Offline"
+                        out.append(f"  Disk {d.index:<4} {status:<14} {d.size // 1024 ** 3:>4} GB      0 B")
+                elif cmd.startswith("select disk"):
+                    disk = self.disks.get(int(cmd.split()[-1]))
+                    out.append(f"Disk {cmd.split()[-1]} is now the selected disk." if disk
+                               else "The disk you specified is not valid.")
+                elif cmd.startswith("select partition") and disk:
+                    number = int(cmd.split()[-1])
+                    part = next((p for p in disk.partitions if p.number == number), None)
+                elif cmd == "online disk" and disk:
+                    disk.online = True
+                    for p in disk.partitions:
+                        if not p.letter:
+                            p.letter = self.free_letter()
+                    out.append("DiskPart successfully onlined the selected disk.")
+                elif cmd.startswith("assign letter=") and part:
+                    letter = cmd.split("=")[-1].upper()
+                    if letter not in self._letters():
+                        part.letter = letter
+                        out.append("DiskPart successfully assigned the drive letter or mount point.")
+        return "\n".join(out)
+
+    def physical_drives(self) -> List[int]:
+        self._call("physical_drives")
+        with self._lock:
+            return sorted(self.disks)
+
+    def open_physical_drive(self, index: int) -> SimHandle:
+        self._call("open_disk")
+        with self._lock:
+            if index not in self.disks:
+                raise DeviceError(ERROR_FILE_NOT_FOUND, f"PhysicalDrive{index} não existe")
+        return SimHandle(None, disk_index=index)
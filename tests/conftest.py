@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+# Módulos do projeto ficam na raiz do repositório (sem pacote instalável)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulated_backend import SimulatedBackend
+from usb_ejector import USBEjector
+
+
+def open_gui(backend: SimulatedBackend):
+    """Janela real sobre o backend simulado, sem enumeração/monitor automáticos; str se indisponível"""
+    try:
+        import usb_ejector_gui
+    except Exception as e:
+        return f"indisponível ({type(e).__name__})"
+    USBEjector.use_backend(backend)
+    try:
+        gui = usb_ejector_gui.PremiumUSBEjectorGUI()
+    except Exception as e:
+        return f"indisponível ({type(e).__name__}: sem display)"
+    gui._background_started = True
+    gui.devices = USBEjector.get_removable_drives()
+    gui.rerender_devices()
+    gui.root.update()
+    return gui
+
+
+@pytest.fixture
+def sim_backend() -> SimulatedBackend:
+    backend = SimulatedBackend()
+    backend.add_disk("USB Stick 1")
+    backend.add_disk("USB Stick 2", partitions=2)
+    backend.add_disk("USB Offline", mounted=False)
+    USBEjector.use_backend(backend)
+    return backend
+
+
+@pytest.fixture
+def gui(sim_backend):
+    gui = open_gui(sim_backend)
+    if isinstance(gui, str):
+        pytest.skip(f"GUI {gui}")
+    yield gui
+    gui.root.destroy()
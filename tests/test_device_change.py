@@ -0,0 +1,134 @@
+"""WM_DEVICECHANGE: decodificação do DEV_BROADCAST_VOLUME e coalescência das rajadas"""
+
+import ctypes
+import threading
+
+from usb_ejector import (
+    DBT_DEVICEARRIVAL, DBT_DEVICEREMOVECOMPLETE, DBT_DEVTYP_VOLUME,
+    DEV_BROADCAST_HDR, DEV_BROADCAST_VOLUME, DeviceChangeCoalescer,
+    decode_device_broadcast, decode_unitmask,
+)
+
+
+class ManualTimer:
+    """threading.Timer falso: só dispara quando o teste mandar"""
+
+    created = []
+
+    def __init__(self, interval, function):
+        self.interval = interval
+        self.function = function
+        self.started = False
+        self.cancelled = False
+        ManualTimer.created.append(self)
+
+    def start(self):
+        self.started = True
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        if not self.cancelled:
+            self.function()
+
+
+def _coalescer():
+    ManualTimer.created = []
+    calls = []
+    coalescer = DeviceChangeCoalescer(lambda added, removed: calls.append((added, removed)),
+                                      timer_factory=ManualTimer)
+    return coalescer, calls
+
+
+def _fire_pending():
+    for timer in list(ManualTimer.created):
+        timer.fire()
+
+
+def _volume_broadcast(unitmask: int) -> DEV_BROADCAST_VOLUME:
+    return DEV_BROADCAST_VOLUME(ctypes.sizeof(DEV_BROADCAST_VOLUME), DBT_DEVTYP_VOLUME, 0, unitmask, 0)
+
+
+# =========================
+# DECODIFICAÇÃO
+# =========================
+
+def test_decode_unitmask():
+    assert decode_unitmask(0) == set()
+    assert decode_unitmask(1) == {"A"}
+    assert decode_unitmask((1 << 4) | (1 << 5)) == {"E", "F"}
+    assert decode_unitmask(1 << 25) == {"Z"}
+    assert decode_unitmask(1 << 26) == set()  # Bits acima de Z são ignorados
+
+
+def test_decode_volume_broadcast():
+    broadcast = _volume_broadcast((1 << 3) | (1 << 6))
+    assert decode_device_broadcast(ctypes.addressof(broadcast)) == {"D", "G"}
+
+
+def test_decode_non_volume_broadcast():
+    header = DEV_BROADCAST_HDR(ctypes.sizeof(DEV_BROADCAST_HDR), 0x00000005, 0)  # DBT_DEVTYP_DEVICEINTERFACE
+    assert decode_device_broadcast(ctypes.addressof(header)) is None
+    assert decode_device_broadcast(0) is None
+
+
+# =========================
+# COALESCÊNCIA
+# =========================
+
+def test_burst_emits_single_refresh_with_letters():
+    coalescer, calls = _coalescer()
+    coalescer.feed(DBT_DEVICEARRIVAL, decode_unitmask(1 << 4))
+    coalescer.feed(DBT_DEVICEARRIVAL, decode_unitmask(1 << 5))
+    coalescer.feed(DBT_DEVICEREMOVECOMPLETE, {"G"})
+    coalescer.feed(DBT_DEVICEARRIVAL, {"E"})
+    assert calls == []
+    assert sum(not t.cancelled for t in ManualTimer.created) == 1  # Só o último timer segue vivo
+    _fire_pending()
+    assert calls == [({"E", "F"}, {"G"})]
+
+
+def test_last_event_per_letter_wins():
+    coalescer, calls = _coalescer()
+    coalescer.feed(DBT_DEVICEARRIVAL, {"E"})
+    coalescer.feed(DBT_DEVICEREMOVECOMPLETE, {"E"})
+    coalescer.feed(DBT_DEVICEREMOVECOMPLETE, {"F"})
+    coalescer.feed(DBT_DEVICEARRIVAL, {"F"})
+    _fire_pending()
+    assert calls == [({"F"}, {"E"})]
+
+
+def test_unknown_letters_request_full_refresh():
+    coalescer, calls = _coalescer()
+    coalescer.feed(DBT_DEVICEARRIVAL, {"E"})
+    coalescer.feed(DBT_DEVICEARRIVAL, None)
+    _fire_pending()
+    assert calls == [(None, None)]
+
+
+def test_flush_without_events_is_silent():
+    coalescer, calls = _coalescer()
+    coalescer.flush()
+    coalescer.feed(DBT_DEVICEARRIVAL, {"E"})
+    coalescer.cancel()
+    _fire_pending()
+    assert calls == []
+
+
+def test_burst_with_real_timer():
+    done = threading.Event()
+    calls = []
+
+    def callback(added, removed):
+        calls.append((added, removed))
+        done.set()
+
+    coalescer = DeviceChangeCoalescer(callback, quiet_window=0.05)
+    for _ in range(10):
+        coalescer.feed(DBT_DEVICEARRIVAL, {"E", "F"})
+        coalescer.feed(DBT_DEVICEREMOVECOMPLETE, {"G"})
+    assert done.wait(2.0)
+    done.clear()
+    assert not done.wait(0.2)  # Nenhuma segunda notificação
+    assert calls == [({"E", "F"}, {"G"})]
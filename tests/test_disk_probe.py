@@ -0,0 +1,86 @@
+"""Sondagem de discos físicos: payloads de IOCTL gravados decodificados em Linux"""
+
+import pytest
+
+from simulated_backend import (
+    BUS_TYPES, MBR_TYPES, PARTITION_OFFSET, SimulatedBackend,
+    encode_drive_layout, encode_storage_device_descriptor, encode_volume_disk_extents,
+)
+from usb_ejector import (
+    PARTITION_STYLE_MBR, USBEjector,
+    decode_drive_layout, decode_storage_device_descriptor, decode_volume_disk_extents,
+)
+
+
+# =========================
+# PAYLOADS
+# =========================
+
+def test_storage_descriptor_round_trip():
+    payload = encode_storage_device_descriptor(BUS_TYPES["USB"], True, "SanDisk", "Cruzer Blade")
+    assert decode_storage_device_descriptor(payload) == (BUS_TYPES["USB"], True, "SanDisk", "Cruzer Blade")
+
+
+def test_storage_descriptor_without_vendor():
+    payload = encode_storage_device_descriptor(BUS_TYPES["NVME"], False, "", "Samsung SSD 980")
+    assert decode_storage_device_descriptor(payload) == (BUS_TYPES["NVME"], False, "", "Samsung SSD 980")
+
+
+def test_drive_layout_round_trip():
+    gib = 1024 ** 3
+    partitions = [
+        (1, PARTITION_OFFSET, 8 * gib, MBR_TYPES["FAT32"]),
+        (2, PARTITION_OFFSET + 8 * gib, 4 * gib, MBR_TYPES["NTFS"]),
+    ]
+    style, decoded = decode_drive_layout(encode_drive_layout(partitions))
+    assert style == PARTITION_STYLE_MBR
+    assert decoded == [(number, offset, length) for number, offset, length, _ in partitions]
+
+
+def test_drive_layout_skips_empty_mbr_entries():
+    assert decode_drive_layout(encode_drive_layout([])) == (PARTITION_STYLE_MBR, [])
+
+
+def test_volume_disk_extents_round_trip():
+    extents = [(2, PARTITION_OFFSET, 1 << 30), (3, PARTITION_OFFSET, 1 << 29)]
+    assert decode_volume_disk_extents(encode_volume_disk_extents(extents)) == extents
+
+
+@pytest.mark.parametrize("decode, payload", [
+    (decode_storage_device_descriptor, b"\x00" * 4),
+    (decode_drive_layout, b"\x00" * 4),
+    (decode_volume_disk_extents, b"\x00" * 4),
+    (decode_volume_disk_extents, encode_volume_disk_extents([(2, 0, 1)])[:-4]),
+])
+def test_truncated_payloads_raise(decode, payload):
+    with pytest.raises(ValueError):
+        decode(payload)
+
+
+# =========================
+# SONDAGEM
+# =========================
+
+@pytest.fixture
+def probe_backend() -> SimulatedBackend:
+    backend = SimulatedBackend()
+    backend.add_disk("USB Stick")
+    backend.add_disk("USB Offline", mounted=False)
+    USBEjector.use_backend(backend)
+    return backend
+
+
+def test_probe_finds_unmounted_usb_disk(probe_backend):
+    disks = USBEjector.probe_physical_disks()
+    assert all(disk.letters is not None for disk in disks)
+    offline = [disk for disk in disks if disk.is_usb and not disk.letters]
+    assert len(offline) == 1 and offline[0].partitions
+    found = USBEjector._detect_via_ioctl()
+    assert [d.disk_index for d in found] == [offline[0].index]
+
+
+def test_probe_with_unmapped_volume_reports_nothing(probe_backend):
+    letter = USBEjector.get_removable_drives()[0].letter
+    probe_backend.inject_failure("open_volume", letter=letter, count=10)
+    assert all(disk.letters is None for disk in USBEjector.probe_physical_disks())
+    assert USBEjector._detect_via_ioctl() == []
@@ -0,0 +1,91 @@
+"""LinuxBackend/LinuxEjector sobre uma árvore sysfs/procfs falsa (tmp_path)"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from linux_backend import LinuxBackend, LinuxEjector
+
+USB = "sys/devices/pci0000:00/0000:00:14.0/usb2/2-1"
+SCSI = f"{USB}/2-1:1.0/host0/target0:0:0/0:0:0:0"
+BLOCK = f"{SCSI}/block/sdb"
+
+
+def _write(root, rel: str, content: str = ""):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _link(root, target_rel: str, link_rel: str):
+    link = root / link_rel
+    link.parent.mkdir(parents=True, exist_ok=True)
+    os.symlink(os.path.relpath(root / target_rel, link.parent), link)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Pendrive USB sdb com duas partições montadas (uma com espaço no ponto de montagem)"""
+    _write(tmp_path, f"{USB}/idVendor", "0781")
+    _write(tmp_path, f"{USB}/remove")
+    (tmp_path / "sys/bus/usb").mkdir(parents=True)
+    _link(tmp_path, "sys/bus/usb", f"{USB}/subsystem")
+    _link(tmp_path, "sys/bus/usb", f"{USB}/2-1:1.0/subsystem")
+    _write(tmp_path, f"{SCSI}/vendor", "SanDisk")
+    _write(tmp_path, f"{SCSI}/model", "Cruzer Blade")
+    _write(tmp_path, f"{SCSI}/delete")
+    _write(tmp_path, f"{BLOCK}/dev", "8:16")
+    _write(tmp_path, f"{BLOCK}/size", "30031872")
+    _write(tmp_path, f"{BLOCK}/removable", "1")
+    for number, size in ((1, "20000000"), (2, "10000000")):
+        _write(tmp_path, f"{BLOCK}/sdb{number}/partition", str(number))
+        _write(tmp_path, f"{BLOCK}/sdb{number}/dev", f"8:{16 + number}")
+        _write(tmp_path, f"{BLOCK}/sdb{number}/size", size)
+    _link(tmp_path, SCSI, f"{BLOCK}/device")
+    _link(tmp_path, BLOCK, "sys/block/sdb")
+    _link(tmp_path, "dev/sdb1", "dev/disk/by-label/MY\\x20STICK")
+    _write(tmp_path, "proc/self/mountinfo", "\n".join([
+        "22 1 259:1 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p1 rw",
+        "100 22 8:17 / /media/kiosk/MY\\040STICK rw,nosuid shared:50 - vfat /dev/sdb1 rw",
+        "101 22 8:18 / /media/kiosk/DATA rw,nosuid shared:51 - exfat /dev/sdb2 rw",
+    ]) + "\n")
+    return tmp_path
+
+
+@pytest.fixture
+def unmounted(tree):
+    calls = []
+    statvfs = lambda path: SimpleNamespace(f_bavail=1 << 18, f_frsize=4096, f_blocks=1 << 20)
+    LinuxEjector.use_backend(LinuxBackend(root=str(tree), umount=calls.append,
+                                          sync=lambda: None, statvfs=statvfs))
+    return calls
+
+
+def test_get_removable_drives(unmounted):
+    drives = {d.letter: d for d in LinuxEjector.get_removable_drives()}
+    assert sorted(drives) == ["sdb1", "sdb2"]
+    stick = drives["sdb1"]
+    assert stick.mountpoint == "/media/kiosk/MY STICK"
+    assert stick.label == "MY STICK"
+    assert stick.filesystem == "vfat"
+    assert (stick.total_size, stick.free_size) == (4096 << 20, 4096 << 18)
+    assert drives["sdb2"].label == "SanDisk Cruzer Blade"  # Sem rótulo: nome do disco
+
+
+def test_eject_drives_once_per_disk(tree, unmounted, monkeypatch):
+    ejected = []
+    eject_drive = LinuxEjector.eject_drive
+    monkeypatch.setattr(LinuxEjector, "eject_drive", staticmethod(
+        lambda name, cb=None, safe_mode=False: (ejected.append(name), eject_drive(name, cb, safe_mode))[1]))
+    results = LinuxEjector.eject_drives(["sdb1", "sdb2"])
+    assert ejected == ["sdb"]
+    assert results == {"sdb1": (True, "✓ sdb removido", []), "sdb2": (True, "✓ sdb removido", [])}
+    assert sorted(unmounted) == [str(tree / "media/kiosk/DATA"), str(tree / "media/kiosk/MY STICK")]
+    assert (tree / SCSI / "delete").read_text() == "1"
+    assert (tree / USB / "remove").read_text() == "1"
+
+
+def test_eject_drives_unknown_name(unmounted):
+    assert LinuxEjector.eject_drives(["sdz1"]) == {"sdz1": (False, "Inacessível", [])}
+    assert unmounted == []
@@ -0,0 +1,52 @@
+"""Troca de tema: passada de estilo sobre os widgets existentes (sem recriar nenhum)"""
+
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from usb_ejector_gui import ThemeStyler
+
+
+def _widgets(root) -> list:
+    widgets, stack = [], [root]
+    while stack:
+        widget = stack.pop()
+        widgets.append(widget)
+        stack.extend(widget.winfo_children())
+    return widgets
+
+
+def _stylers(gui) -> list:
+    return [gui.styles] + [card.styles for card in gui.device_list.all_cards()]
+
+
+def test_theme_switch_keeps_widget_identities(gui):
+    before = _widgets(gui.root)
+    gui.toggle_theme()
+    gui.root.update()
+    after = _widgets(gui.root)
+    assert len(after) == len(before)
+    assert {id(w) for w in after} == {id(w) for w in before}
+
+
+@pytest.mark.parametrize("switches", [1, 2])
+def test_theme_switch_recolors_registered_widgets(gui, switches):
+    registered = [(w, style) for styler in _stylers(gui) for w, style in styler._entries]
+    assert registered
+    for _ in range(switches):
+        gui.toggle_theme()
+    gui.root.update()
+    assert [(w, style) for styler in _stylers(gui) for w, style in styler._entries] == registered
+    for widget, style in registered:
+        for option, color in ThemeStyler.resolve(style, gui.theme).items():
+            assert widget.cget(option) == color, (str(widget), option)
+
+
+def test_theme_switch_makes_no_backend_calls(gui, sim_backend, monkeypatch):
+    refreshes = []
+    monkeypatch.setattr(gui, "refresh_devices", lambda *args, **kwargs: refreshes.append(args))
+    calls_before = dict(sim_backend.calls)
+    gui.toggle_theme()
+    gui.root.update()
+    assert sim_backend.calls == calls_before
+    assert refreshes == []
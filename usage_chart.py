@@ -0,0 +1,149 @@
+"""
+USB Safe Ejector Pro - Gráfico de uso dos cards
+Anel de uso desenhado uma vez por (percentual, cor, tema) e reaproveitado.
+
+Com Pillow, o anel vira uma imagem pré-renderizada (com antialias) compartilhada por
+todos os cards; sem Pillow, os itens do canvas são criados uma vez e atualizados no
+lugar. Só depende de tkinter, então os benchmarks rodam sem CustomTkinter.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from usb_ejector import _LazyModule, logger
+
+Image = _LazyModule("PIL.Image")
+ImageDraw = _LazyModule("PIL.ImageDraw")
+ImageTk = _LazyModule("PIL.ImageTk")
+
+CHART_SIZE = 32
+RING_RADIUS = 12
+INNER_RADIUS = 7
+CHART_FONT = ("Segoe UI", 7, "bold")
+
+
+def _theme_key(theme) -> str:
+    return getattr(theme, "__name__", None) or str(id(theme))
+
+
+class ChartImageCache:
+    """PhotoImage do anel por (percentual, cor, tema), compartilhada entre cards e refreshes"""
+
+    _shared: Optional["ChartImageCache"] = None
+
+    def __init__(self, size: int = CHART_SIZE, supersample: int = 4, max_entries: int = 512):
+        self.size = size
+        self.supersample = supersample
+        self.max_entries = max_entries
+        self._images: "OrderedDict[Tuple, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> Optional["ChartImageCache"]:
+        """Cache do processo; None quando o Pillow não está instalado"""
+        if cls._shared is None and Image.available and ImageTk.available:
+            cls._shared = cls()
+        return cls._shared
+
+    def _render(self, percent: int, usage_color: str, theme):
+        scale = self.supersample
+        full = self.size * scale
+        c = full / 2
+        ring, inner = RING_RADIUS * scale, INNER_RADIUS * scale
+        image = Image.new("RGBA", (full, full), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        draw.ellipse((c - ring, c - ring, c + ring, c + ring), fill=theme.SPACE_FREE)
+        if percent > 0:
+            # Sentido horário a partir do topo, como o create_arc(start=90, extent<0) do Tk
+            draw.pieslice((c - ring, c - ring, c + ring, c + ring),
+                          start=-90, end=-90 + 360 * percent / 100, fill=usage_color)
+        draw.ellipse((c - inner, c - inner, c + inner, c + inner), fill=theme.BG_SECONDARY)
+        return ImageTk.PhotoImage(image.resize((self.size, self.size), Image.LANCZOS))
+
+    def get(self, percent: int, usage_color: str, theme):
+        key = (percent, usage_color, _theme_key(theme))
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = self._render(percent, usage_color, theme)
+        self._images[key] = image
+        if len(self._images) > self.max_entries:
+            self._images.popitem(last=False)
+        return image
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._images), "hits": self.hits, "misses": self.misses}
+
+
+class UsageChart:
+    """Itens do anel num canvas existente: criados uma vez, reconfigurados só quando a chave muda"""
+
+    def __init__(self, canvas, images: Optional[ChartImageCache] = None, size: int = CHART_SIZE):
+        self.canvas = canvas
+        self.images = images
+        self.size = size
+        self._key: Optional[Tuple] = None
+        self._items: Dict[str, int] = {}
+        self.draws = 0
+
+    def render(self, percent: int, usage_color: str, theme) -> bool:
+        """Desenhar o anel; False quando nada mudou desde o último desenho"""
+        key = (percent, usage_color, _theme_key(theme))
+        if key == self._key:
+            return False
+        self._key = key
+        self.draws += 1
+        if self.images is not None:
+            try:
+                self._render_image(percent, usage_color, theme)
+            except Exception as e:
+                # Pillow quebrado/sem suporte a Tk: passar para os itens vetoriais
+                logger.debug(f"Gráfico sem imagem: {e}")
+                self.images = None
+                for item in self._items.values():
+                    self.canvas.delete(item)
+                self._items = {}
+        if self.images is None:
+            self._render_items(percent, usage_color, theme)
+        self._render_text(percent, theme)
+        return True
+
+    def _render_image(self, percent: int, usage_color: str, theme):
+        image = self.images.get(percent, usage_color, theme)
+        item = self._items.get("image")
+        if item is None:
+            self._items["image"] = self.canvas.create_image(self.size // 2, self.size // 2, image=image)
+        else:
+            self.canvas.itemconfigure(item, image=image)
+
+    def _render_items(self, percent: int, usage_color: str, theme):
+        c, r, ir = self.size // 2, RING_RADIUS, INNER_RADIUS
+        extent = -360 * (percent / 100)
+        arc_state = "normal" if percent > 0 else "hidden"
+        if "ring" not in self._items:
+            canvas = self.canvas
+            self._items["ring"] = canvas.create_oval(c - r, c - r, c + r, c + r, fill=theme.SPACE_FREE, outline="")
+            self._items["arc"] = canvas.create_arc(
+                c - r, c - r, c + r, c + r, start=90, extent=extent,
+                fill=usage_color, outline="", state=arc_state
+            )
+            self._items["inner"] = canvas.create_oval(
+                c - ir, c - ir, c + ir, c + ir, fill=theme.BG_SECONDARY, outline="")
+            return
+        self.canvas.itemconfigure(self._items["ring"], fill=theme.SPACE_FREE)
+        self.canvas.itemconfigure(self._items["arc"], extent=extent, fill=usage_color, state=arc_state)
+        self.canvas.itemconfigure(self._items["inner"], fill=theme.BG_SECONDARY)
+
+    def _render_text(self, percent: int, theme):
+        item = self._items.get("text")
+        if item is None:
+            self._items["text"] = self.canvas.create_text(
+                self.size // 2, self.size // 2, text=f"{percent}%",
+                fill=theme.TEXT_PRIMARY, font=CHART_FONT
+            )
+        else:
+            self.canvas.itemconfigure(item, text=f"{percent}%", fill=theme.TEXT_PRIMARY)
@@ -8,9 +8,8 @@ USB Safe Ejector Pro - v7.3 ULTRA FAST
 ✅ Toggle ⚡/🛡 na barra de título para alternar modos
 """
 
-import customtkinter as ctk
-import threading
 import time
+import threading
 import sys
 import ctypes
 from typing import List, Dict, Optional, Tuple, Set
@@ -18,122 +17,154 @@ import logging
 import subprocess
 import re
 import os
+import json
+import math
+import importlib
+import importlib.util
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed, TimeoutError as FutureTimeout
+from contextlib import contextmanager
 
-# Importações Windows
-try:
-    import win32file
-    import win32api
-    import win32con
-    import win32gui
-    import pywintypes
-    import winerror
-    import psutil
-    import pythoncom
-    import win32com.client
-except ImportError:
-    print("Erro: pip install customtkinter pywin32 psutil")
-    sys.exit(1)
-
-try:
-    from CTkMessagebox import CTkMessagebox
-except ImportError:
-    print("Erro: pip install CTkMessagebox")
-    sys.exit(1)
-
-# Logs
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("usb_ejector.log", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+_PROCESS_T0 = time.perf_counter()  # Início da contagem do relatório de inicialização
 
 
 # =========================
-# DESIGN SYSTEM PREMIUM
+# STARTUP
 # =========================
 
-class DesignSystem:
-    """Design System Windows 11"""
-    
-    class Colors:
-        class Light:
-            BG_PRIMARY = "#ffffff"
-            BG_SECONDARY = "#f8f8f8"
-            BG_TERTIARY = "#ececec"
-            BORDER = "#e0e0e0"
-            BORDER_FOCUS = "#d0d0d0"
-            ACTION_PRIMARY = "#0067c0"
-            ACTION_DANGER = "#d32f2f"
-            ACTION_WARNING = "#f9a825"
-            TEXT_PRIMARY = "#1a1a1a"
-            TEXT_SECONDARY = "#666666"
-            TEXT_TERTIARY = "#999999"
-            PROGRESS_BG = "#e8e8e8"
-            PROGRESS_FILL = "#0067c0"
-            SPACE_OK = "#0067c0"
-            SPACE_WARNING = "#f9a825"
-            SPACE_CRITICAL = "#d32f2f"
-            SPACE_FREE = "#e8e8e8"
-        
-        class Dark:
-            BG_PRIMARY = "#0f0f0f"
-            BG_SECONDARY = "#1a1a1a"
-            BG_TERTIARY = "#252525"
-            BORDER = "#2a2a2a"
-            BORDER_FOCUS = "#3a3a3a"
-            ACTION_PRIMARY = "#1e88e5"
-            ACTION_DANGER = "#e53935"
-            ACTION_WARNING = "#ffa726"
-            TEXT_PRIMARY = "#ffffff"
-            TEXT_SECONDARY = "#b0b0b0"
-            TEXT_TERTIARY = "#808080"
-            PROGRESS_BG = "#2a2a2a"
-            PROGRESS_FILL = "#1e88e5"
-            SPACE_OK = "#1e88e5"
-            SPACE_WARNING = "#ffa726"
-            SPACE_CRITICAL = "#e53935"
-            SPACE_FREE = "#2a2a2a"
-    
-    SPACE_XS = 4
-    SPACE_SM = 6
-    SPACE_MD = 8
-    SPACE_LG = 12
-    SPACE_XL = 16
-    RADIUS_SM = 4
-    RADIUS_MD = 6
-    RADIUS_LG = 8
-    RADIUS_FULL = 999
-    
-    @staticmethod
-    def get_fonts():
-        return {
-            'title': ctk.CTkFont(family="Segoe UI", size=11, weight="bold"),
-            'body': ctk.CTkFont(family="Segoe UI", size=10),
-            'small': ctk.CTkFont(family="Segoe UI", size=9),
-            'micro': ctk.CTkFont(family="Segoe UI", size=8),
-            'icon': ctk.CTkFont(family="Segoe UI", size=14, weight="bold"),
-            'icon_small': ctk.CTkFont(family="Segoe UI", size=12),
-        }
-    
-    ANIM_FAST = 150
-    ANIM_NORMAL = 250
-    ANIM_SLOW = 350
+class StartupReport:
+    """Marcos de inicialização e imports tardios (estilo -X importtime, por fase)"""
+
+    def __init__(self, t0: float):
+        self.t0 = t0
+        self._last = t0
+        self._modules = len(sys.modules)
+        self.phases: List[Tuple[str, float, float, int]] = []  # (fase, início ms, duração ms, módulos novos)
+        self.imports: List[Tuple[str, float]] = []  # (módulo, ms) carregados sob demanda
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        modules = len(sys.modules)
+        self.phases.append((phase, (self._last - self.t0) * 1000, (now - self._last) * 1000,
+                            modules - self._modules))
+        self._last = now
+        self._modules = modules
+
+    def record_import(self, name: str, seconds: float):
+        self.imports.append((name, seconds * 1000))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000
+
+    def format(self) -> str:
+        lines = ["startup | início ms | duração ms | módulos | fase"]
+        for phase, start, duration, modules in self.phases:
+            lines.append(f"startup | {start:9.1f} | {duration:10.1f} | {modules:7d} | {phase}")
+        for name, ms in self.imports:
+            lines.append(f"import  | {'':9} | {ms:10.1f} | {'':7} | {name} (sob demanda)")
+        return "\n".join(lines)
+
+
+startup_report = StartupReport(_PROCESS_T0)
+
+
+class _LazyModule:
+    """Módulo importado no primeiro acesso a um atributo (pywin32/psutil pesam na abertura)"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    @property
+    def available(self) -> bool:
+        try:
+            return self._module is not None or importlib.util.find_spec(self._name) is not None
+        except (ImportError, ValueError):
+            return False
 
+    def _load(self):
+        start = time.perf_counter()
+        module = importlib.import_module(self._name)
+        startup_report.record_import(self._name, time.perf_counter() - start)
+        self._module = module
+        return module
+
+    def __getattr__(self, attr: str):
+        module = self.__dict__.get("_module") or self._load()
+        return getattr(module, attr)
+
+
+# Importações Windows/psutil sob demanda (sem elas só os backends simulado/Linux funcionam)
+win32file = _LazyModule("win32file")
+win32api = _LazyModule("win32api")
+win32con = _LazyModule("win32con")
+win32gui = _LazyModule("win32gui")
+pythoncom = _LazyModule("pythoncom")
+win32com_client = _LazyModule("win32com.client")
+psutil = _LazyModule("psutil")
+
+class _StartupLogBuffer(logging.Handler):
+    """Guarda os registros até o arquivo de log ser aberto"""
+
+    def __init__(self, capacity: int = 10000):
+        super().__init__()
+        self.records: deque = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+
+# Logs: o arquivo só é aberto depois da primeira pintura (enable_file_logging)
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+_startup_log_buffer: Optional[_StartupLogBuffer] = _StartupLogBuffer()
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT,
+                    handlers=[logging.StreamHandler(), _startup_log_buffer])
+logger = logging.getLogger(__name__)
+
+
+def enable_file_logging(path: str = "usb_ejector.log"):
+    """Anexar o FileHandler e despejar nele o que foi logado até aqui"""
+    global _startup_log_buffer
+    file_handler = logging.FileHandler(path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.addHandler(file_handler)
+    if _startup_log_buffer is not None:
+        root.removeHandler(_startup_log_buffer)
+        for record in _startup_log_buffer.records:
+            file_handler.handle(record)
+        _startup_log_buffer = None
+    return file_handler
+
+
+# Modos de ejeção (⚡ rápido, 🛡 seguro, 🤖 auto pela atividade de I/O)
+EJECT_MODES = ("fast", "safe", "auto")
+EJECT_MODE_NAMES = {"fast": "RÁPIDO", "safe": "SEGURO", "auto": "AUTO"}
 
 # Constantes Windows
 IOCTL_STORAGE_EJECT_MEDIA = 0x2D4808
 IOCTL_STORAGE_MEDIA_REMOVAL = 0x002D4804
 FSCTL_LOCK_VOLUME = 0x00090018
 FSCTL_DISMOUNT_VOLUME = 0x00090020
+IOCTL_STORAGE_GET_DEVICE_NUMBER = 0x002D1080
+IOCTL_STORAGE_QUERY_PROPERTY = 0x002D1400
+IOCTL_DISK_GET_LENGTH_INFO = 0x0007405C
+IOCTL_DISK_GET_DRIVE_LAYOUT_EX = 0x00070050
+IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS = 0x00560000
 GENERIC_READ = 0x80000000
 GENERIC_WRITE = 0x40000000
 FILE_SHARE_READ = 0x00000001
 FILE_SHARE_WRITE = 0x00000002
 OPEN_EXISTING = 3
+ERROR_ACCESS_DENIED = 5
+ERROR_SHARING_VIOLATION = 32
+ERROR_INSUFFICIENT_BUFFER = 122
+ERROR_MORE_DATA = 234
+
+BUS_TYPE_USB = 7  # STORAGE_BUS_TYPE.BusTypeUsb
+PARTITION_STYLE_MBR = 0
+PARTITION_STYLE_GPT = 1
+PARTITION_STYLE_RAW = 2
 
 DRIVE_UNKNOWN = 0
 DRIVE_NO_ROOT_DIR = 1
@@ -143,6 +174,203 @@ DRIVE_REMOTE = 4
 DRIVE_CDROM = 5
 DRIVE_RAMDISK = 6
 
+DBT_DEVICEARRIVAL = 0x8000
+DBT_DEVICEREMOVECOMPLETE = 0x8004
+DBT_DEVTYP_VOLUME = 0x00000002
+
+
+class DEV_BROADCAST_HDR(ctypes.Structure):
+    _fields_ = [
+        ("dbch_size", ctypes.c_uint32),
+        ("dbch_devicetype", ctypes.c_uint32),
+        ("dbch_reserved", ctypes.c_uint32),
+    ]
+
+
+class DEV_BROADCAST_VOLUME(ctypes.Structure):
+    _fields_ = [
+        ("dbcv_size", ctypes.c_uint32),
+        ("dbcv_devicetype", ctypes.c_uint32),
+        ("dbcv_reserved", ctypes.c_uint32),
+        ("dbcv_unitmask", ctypes.c_uint32),
+        ("dbcv_flags", ctypes.c_uint16),
+    ]
+
+
+class STORAGE_DEVICE_NUMBER(ctypes.Structure):
+    _fields_ = [
+        ("DeviceType", ctypes.c_uint32),
+        ("DeviceNumber", ctypes.c_uint32),
+        ("PartitionNumber", ctypes.c_uint32),
+    ]
+
+
+def decode_storage_device_number(buffer: bytes) -> Tuple[int, int, int]:
+    """Saída de IOCTL_STORAGE_GET_DEVICE_NUMBER → (tipo, nº do disco físico, nº da partição)"""
+    if buffer is None or len(buffer) < ctypes.sizeof(STORAGE_DEVICE_NUMBER):
+        raise ValueError("STORAGE_DEVICE_NUMBER truncado")
+    number = STORAGE_DEVICE_NUMBER.from_buffer_copy(bytes(buffer))
+    return number.DeviceType, number.DeviceNumber, number.PartitionNumber
+
+
+class STORAGE_PROPERTY_QUERY(ctypes.Structure):
+    _fields_ = [
+        ("PropertyId", ctypes.c_uint32),  # StorageDeviceProperty = 0
+        ("QueryType", ctypes.c_uint32),  # PropertyStandardQuery = 0
+        ("AdditionalParameters", ctypes.c_ubyte * 1),
+    ]
+
+
+class STORAGE_DEVICE_DESCRIPTOR(ctypes.Structure):
+    _fields_ = [
+        ("Version", ctypes.c_uint32),
+        ("Size", ctypes.c_uint32),
+        ("DeviceType", ctypes.c_ubyte),
+        ("DeviceTypeModifier", ctypes.c_ubyte),
+        ("RemovableMedia", ctypes.c_ubyte),
+        ("CommandQueueing", ctypes.c_ubyte),
+        ("VendorIdOffset", ctypes.c_uint32),
+        ("ProductIdOffset", ctypes.c_uint32),
+        ("ProductRevisionOffset", ctypes.c_uint32),
+        ("SerialNumberOffset", ctypes.c_uint32),
+        ("BusType", ctypes.c_uint32),
+        ("RawPropertiesLength", ctypes.c_uint32),
+    ]
+
+
+class PARTITION_INFORMATION_MBR(ctypes.Structure):
+    _fields_ = [
+        ("PartitionType", ctypes.c_ubyte),
+        ("BootIndicator", ctypes.c_ubyte),
+        ("RecognizedPartition", ctypes.c_ubyte),
+        ("HiddenSectors", ctypes.c_uint32),
+        ("PartitionId", ctypes.c_ubyte * 16),
+    ]
+
+
+class PARTITION_INFORMATION_GPT(ctypes.Structure):
+    _fields_ = [
+        ("PartitionType", ctypes.c_ubyte * 16),
+        ("PartitionId", ctypes.c_ubyte * 16),
+        ("Attributes", ctypes.c_uint64),
+        ("Name", ctypes.c_uint16 * 36),  # WCHAR (c_wchar tem 4 bytes fora do Windows)
+    ]
+
+
+class PARTITION_INFORMATION_UNION(ctypes.Union):
+    _fields_ = [("Mbr", PARTITION_INFORMATION_MBR), ("Gpt", PARTITION_INFORMATION_GPT)]
+
+
+class PARTITION_INFORMATION_EX(ctypes.Structure):
+    _fields_ = [
+        ("PartitionStyle", ctypes.c_uint32),
+        ("StartingOffset", ctypes.c_int64),
+        ("PartitionLength", ctypes.c_int64),
+        ("PartitionNumber", ctypes.c_uint32),
+        ("RewritePartition", ctypes.c_ubyte),
+        ("IsServicePartition", ctypes.c_ubyte),
+        ("Info", PARTITION_INFORMATION_UNION),
+    ]
+
+
+class DRIVE_LAYOUT_INFORMATION_GPT(ctypes.Structure):
+    _fields_ = [
+        ("DiskId", ctypes.c_ubyte * 16),
+        ("StartingUsableOffset", ctypes.c_int64),
+        ("UsableLength", ctypes.c_int64),
+        ("MaxPartitionCount", ctypes.c_uint32),
+    ]
+
+
+class DRIVE_LAYOUT_INFORMATION_MBR(ctypes.Structure):
+    _fields_ = [("Signature", ctypes.c_uint32), ("CheckSum", ctypes.c_uint32)]
+
+
+class DRIVE_LAYOUT_INFORMATION_UNION(ctypes.Union):
+    _fields_ = [("Mbr", DRIVE_LAYOUT_INFORMATION_MBR), ("Gpt", DRIVE_LAYOUT_INFORMATION_GPT)]
+
+
+class DRIVE_LAYOUT_INFORMATION_EX(ctypes.Structure):
+    _fields_ = [
+        ("PartitionStyle", ctypes.c_uint32),
+        ("PartitionCount", ctypes.c_uint32),
+        ("Info", DRIVE_LAYOUT_INFORMATION_UNION),
+        ("PartitionEntry", PARTITION_INFORMATION_EX * 1),
+    ]
+
+
+class DISK_EXTENT(ctypes.Structure):
+    _fields_ = [
+        ("DiskNumber", ctypes.c_uint32),
+        ("StartingOffset", ctypes.c_int64),
+        ("ExtentLength", ctypes.c_int64),
+    ]
+
+
+class VOLUME_DISK_EXTENTS(ctypes.Structure):
+    _fields_ = [("NumberOfDiskExtents", ctypes.c_uint32), ("Extents", DISK_EXTENT * 1)]
+
+
+STORAGE_DEVICE_PROPERTY_QUERY = bytes(STORAGE_PROPERTY_QUERY(0, 0))
+
+
+def _entries(buffer: bytes, struct_cls, offset: int, count: int, name: str) -> list:
+    """`count` estruturas consecutivas a partir de `offset` (ValueError se o buffer não as contém)"""
+    size = ctypes.sizeof(struct_cls)
+    if len(buffer) < offset + count * size:
+        raise ValueError(f"{name} truncado ({count} entradas)")
+    return [struct_cls.from_buffer_copy(buffer, offset + i * size) for i in range(count)]
+
+
+def _ascii_at(buffer: bytes, offset: int) -> str:
+    """String ASCII terminada em NUL no deslocamento (0 = ausente)"""
+    if not offset or offset >= len(buffer):
+        return ""
+    end = buffer.find(b"\x00", offset)
+    return buffer[offset:end if end >= 0 else len(buffer)].decode("ascii", errors="ignore").strip()
+
+
+def decode_storage_device_descriptor(buffer: bytes) -> Tuple[int, bool, str, str]:
+    """Saída de IOCTL_STORAGE_QUERY_PROPERTY (StorageDeviceProperty) → (barramento, removível, fabricante, produto)"""
+    buffer = bytes(buffer or b"")
+    descriptor = _entries(buffer, STORAGE_DEVICE_DESCRIPTOR, 0, 1, "STORAGE_DEVICE_DESCRIPTOR")[0]
+    return (
+        descriptor.BusType, bool(descriptor.RemovableMedia),
+        _ascii_at(buffer, descriptor.VendorIdOffset), _ascii_at(buffer, descriptor.ProductIdOffset),
+    )
+
+
+def decode_disk_length(buffer: bytes) -> int:
+    """Saída de IOCTL_DISK_GET_LENGTH_INFO → tamanho do disco em bytes"""
+    return _entries(bytes(buffer or b""), ctypes.c_int64, 0, 1, "GET_LENGTH_INFORMATION")[0].value
+
+
+def decode_drive_layout(buffer: bytes) -> Tuple[int, List[Tuple[int, int, int]]]:
+    """Saída de IOCTL_DISK_GET_DRIVE_LAYOUT_EX → (estilo, [(nº, início, tamanho)] das partições usadas)"""
+    buffer = bytes(buffer or b"")
+    header_size = DRIVE_LAYOUT_INFORMATION_EX.PartitionEntry.offset
+    if len(buffer) < header_size:
+        raise ValueError("DRIVE_LAYOUT_INFORMATION_EX truncado")
+    style, count = (ctypes.c_uint32 * 2).from_buffer_copy(buffer)
+    entries = _entries(buffer, PARTITION_INFORMATION_EX, header_size, count, "DRIVE_LAYOUT_INFORMATION_EX")
+    partitions = [
+        (p.PartitionNumber, p.StartingOffset, p.PartitionLength) for p in entries
+        # MBR sempre lista múltiplos de 4 entradas; as vazias têm tipo 0
+        if p.PartitionLength > 0 and not (p.PartitionStyle == PARTITION_STYLE_MBR and p.Info.Mbr.PartitionType == 0)
+    ]
+    return style, partitions
+
+
+def decode_volume_disk_extents(buffer: bytes) -> List[Tuple[int, int, int]]:
+    """Saída de IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS → [(nº do disco físico, início, tamanho)]"""
+    buffer = bytes(buffer or b"")
+    header_size = VOLUME_DISK_EXTENTS.Extents.offset
+    if len(buffer) < header_size:
+        raise ValueError("VOLUME_DISK_EXTENTS truncado")
+    count = ctypes.c_uint32.from_buffer_copy(buffer).value
+    return [(e.DiskNumber, e.StartingOffset, e.ExtentLength)
+            for e in _entries(buffer, DISK_EXTENT, header_size, count, "VOLUME_DISK_EXTENTS")]
+
 
 # =========================
 # CORE / DOMAIN
@@ -153,7 +381,8 @@ class USBDevice:
     
     def __init__(self, letter: str, label: str, filesystem: str,
                  total_size: int, free_size: int, source: str, 
-                 is_mounted: bool = True, disk_index: int = -1):
+                 is_mounted: bool = True, disk_index: int = -1,
+                 device: str = "", mountpoint: str = "", stale: bool = False):
         self.letter = letter
         self.label = label or "Dispositivo USB"
         self.filesystem = filesystem or "FAT32"
@@ -163,6 +392,20 @@ class USBDevice:
         self.source = source
         self.is_mounted = is_mounted
         self.disk_index = disk_index
+        self.device = device  # Nome do kernel no Linux (sdb, sdb1)
+        self.mountpoint = mountpoint
+        self.stale = stale  # Vindo do cache, ainda não confirmado pela enumeração
+
+    @property
+    def key(self) -> str:
+        """Identidade estável do dispositivo (usada para reconciliar os cards)"""
+        if self.is_mounted:
+            return f"vol:{self.letter}"
+        if self.disk_index >= 0:
+            return f"disk:{self.disk_index}"
+        if self.device:
+            return f"disk:{self.device}"
+        return f"disk:{self.label}"
 
     def get_size_gb(self) -> str:
         if self.total_size == 0:
@@ -207,20 +450,1208 @@ class ProcessInfo:
         self.files = files
 
 
+class WMIDisk:
+    """Disco físico visto pelo WMI"""
+
+    def __init__(self, device_id: str, index: int, model: str, size: int,
+                 interface_type: str, media_type: str):
+        self.device_id = device_id
+        self.index = index
+        self.model = model
+        self.size = size
+        self.interface_type = interface_type
+        self.media_type = media_type
+
+    @property
+    def is_usb(self) -> bool:
+        return (self.interface_type or "").upper() == "USB"
+
+    @property
+    def is_removable_media(self) -> bool:
+        return self.media_type == "Removable Media"
+
+
+class PhysicalDisk:
+    """Disco físico visto pelos IOCTLs de armazenamento (uma abertura por disco)"""
+
+    def __init__(self, index: int, bus_type: int, removable: bool, vendor: str, product: str):
+        self.index = index
+        self.bus_type = bus_type
+        self.removable = removable
+        self.vendor = vendor
+        self.product = product
+        self.size = 0
+        self.partition_style = PARTITION_STYLE_RAW
+        self.partitions: List[Tuple[int, int, int]] = []  # (nº, início, tamanho)
+        self.letters: Optional[List[str]] = None  # Volumes com letra neste disco (None: sem mapeamento)
+
+    @property
+    def is_usb(self) -> bool:
+        return self.bus_type == BUS_TYPE_USB
+
+    @property
+    def model(self) -> str:
+        return " ".join(part for part in (self.vendor, self.product) if part)
+
+
+class WMITopology:
+    """Snapshot disco → partição → letra montado com 3 consultas WMI em lote"""
+
+    DISK_QUERY = "SELECT DeviceID, Index, Model, Size, InterfaceType, MediaType FROM Win32_DiskDrive"
+    DISK_PARTITION_QUERY = "SELECT Antecedent, Dependent FROM Win32_DiskDriveToDiskPartition"
+    LOGICAL_PARTITION_QUERY = "SELECT Antecedent, Dependent FROM Win32_LogicalDiskToPartition"
+
+    _DEVICE_ID_RE = re.compile(r'DeviceID="((?:[^"\\]|\\.)*)"')
+
+    def __init__(self):
+        self.disks: Dict[str, WMIDisk] = {}
+        self.partitions: Dict[str, List[str]] = {}
+        self.letters: Dict[str, List[str]] = {}
+
+    @classmethod
+    def query(cls, svc) -> "WMITopology":
+        """Executar as 3 consultas e juntar o grafo em memória"""
+        topology = cls()
+
+        for disk in svc.ExecQuery(cls.DISK_QUERY):
+            try:
+                device_id = str(disk.DeviceID or "")
+                if not device_id:
+                    continue
+                topology.disks[device_id.upper()] = WMIDisk(
+                    device_id=device_id,
+                    index=int(disk.Index) if disk.Index is not None else -1,
+                    model=disk.Model or "USB Drive",
+                    size=int(disk.Size) if disk.Size else 0,
+                    interface_type=disk.InterfaceType or "",
+                    media_type=disk.MediaType or "",
+                )
+            except Exception as e:
+                logger.debug(f"Erro processar disco: {e}")
+
+        for assoc in svc.ExecQuery(cls.DISK_PARTITION_QUERY):
+            disk_id = cls._path_device_id(assoc.Antecedent)
+            part_id = cls._path_device_id(assoc.Dependent)
+            if disk_id and part_id:
+                topology.partitions.setdefault(disk_id.upper(), []).append(part_id.upper())
+
+        for assoc in svc.ExecQuery(cls.LOGICAL_PARTITION_QUERY):
+            part_id = cls._path_device_id(assoc.Antecedent)
+            logical_id = cls._path_device_id(assoc.Dependent)
+            if part_id and logical_id:
+                topology.letters.setdefault(part_id.upper(), []).append(logical_id[0].upper())
+
+        return topology
+
+    @classmethod
+    def _path_device_id(cls, path) -> Optional[str]:
+        """Extrair DeviceID de um caminho de objeto WMI (Antecedent/Dependent)"""
+        match = cls._DEVICE_ID_RE.search(str(path or ""))
+        if not match:
+            return None
+        return re.sub(r'\\(.)', r'\1', match.group(1))
+
+    def usb_disks(self, removable_only: bool = False) -> List[WMIDisk]:
+        return [
+            d for d in self.disks.values()
+            if d.is_usb and (d.is_removable_media or not removable_only)
+        ]
+
+    def disk_by_index(self, disk_index: int) -> Optional[WMIDisk]:
+        for disk in self.disks.values():
+            if disk.index == disk_index:
+                return disk
+        return None
+
+    def letters_for(self, disk: WMIDisk) -> List[str]:
+        letters: List[str] = []
+        for part_id in self.partitions.get(disk.device_id.upper(), []):
+            letters.extend(self.letters.get(part_id, []))
+        return letters
+
+    def is_mounted(self, disk: WMIDisk) -> bool:
+        return bool(self.letters_for(disk))
+
+
+class DetectionReport:
+    """Tempos por backend e origem de cada letra numa detecção"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.sources: Dict[str, Set[str]] = {}
+        self.late: List[str] = []
+        self.carried_over: List[str] = []
+        self.syscalls = 0
+        self.total: float = 0.0
+
+    def add(self, backend: str, letters: Set[str], elapsed: float):
+        self.timings[backend] = elapsed
+        for letter in letters:
+            self.sources.setdefault(letter, set()).add(backend)
+
+    def summary(self) -> str:
+        timings = ", ".join(f"{name}={t * 1000:.0f}ms" for name, t in self.timings.items())
+        sources = ", ".join(f"{l}:{'+'.join(sorted(b))}" for l, b in sorted(self.sources.items()))
+        text = f"Detecção {self.total * 1000:.0f}ms, {self.syscalls} syscalls [{timings}] {sources or '-'}"
+        if self.late:
+            text += f" | atrasados: {', '.join(self.late)}"
+        if self.carried_over:
+            text += f" | da detecção anterior: {', '.join(self.carried_over)}"
+        return text
+
+
+class DriveInfoSnapshot:
+    """Cache curto de GetDriveType/GetVolumeInformation/GetDiskFreeSpaceEx/partições"""
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float = 2.0, backend: Optional["DeviceBackend"] = None):
+        self.ttl = ttl
+        self.backend = backend or WindowsBackend()
+        self.created_at = time.monotonic()
+        self.syscalls = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._values: Dict[Tuple[str, str], object] = {}
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.created_at > self.ttl
+
+    def _memo(self, kind: str, letter: str, fn, default):
+        key = (kind, letter)
+        with self._lock:
+            value = self._values.get(key, self._MISSING)
+            if value is not self._MISSING:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self._values.get(key, self._MISSING)
+            if value is not self._MISSING:
+                return value
+            try:
+                value = fn()
+            except Exception:
+                value = default
+            with self._lock:
+                self.syscalls += 1
+                self._values[key] = value
+            return value
+
+    def logical_drives(self) -> List[str]:
+        return self._memo("logical", "*", self.backend.logical_drives, [])
+
+    def drive_type(self, letter: str) -> int:
+        return self._memo("type", letter, lambda: self.backend.drive_type(letter), DRIVE_UNKNOWN)
+
+    def volume_info(self, letter: str) -> Optional[tuple]:
+        return self._memo("volume", letter, lambda: self.backend.volume_information(letter), None)
+
+    def free_space(self, letter: str) -> Optional[Tuple[int, int]]:
+        """(livre, total) em bytes"""
+        return self._memo("space", letter, lambda: tuple(self.backend.disk_free_space(letter)), None)
+
+    def partitions(self) -> list:
+        return self._memo("partitions", "*", self.backend.disk_partitions, [])
+
+
+class EjectStepRecord:
+    """Um passo do pipeline de ejeção (duração, resultado e código de erro)"""
+
+    def __init__(self, step: str, duration: float, error_code: Optional[int],
+                 device: str, mode: str, ok: bool):
+        self.step = step
+        self.duration = duration
+        self.error_code = error_code
+        self.device = device
+        self.mode = mode
+        self.ok = ok
+        self.timestamp = time.time()
+
+    def to_dict(self) -> Dict:
+        return {
+            "step": self.step, "duration_ms": round(self.duration * 1000, 3),
+            "error_code": self.error_code, "device": self.device,
+            "mode": self.mode, "ok": self.ok, "timestamp": self.timestamp,
+        }
+
+
+class EjectMetrics:
+    """Histogramas de latência por (modo, passo) em memória, exportáveis em JSON"""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, max_records: int = 500, max_samples: int = 1000):
+        self._lock = threading.Lock()
+        self.records: deque = deque(maxlen=max_records)
+        self._samples: Dict[Tuple[str, str], deque] = {}
+        self._buckets: Dict[Tuple[str, str], List[int]] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._max_samples = max_samples
+
+    def record(self, rec: EjectStepRecord):
+        key = (rec.mode, rec.step)
+        ms = rec.duration * 1000
+        with self._lock:
+            self.records.append(rec)
+            self._samples.setdefault(key, deque(maxlen=self._max_samples)).append(ms)
+            buckets = self._buckets.setdefault(key, [0] * (len(self.BUCKETS_MS) + 1))
+            buckets[next((i for i, b in enumerate(self.BUCKETS_MS) if ms <= b), len(self.BUCKETS_MS))] += 1
+            if not rec.ok:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def summary(self) -> Dict[str, Dict[str, Dict]]:
+        """{modo: {passo: count, errors, p50/p95/max em ms, buckets}}"""
+        out: Dict[str, Dict[str, Dict]] = {}
+        with self._lock:
+            for (mode, step), samples in self._samples.items():
+                values = list(samples)
+                labels = [f"<={b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+                out.setdefault(mode, {})[step] = {
+                    "count": len(values),
+                    "errors": self._errors.get((mode, step), 0),
+                    "p50_ms": round(self._percentile(values, 50), 3),
+                    "p95_ms": round(self._percentile(values, 95), 3),
+                    "max_ms": round(max(values), 3),
+                    "buckets": {l: c for l, c in zip(labels, self._buckets[(mode, step)]) if c},
+                }
+        return out
+
+    def to_json(self, include_records: bool = True) -> str:
+        data = {"summary": self.summary()}
+        if include_records:
+            with self._lock:
+                data["records"] = [r.to_dict() for r in self.records]
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def dump(self, path: str, include_records: bool = True):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json(include_records))
+
+
+class EjectTrace:
+    """Cronometra os passos de uma ejeção e publica cada um em EjectMetrics"""
+
+    def __init__(self, metrics: EjectMetrics, device: str, mode: str):
+        self.metrics = metrics
+        self.device = device
+        self.mode = mode
+        self.records: List[EjectStepRecord] = []
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        error_code = None
+        ok = False
+        try:
+            yield
+            ok = True
+        except Exception as e:
+            error_code = getattr(e, "winerror", None) or getattr(e, "errno", None) or -1
+            raise
+        finally:
+            rec = EjectStepRecord(name, time.perf_counter() - start, error_code, self.device, self.mode, ok)
+            self.records.append(rec)
+            self.metrics.record(rec)
+
+    def optional(self, name: str, fn) -> bool:
+        """Passo cuja falha não interrompe a ejeção"""
+        try:
+            with self.step(name):
+                fn()
+            return True
+        except Exception:
+            return False
+
+    def describe(self) -> str:
+        return ", ".join(
+            f"{r.step}={r.duration * 1000:.0f}ms{'' if r.ok else f'(erro {r.error_code})'}"
+            for r in self.records
+        )
+
+
+class FlushProgress:
+    """Progresso real do flush a partir do contador de bytes escritos no disco"""
+
+    def __init__(self, read_written, report, expected_bytes: Optional[int] = None,
+                 band: Tuple[int, int] = (20, 40), interval: float = 0.1,
+                 scale: int = 32 * 1024 ** 2, clock=time.perf_counter):
+        self.read_written = read_written  # () → bytes escritos (acumulado) ou None
+        self.report = report
+        self.expected_bytes = expected_bytes or None  # Sem dica: percentual assintótico
+        self.band = band
+        self.interval = interval
+        self.scale = scale
+        self._clock = clock
+        self._base: Optional[int] = None
+        self._last: Optional[Tuple[float, int]] = None
+        self.written = 0
+        self.throughput = 0.0  # bytes/s (média móvel)
+
+    def _read(self) -> Optional[int]:
+        try:
+            return self.read_written()
+        except Exception as e:
+            logger.debug(f"Erro contadores de disco: {e}")
+            return None
+
+    def start(self) -> bool:
+        self._base = self._read()
+        self._last = (self._clock(), self._base or 0)
+        return self._base is not None
+
+    def sample(self) -> Optional[Dict]:
+        """Ler o contador e publicar percent + {stage, bytes, throughput, eta}"""
+        current = self._read()
+        if current is None or self._base is None:
+            return None
+        now = self._clock()
+        last_time, last_bytes = self._last
+        if now > last_time:
+            rate = max(current - last_bytes, 0) / (now - last_time)
+            self.throughput = rate if not self.throughput else 0.5 * rate + 0.5 * self.throughput
+        self._last = (now, current)
+        self.written = max(current - self._base, 0)
+        
+        low, high = self.band
+        eta = None
+        if self.expected_bytes:
+            fraction = min(self.written / self.expected_bytes, 1.0)
+            if self.throughput > 0:
+                eta = max(self.expected_bytes - self.written, 0) / self.throughput
+        else:
+            fraction = self.written / (self.written + self.scale)
+        info = {
+            "stage": "flush", "bytes": self.written, "throughput": self.throughput,
+            "eta": eta, "expected": self.expected_bytes,
+        }
+        self.report(low + int((high - low) * fraction), info)
+        return info
+
+    def run(self, fn):
+        """Executar fn() (bloqueante) amostrando os contadores em paralelo"""
+        if not self.start():
+            return fn()
+        done = threading.Event()
+        
+        def _sampler():
+            while not done.wait(self.interval):
+                self.sample()
+        
+        sampler = threading.Thread(target=_sampler, daemon=True)
+        sampler.start()
+        try:
+            return fn()
+        finally:
+            done.set()
+            sampler.join()
+            self.sample()
+
+
+class IOActivityMonitor:
+    """Atividade de escrita por disco a partir de amostras de write_bytes (modo de ejeção auto)"""
+
+    def __init__(self, read_counters, window: float = 0.1, recent: float = 10.0,
+                 fresh: float = 2.5, clock=time.monotonic, sleep=time.sleep):
+        self.read_counters = read_counters  # () → {disco: contadores com write_bytes}
+        self.window = window  # Janela de amostragem quando não há leitura recente
+        self.recent = recent  # Escritas há menos que isso contam como "recentes"
+        self.fresh = fresh  # Leitura anterior mais nova que isso serve de base
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._seen: Dict[str, Tuple[float, int]] = {}  # disco → (instante, write_bytes)
+        self._last_write: Dict[str, float] = {}  # disco → instante da última escrita vista
+
+    def observe(self):
+        """Registrar uma leitura dos contadores (também chamado a cada refresh)"""
+        try:
+            counters = self.read_counters()
+        except Exception as e:
+            logger.debug(f"Erro contadores de disco: {e}")
+            return
+        now = self._clock()
+        with self._lock:
+            for disk, c in counters.items():
+                written = getattr(c, "write_bytes", None)
+                if written is None:
+                    continue
+                previous = self._seen.get(disk)
+                if previous is not None and written != previous[1]:
+                    self._last_write[disk] = now
+                self._seen[disk] = (now, written)
+
+    def classify(self, disk: str, pending_bytes: Optional[int] = None) -> Tuple[bool, str]:
+        """(ocupado, motivo); sem contadores para o disco conta como ocupado"""
+        with self._lock:
+            previous = self._seen.get(disk)
+        if previous is None or self._clock() - previous[0] > self.fresh:
+            self.observe()
+            self._sleep(self.window)
+        self.observe()
+        now = self._clock()
+        with self._lock:
+            seen = disk in self._seen
+            last_write = self._last_write.get(disk)
+        if not seen:
+            return True, "contadores indisponíveis"
+        if last_write is not None and now - last_write <= self.recent:
+            age = now - last_write
+            return True, "gravando" if age <= self.window else f"gravado há {age:.0f}s"
+        if pending_bytes:
+            return True, f"{pending_bytes / 1024 ** 2:.1f} MB pendentes"
+        return False, "ocioso"
+
+
+class DeviceSnapshotCache:
+    """Última lista de dispositivos em disco, para desenhar a janela antes da enumeração"""
+
+    VERSION = 1
+    FIELDS = ("letter", "label", "filesystem", "total_size", "free_size", "source",
+              "is_mounted", "disk_index", "device", "mountpoint")
+
+    def __init__(self, path: str = "usb_ejector_devices.json", max_age: float = 7 * 24 * 3600,
+                 min_rewrite_interval: float = 60.0, clock=time.time):
+        self.path = path
+        self.max_age = max_age  # Entradas mais antigas que isso são ignoradas no load()
+        self.min_rewrite_interval = min_rewrite_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_payload: Optional[List[Dict]] = None
+        self._last_write = 0.0
+        self.writes = 0
+        self.skipped = 0
+
+    @classmethod
+    def _entry(cls, device: USBDevice) -> Dict:
+        entry = {field: getattr(device, field) for field in cls.FIELDS}
+        entry["key"] = device.key
+        return entry
+
+    def save(self, devices: List[USBDevice]) -> bool:
+        """Gravar atomicamente (arquivo temporário + os.replace); pula listas iguais à última"""
+        payload = [self._entry(d) for d in devices if not d.stale]
+        now = self._clock()
+        with self._lock:
+            if payload == self._last_payload and now - self._last_write < self.min_rewrite_interval:
+                self.skipped += 1
+                return False
+            data = {"version": self.VERSION, "saved_at": now,
+                    "devices": [dict(entry, seen=now) for entry in payload]}
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.debug(f"Erro gravar cache de dispositivos: {e}")
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return False
+            self._last_payload = payload
+            self._last_write = now
+            self.writes += 1
+            return True
+
+    def load(self) -> List[USBDevice]:
+        """Dispositivos do cache marcados como stale (vazio se ausente, inválido ou expirado)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cache de dispositivos ignorado: {e}")
+            return []
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return []
+        now = self._clock()
+        devices: List[USBDevice] = []
+        for entry in data.get("devices", []):
+            try:
+                if now - float(entry["seen"]) > self.max_age:
+                    continue
+                devices.append(USBDevice(**{field: entry[field] for field in self.FIELDS}, stale=True))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return devices
+
+    def clear(self):
+        with self._lock:
+            self._last_payload = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+# =========================
+# PLATFORM BACKENDS
+# =========================
+
+class DeviceError(OSError):
+    """Falha de operação em dispositivo com o código de erro do Windows (winerror)"""
+
+    def __init__(self, winerror: int, message: str = ""):
+        super().__init__(message or f"Erro {winerror}")
+        self.winerror = winerror
+
+
+class VolumeLockTimeout(DeviceError):
+    """FSCTL_LOCK_VOLUME não obteve o lock dentro do prazo"""
+
+    def __init__(self, winerror: int, attempts: int, holders: List[ProcessInfo]):
+        super().__init__(winerror, f"Lock não obtido após {attempts} tentativa(s)")
+        self.attempts = attempts
+        self.holders = holders
+
+
+class DeviceBackend:
+    """Primitivas de sistema usadas pelo USBEjector (trocáveis via USBEjector.use_backend)"""
+
+    name = "base"
+
+    # Volumes
+    def logical_drives(self) -> List[str]:
+        raise NotImplementedError
+
+    def drive_type(self, letter: str) -> int:
+        raise NotImplementedError
+
+    def volume_information(self, letter: str) -> tuple:
+        """(rótulo, serial, tamanho máx. de nome, flags, sistema de arquivos)"""
+        raise NotImplementedError
+
+    def disk_free_space(self, letter: str) -> Tuple[int, int]:
+        """(livre, total) em bytes"""
+        raise NotImplementedError
+
+    def disk_partitions(self) -> list:
+        """Objetos com device/mountpoint/fstype/opts (formato do psutil)"""
+        raise NotImplementedError
+
+    def volume_exists(self, letter: str) -> bool:
+        raise NotImplementedError
+
+    # WMI
+    wmi_stale_errors: Tuple[type, ...] = ()
+
+    def wmi_connect(self):
+        """Objeto com ExecQuery(wql) (SWbemServices)"""
+        raise NotImplementedError
+
+    def co_initialize(self):
+        pass
+
+    def co_uninitialize(self):
+        pass
+
+    # Processos
+    denied_errors: Tuple[type, ...] = ()
+
+    def process_iter(self):
+        """Processos com .info (LockScanner.ATTRS) e open_files()"""
+        raise NotImplementedError
+
+    def process(self, pid: int):
+        raise NotImplementedError
+
+    def pids(self) -> List[int]:
+        raise NotImplementedError
+
+    def kill_process(self, pid: int) -> bool:
+        raise NotImplementedError
+
+    # Handle de volume (erros com .winerror)
+    def open_volume(self, letter: str, access: int = GENERIC_READ | GENERIC_WRITE):
+        """access=0: só consultas (IOCTL_STORAGE_GET_DEVICE_NUMBER, extents), sem exigir admin"""
+        raise NotImplementedError
+
+    def flush(self, handle):
+        raise NotImplementedError
+
+    def ioctl(self, handle, code: int, in_buffer: Optional[bytes] = None, out_size: int = 0):
+        """Saída do IOCTL (bytes) quando out_size > 0"""
+        raise NotImplementedError
+
+    def close(self, handle):
+        raise NotImplementedError
+
+    # Contadores de I/O
+    def disk_io_counters(self) -> Dict[str, object]:
+        """Disco físico (PhysicalDriveN) → contadores com write_bytes (formato do psutil)"""
+        return {}
+
+    def pending_write_bytes(self, letter: str) -> Optional[int]:
+        """Bytes ainda no cache de escrita do volume (None quando o sistema não informa)"""
+        return None
+
+    # Discos físicos
+    def run_diskpart(self, script: str, timeout: float = 10) -> str:
+        raise NotImplementedError
+
+    def physical_drives(self) -> List[int]:
+        """Índices N de todos os \\\\.\\PhysicalDriveN presentes"""
+        raise NotImplementedError
+
+    def open_physical_drive(self, index: int):
+        """Handle do disco físico para IOCTLs de consulta (erros com .winerror)"""
+        raise NotImplementedError
+
+
+class WindowsBackend(DeviceBackend):
+    """pywin32 + psutil + WMI + diskpart"""
+
+    name = "windows"
+
+    def logical_drives(self) -> List[str]:
+        return [d[0].upper() for d in win32api.GetLogicalDriveStrings().split('\x00')[:-1] if d]
+
+    def drive_type(self, letter: str) -> int:
+        return win32file.GetDriveType(f"{letter}:\\")
+
+    def volume_information(self, letter: str) -> tuple:
+        return win32api.GetVolumeInformation(f"{letter}:\\")
+
+    def disk_free_space(self, letter: str) -> Tuple[int, int]:
+        return tuple(win32api.GetDiskFreeSpaceEx(f"{letter}:\\")[0:2])
+
+    def disk_partitions(self) -> list:
+        return psutil.disk_partitions(all=False)
+
+    def volume_exists(self, letter: str) -> bool:
+        return os.path.exists(f"{letter}:\\")
+
+    @property
+    def wmi_stale_errors(self) -> Tuple[type, ...]:
+        return (pythoncom.com_error,) if pythoncom.available else ()
+
+    def wmi_connect(self):
+        wmi = win32com_client.Dispatch("WbemScripting.SWbemLocator")
+        return wmi.ConnectServer(".", "root\\cimv2")
+
+    def co_initialize(self):
+        pythoncom.CoInitialize()
+
+    def co_uninitialize(self):
+        pythoncom.CoUninitialize()
+
+    @property
+    def denied_errors(self) -> Tuple[type, ...]:
+        return (psutil.AccessDenied,) if psutil.available else ()
+
+    def process_iter(self):
+        return psutil.process_iter(LockScanner.ATTRS, ad_value=None)
+
+    def process(self, pid: int):
+        proc = psutil.Process(pid)
+        proc.info = proc.as_dict(LockScanner.ATTRS, ad_value=None)
+        return proc
+
+    def pids(self) -> List[int]:
+        return psutil.pids()
+
+    def kill_process(self, pid: int) -> bool:
+        process = psutil.Process(pid)
+        process.terminate()
+        try:
+            process.wait(timeout=1)
+        except Exception:
+            process.kill()
+        return True
+
+    def open_volume(self, letter: str, access: int = GENERIC_READ | GENERIC_WRITE):
+        try:
+            return win32file.CreateFile(
+                f"\\\\.\\{letter}:", access,
+                FILE_SHARE_READ | FILE_SHARE_WRITE, None, OPEN_EXISTING, 0, None
+            )
+        except win32file.error as e:
+            raise DeviceError(e.winerror, e.strerror) from e
+
+    def flush(self, handle):
+        try:
+            win32file.FlushFileBuffers(handle)
+        except win32file.error as e:
+            raise DeviceError(e.winerror, e.strerror) from e
+
+    def ioctl(self, handle, code: int, in_buffer: Optional[bytes] = None, out_size: int = 0):
+        try:
+            return win32file.DeviceIoControl(handle, code, in_buffer, out_size or None)
+        except win32file.error as e:
+            raise DeviceError(e.winerror, e.strerror) from e
+
+    def close(self, handle):
+        win32file.CloseHandle(handle)
+
+    def disk_io_counters(self) -> Dict[str, object]:
+        return psutil.disk_io_counters(perdisk=True) or {}
+
+    def run_diskpart(self, script: str, timeout: float = 10) -> str:
+        result = subprocess.run(
+            ["diskpart"], input=script.encode('utf-8'),
+            capture_output=True, timeout=timeout
+        )
+        return result.stdout.decode('cp850', errors='ignore')
+
+    def physical_drives(self) -> List[int]:
+        # Uma chamada lista todos os nomes DOS; o buffer cresce só se não couber
+        size = 64 * 1024
+        while True:
+            target = ctypes.create_unicode_buffer(size)
+            length = ctypes.windll.kernel32.QueryDosDeviceW(None, target, size)
+            if length:
+                break
+            error = ctypes.GetLastError()
+            if error != ERROR_INSUFFICIENT_BUFFER or size >= 4 * 1024 * 1024:
+                raise DeviceError(error, "QueryDosDevice falhou")
+            size *= 2
+        indices = []
+        for name in target[:length].split("\x00"):
+            match = re.fullmatch(r"PhysicalDrive(\d+)", name)
+            if match:
+                indices.append(int(match.group(1)))
+        return sorted(indices)
+
+    def open_physical_drive(self, index: int):
+        path = f"\\\\.\\PhysicalDrive{index}"
+        try:
+            return win32file.CreateFile(
+                path, GENERIC_READ, FILE_SHARE_READ | FILE_SHARE_WRITE, None, OPEN_EXISTING, 0, None
+            )
+        except win32file.error as e:
+            if e.winerror != ERROR_ACCESS_DENIED:
+                raise DeviceError(e.winerror, e.strerror) from e
+        try:
+            # Sem admin: acesso 0 ainda responde IOCTL_STORAGE_QUERY_PROPERTY
+            return win32file.CreateFile(
+                path, 0, FILE_SHARE_READ | FILE_SHARE_WRITE, None, OPEN_EXISTING, 0, None
+            )
+        except win32file.error as e:
+            raise DeviceError(e.winerror, e.strerror) from e
+
+
 # =========================
 # SERVICES / SYSTEM
 # =========================
 
-class USBEjector:
-    """Serviço de ejeção USB"""
+class WMISessionManager:
+    """Sessões WMI por thread: CoInitialize + ConnectServer uma vez e reutilizar"""
+
+    def __init__(self, connect=None, co_initialize=None, co_uninitialize=None,
+                 stale_errors: Optional[Tuple[type, ...]] = None, max_age: float = 300.0):
+        windows = WindowsBackend()
+        self._connect = connect or windows.wmi_connect
+        self._co_initialize = co_initialize or windows.co_initialize
+        self._co_uninitialize = co_uninitialize or windows.co_uninitialize
+        # Tupla ou função que a devolve (resolvida na 1ª falha: evita importar pythoncom cedo)
+        self._stale_errors_source = stale_errors if stale_errors is not None else (
+            lambda: windows.wmi_stale_errors
+        )
+        self._stale_errors: Optional[Tuple[type, ...]] = None
+        self.max_age = max_age
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.reconnects = 0
+
+    @classmethod
+    def for_backend(cls, backend: DeviceBackend, **kwargs) -> "WMISessionManager":
+        return cls(backend.wmi_connect, backend.co_initialize, backend.co_uninitialize,
+                   lambda: backend.wmi_stale_errors, **kwargs)
+
+    @property
+    def stale_errors(self) -> Tuple[type, ...]:
+        if self._stale_errors is None:
+            source = self._stale_errors_source
+            self._stale_errors = tuple(source() if callable(source) else source)
+        return self._stale_errors
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, "svc"):
+            state.svc = None
+            state.connected_at = 0.0
+            state.com_initialized = False
+        return state
+
+    def _service(self, state):
+        if not state.com_initialized:
+            self._co_initialize()
+            state.com_initialized = True
+        expired = self.max_age and time.monotonic() - state.connected_at > self.max_age
+        if state.svc is None or expired:
+            state.svc = self._connect()
+            state.connected_at = time.monotonic()
+            with self._lock:
+                self.connections += 1
+        return state.svc
+
+    def run(self, fn):
+        """Executar fn(svc) na sessão desta thread, reconectando uma vez se estiver stale"""
+        state = self._state()
+        try:
+            return fn(self._service(state))
+        except self.stale_errors as e:
+            logger.debug(f"Sessão WMI inválida, reconectando: {e}")
+            state.svc = None
+            with self._lock:
+                self.reconnects += 1
+            return fn(self._service(state))
+
+    def release(self):
+        """Descartar a sessão e desfazer o CoInitialize da thread atual"""
+        state = self._state()
+        state.svc = None
+        if state.com_initialized:
+            state.com_initialized = False
+            try:
+                self._co_uninitialize()
+            except Exception as e:
+                logger.debug(f"Erro CoUninitialize: {e}")
 
-    @staticmethod
-    def is_admin() -> bool:
+    @contextmanager
+    def thread_scope(self):
+        """Liberar a sessão ao sair (threads de curta duração)"""
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"connections": self.connections, "reconnects": self.reconnects}
+
+
+class LockScanner:
+    """Varredura paralela de open_files() (o psutil mais lento no Windows)"""
+
+    # System Idle Process / System / processos protegidos: nunca expõem handles de volume
+    SKIP_PIDS = {0, 4}
+    SKIP_NAMES = {"system idle process", "system", "registry", "memory compression", "secure system"}
+
+    ATTRS = ['pid', 'name', 'exe', 'create_time']
+
+    def __init__(self, max_workers: int = 8, process_iter=None, process_factory=None,
+                 denied_errors=None, result_ttl: float = 1.0):
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        windows = WindowsBackend()
+        self._process_iter = process_iter or windows.process_iter
+        self._process_factory = process_factory or windows.process
+        # Tupla ou função que a devolve (resolvida na 1ª falha: evita importar psutil cedo)
+        self._denied_errors_source = denied_errors or (lambda: windows.denied_errors)
+        self._denied_errors: Optional[Tuple[type, ...]] = None
+        self._lock = threading.Lock()
+        self._denied: Set[Tuple[int, float]] = set()
+        self._files: Dict[Tuple[int, float], Tuple[float, List[str]]] = {}
+        self.last_stats: Dict[str, float] = {}
+        self.cpu_seconds = 0.0
+
+    @classmethod
+    def for_backend(cls, backend: DeviceBackend, **kwargs) -> "LockScanner":
+        return cls(process_iter=backend.process_iter, process_factory=backend.process,
+                   denied_errors=lambda: backend.denied_errors, **kwargs)
+
+    @property
+    def denied_errors(self) -> Tuple[type, ...]:
+        if self._denied_errors is None:
+            source = self._denied_errors_source
+            self._denied_errors = tuple(source() if callable(source) else source)
+        return self._denied_errors
+
+    def _iter_processes(self, pids: Optional[Set[int]]):
+        """Todos os processos, ou só os PIDs pedidos (sem varrer a tabela inteira)"""
+        if pids is None:
+            yield from self._process_iter()
+            return
+        for pid in pids:
+            try:
+                yield self._process_factory(pid)
+            except Exception:
+                continue  # Processo já encerrou
+
+    def _open_files(self, proc, key: Tuple[int, float]) -> List[str]:
+        """open_files() com cache curto; acesso negado fica marcado até o PID morrer"""
+        now = time.monotonic()
+        with self._lock:
+            if key in self._denied:
+                return []
+            cached = self._files.get(key)
+            if cached and now - cached[0] <= self.result_ttl:
+                return cached[1]
         try:
-            return ctypes.windll.shell32.IsUserAnAdmin()
+            paths = [f.path for f in proc.open_files()]
+        except self.denied_errors:
+            with self._lock:
+                self._denied.add(key)
+            return []
+        except Exception:
+            return []
+        with self._lock:
+            self._files[key] = (now, paths)
+        return paths
+
+    def scan(self, drive_letters, first_only: bool = False,
+             pids: Optional[Set[int]] = None) -> Dict[str, List[ProcessInfo]]:
+        """Processos com arquivos (ou executável) em cada letra; first_only para no 1º achado"""
+        prefixes = {l.upper(): f"{l.upper()}:\\" for l in drive_letters}
+        results: Dict[str, List[ProcessInfo]] = {l: [] for l in prefixes}
+        start = time.perf_counter()
+        stop = threading.Event()
+        alive: Set[Tuple[int, float]] = set()
+        candidates = []
+        
+        try:
+            for proc in self._iter_processes(pids):
+                info = proc.info
+                pid = info.get('pid')
+                if pid in self.SKIP_PIDS or (info.get('name') or "").lower() in self.SKIP_NAMES:
+                    continue
+                key = (pid, info.get('create_time') or 0.0)
+                alive.add(key)
+                candidates.append((proc, key))
         except Exception as e:
-            logger.debug(f"Erro admin: {e}")
-            return False
+            logger.debug(f"Erro processos: {e}")
+        
+        cpu = [0.0]
+        
+        def inspect(proc, key):
+            if stop.is_set():
+                return None
+            cpu_start = time.thread_time()
+            try:
+                return _inspect(proc, key)
+            finally:
+                with self._lock:
+                    cpu[0] += time.thread_time() - cpu_start
+        
+        def _inspect(proc, key):
+            info = proc.info
+            exe = info.get('exe') or ""
+            paths = self._open_files(proc, key)
+            found = []
+            for letter, prefix in prefixes.items():
+                files: List[str] = []
+                for path in paths:
+                    if path.upper().startswith(prefix):
+                        files.append(path)
+                        break
+                if exe and exe.upper().startswith(prefix):
+                    files.append(exe)
+                if files:
+                    found.append((letter, ProcessInfo(key[0], info.get('name') or "Desconhecido", exe, files)))
+            return found
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="lock-scan")
+        try:
+            futures = [pool.submit(inspect, proc, key) for proc, key in candidates]
+            for future in as_completed(futures):
+                try:
+                    found = future.result()
+                except Exception:
+                    continue
+                for letter, proc_info in found or []:
+                    results[letter].append(proc_info)
+                if first_only and found:
+                    stop.set()
+                    for f in futures:
+                        f.cancel()
+                    break
+        finally:
+            pool.shutdown(wait=False)
+        
+        with self._lock:
+            if pids is None:
+                # Esquecer PIDs que morreram (create_time muda se o PID for reutilizado)
+                self._denied &= alive
+                self._files = {k: v for k, v in self._files.items() if k in alive}
+            self.cpu_seconds += cpu[0]
+        
+        self.last_stats = {
+            "processes": len(alive), "scanned": len(candidates),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            "cpu_ms": round(cpu[0] * 1000, 2), "first_only": first_only,
+        }
+        return results
+
+
+class OpenHandleIndex:
+    """Índice em segundo plano letra → {pid → arquivos}, atualizado por diferença de PIDs"""
+
+    def __init__(self, scanner: LockScanner, list_pids=None, fast_interval: float = 2.0,
+                 slow_interval: float = 15.0, batch_size: int = 150, max_staleness: float = 30.0):
+        self.scanner = scanner
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.batch_size = batch_size
+        self.max_staleness = max_staleness
+        self._list_pids = list_pids or WindowsBackend().pids
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._letters: Set[str] = set()
+        self._entries: Dict[str, Dict[int, List[str]]] = {}
+        self._scanned_at: Dict[int, float] = {}
+        self._started_at = 0.0
+        self.ticks = 0
+        self.cpu_seconds = 0.0
+        self.last_tick_ms = 0.0
+
+    @property
+    def interval(self) -> float:
+        """Rápido enquanto houver unidade removível montada"""
+        return self.fast_interval if self._letters else self.slow_interval
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._loop, name="lock-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def set_watched_letters(self, letters: Set[str]):
+        """Letras removíveis atualmente montadas (novas letras forçam varredura completa)"""
+        letters = {l.upper() for l in letters}
+        with self._lock:
+            if letters == self._letters:
+                return
+            added = letters - self._letters
+            self._letters = letters
+            for letter in list(self._entries):
+                if letter not in letters:
+                    del self._entries[letter]
+            if added:
+                self._scanned_at.clear()
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.debug(f"Erro índice de bloqueios: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def tick(self):
+        """Uma rodada: PIDs novos + lote dos mais antigos; remove PIDs encerrados"""
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        scanner_cpu = self.scanner.cpu_seconds
+        
+        with self._lock:
+            letters = set(self._letters)
+        current = set(self._list_pids())
+        
+        with self._lock:
+            for pid in set(self._scanned_at) - current:
+                del self._scanned_at[pid]
+                for entries in self._entries.values():
+                    entries.pop(pid, None)
+            new = current - set(self._scanned_at)
+            oldest = sorted(set(self._scanned_at), key=self._scanned_at.get)
+        
+        batch = new | set(oldest[:self.batch_size])
+        if letters and batch:
+            results = self.scanner.scan(letters, pids=batch)
+            now = time.monotonic()
+            with self._lock:
+                for pid in batch:
+                    if pid in current:
+                        self._scanned_at[pid] = now
+                for letter in letters:
+                    entries = self._entries.setdefault(letter, {})
+                    for pid in batch:
+                        entries.pop(pid, None)
+                    for proc in results.get(letter, []):
+                        entries[proc.pid] = proc.files
+        
+        self.ticks += 1
+        self.cpu_seconds += (time.thread_time() - cpu_start) + (self.scanner.cpu_seconds - scanner_cpu)
+        self.last_tick_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            if not self._scanned_at or self._thread is None:
+                return False
+            return time.monotonic() - min(self._scanned_at.values()) <= self.max_staleness
+
+    def lookup(self, letter: str) -> Optional[Dict[int, List[str]]]:
+        """PIDs indexados para a letra; None se o índice não puder responder"""
+        letter = letter.upper()
+        if not self.is_fresh():
+            return None
+        with self._lock:
+            if letter not in self._letters:
+                return None
+            return dict(self._entries.get(letter, {}))
+
+    def stats(self) -> Dict[str, float]:
+        wall = max(time.monotonic() - self._started_at, 1e-6) if self._started_at else 0.0
+        with self._lock:
+            entries = sum(len(e) for e in self._entries.values())
+            tracked = len(self._scanned_at)
+        return {
+            "ticks": self.ticks, "interval": self.interval, "pids_tracked": tracked,
+            "entries": entries, "last_tick_ms": self.last_tick_ms,
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "cpu_percent": round(100 * self.cpu_seconds / wall, 2) if wall else 0.0,
+        }
+
+
+class USBEjector:
+    """Serviço de ejeção USB"""
+
+    backend: DeviceBackend = WindowsBackend()
+    wmi = WMISessionManager.for_backend(backend)
+    lock_scanner = LockScanner.for_backend(backend)
+    lock_index: Optional[OpenHandleIndex] = None
+    eject_metrics = EjectMetrics()
+    io_activity = IOActivityMonitor(backend.disk_io_counters)
+    device_cache = DeviceSnapshotCache()
+
+    # Detecção concorrente: backends que passam do prazo entram na próxima detecção
+    DETECTION_BACKENDS = ("wmi", "psutil", "fallback")
+    detection_deadline = 2.0
+    last_detection_report: Optional[DetectionReport] = None
+    _detection_pool: Optional[ThreadPoolExecutor] = None
+    _pending_detection: Dict[str, Future] = {}
+    _detection_lock = threading.Lock()
+
+    # Lock do volume no modo seguro: novas tentativas com backoff até o prazo
+    lock_deadline = 5.0
+    lock_backoff = (0.05, 0.5)  # Espera inicial e máxima entre tentativas
+    identify_lock_holder = True  # Procurar o processo bloqueador enquanto espera
+
+    # Snapshot de informações de unidade compartilhado pelos validadores
+    drive_snapshot_ttl = 2.0
+    _drive_snapshot: Optional[DriveInfoSnapshot] = None
+    _snapshot_lock = threading.Lock()
+
+    _is_admin: Optional[bool] = None  # Elevação não muda durante o processo
+
+    @classmethod
+    def is_admin(cls) -> bool:
+        if cls._is_admin is None:
+            try:
+                cls._is_admin = bool(ctypes.windll.shell32.IsUserAnAdmin())
+            except Exception as e:
+                logger.debug(f"Erro admin: {e}")
+                cls._is_admin = False
+        return cls._is_admin
 
     @staticmethod
     def run_as_admin():
@@ -233,65 +1664,71 @@ class USBEjector:
             logger.error(f"Erro run admin: {e}")
 
     @staticmethod
-    def is_valid_physical_drive(letter: str) -> bool:
-        drive_path = f"{letter}:\\"
+    def use_backend(backend: DeviceBackend):
+        """Trocar as primitivas de sistema (ex.: SimulatedBackend em benchmarks)"""
+        USBEjector.disable_lock_index()
+        USBEjector.shutdown_detection()
+        USBEjector.wmi.release()
+        USBEjector.backend = backend
+        USBEjector.wmi = WMISessionManager.for_backend(backend)
+        USBEjector.lock_scanner = LockScanner.for_backend(backend)
+        USBEjector.io_activity = IOActivityMonitor(backend.disk_io_counters)
+        USBEjector.invalidate_drive_snapshot()
+
+    @staticmethod
+    def drive_snapshot() -> DriveInfoSnapshot:
+        """Snapshot atual (recriado quando o TTL expira)"""
+        with USBEjector._snapshot_lock:
+            snapshot = USBEjector._drive_snapshot
+            if snapshot is None or snapshot.expired:
+                snapshot = DriveInfoSnapshot(ttl=USBEjector.drive_snapshot_ttl, backend=USBEjector.backend)
+                USBEjector._drive_snapshot = snapshot
+            return snapshot
+
+    @staticmethod
+    def invalidate_drive_snapshot():
+        """Descartar o snapshot (chegada/remoção de dispositivo, ejeção, montagem)"""
+        with USBEjector._snapshot_lock:
+            USBEjector._drive_snapshot = None
+
+    @staticmethod
+    def is_valid_physical_drive(letter: str, snapshot: Optional[DriveInfoSnapshot] = None) -> bool:
+        snapshot = snapshot or USBEjector.drive_snapshot()
         try:
-            drive_type = win32file.GetDriveType(drive_path)
+            drive_type = snapshot.drive_type(letter)
             if drive_type in (DRIVE_REMOTE, DRIVE_CDROM, DRIVE_RAMDISK, DRIVE_UNKNOWN, DRIVE_NO_ROOT_DIR):
                 return False
-            try:
-                volume_info = win32api.GetVolumeInformation(drive_path)
-                if not volume_info:
-                    return False
-            except Exception:
+            if not snapshot.volume_info(letter):
                 return False
-            try:
-                free_bytes, total_bytes = win32api.GetDiskFreeSpaceEx(drive_path)[0:2]
-                if total_bytes == 0:
-                    return False
-            except Exception:
+            space = snapshot.free_space(letter)
+            if not space or space[1] == 0:
                 return False
-            try:
-                for part in psutil.disk_partitions(all=False):
-                    if part.device.upper().startswith(letter):
-                        opts_lower = part.opts.lower()
-                        if any(x in opts_lower for x in ['network', 'remote', 'cdrom']):
+            for part in snapshot.partitions():
+                if part.device.upper().startswith(letter):
+                    opts_lower = part.opts.lower()
+                    if any(x in opts_lower for x in ['network', 'remote', 'cdrom']):
+                        return False
+                    if 'rw' in opts_lower and 'removable' not in opts_lower and 'fixed' not in opts_lower:
+                        fs = part.fstype.lower()
+                        if fs in ['fuse', 'winfsp', 'dokan', 'webdav']:
                             return False
-                        if 'rw' in opts_lower and 'removable' not in opts_lower and 'fixed' not in opts_lower:
-                            fs = part.fstype.lower()
-                            if fs in ['fuse', 'winfsp', 'dokan', 'webdav']:
-                                return False
-            except Exception:
-                pass
             return True
         except Exception:
             return False
 
+    @staticmethod
+    def get_wmi_topology() -> WMITopology:
+        return USBEjector.wmi.run(WMITopology.query)
+
     @staticmethod
     def get_usb_letters_wmi() -> Set[str]:
         usb_letters: Set[str] = set()
         try:
-            pythoncom.CoInitialize()
-            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-            svc = wmi.ConnectServer(".", "root\\cimv2")
-            query = "SELECT * FROM Win32_DiskDrive WHERE InterfaceType='USB' AND MediaType='Removable Media'"
-            
-            for disk in svc.ExecQuery(query):
-                disk_id = disk.DeviceID.replace("\\", "\\\\")
-                query_parts = f"ASSOCIATORS OF {{Win32_DiskDrive.DeviceID='{disk_id}'}} WHERE AssocClass=Win32_DiskDriveToDiskPartition"
-                
-                for partition in svc.ExecQuery(query_parts):
-                    part_id = partition.DeviceID.replace("\\", "\\\\")
-                    query_logical = f"ASSOCIATORS OF {{Win32_DiskPartition.DeviceID='{part_id}'}} WHERE AssocClass=Win32_LogicalDiskToPartition"
-                    
-                    for logical in svc.ExecQuery(query_logical):
-                        letter = logical.DeviceID
-                        if letter and len(letter) >= 1:
-                            letter_only = letter[0].upper()
-                            if USBEjector.is_valid_physical_drive(letter_only):
-                                usb_letters.add(letter_only)
-            
-            pythoncom.CoUninitialize()
+            topology = USBEjector.get_wmi_topology()
+            for disk in topology.usb_disks(removable_only=True):
+                for letter in topology.letters_for(disk):
+                    if USBEjector.is_valid_physical_drive(letter):
+                        usb_letters.add(letter)
         except Exception as e:
             logger.debug(f"WMI error: {e}")
         
@@ -301,7 +1738,7 @@ class USBEjector:
     def get_usb_letters_psutil() -> Set[str]:
         usb_letters: Set[str] = set()
         try:
-            for partition in psutil.disk_partitions(all=False):
+            for partition in USBEjector.drive_snapshot().partitions():
                 drive_letter = partition.device[0].upper() if partition.device else None
                 if not drive_letter or drive_letter == 'C':
                     continue
@@ -317,237 +1754,273 @@ class USBEjector:
     def get_usb_letters_fallback() -> Set[str]:
         usb_letters: Set[str] = set()
         try:
-            drives = win32api.GetLogicalDriveStrings()
-            for drive in drives.split('\x00')[:-1]:
-                if len(drive) < 2:
-                    continue
-                letter = drive[0].upper()
+            snapshot = USBEjector.drive_snapshot()
+            for letter in snapshot.logical_drives():
                 if letter == 'C':
                     continue
-                try:
-                    if win32file.GetDriveType(f"{letter}:\\") == DRIVE_REMOVABLE:
-                        if USBEjector.is_valid_physical_drive(letter):
-                            usb_letters.add(letter)
-                except Exception:
-                    pass
+                if snapshot.drive_type(letter) == DRIVE_REMOVABLE:
+                    if USBEjector.is_valid_physical_drive(letter, snapshot):
+                        usb_letters.add(letter)
         except Exception as e:
             logger.debug(f"Fallback error: {e}")
         
         return usb_letters
 
     @staticmethod
-    def get_removable_drives() -> List[USBDevice]:
-        all_usb_letters: Set[str] = set()
-        
+    def _run_detection_backend(name: str) -> Tuple[Set[str], float]:
+        start = time.perf_counter()
         try:
-            all_usb_letters.update(USBEjector.get_usb_letters_wmi())
-        except Exception:
-            pass
-        try:
-            all_usb_letters.update(USBEjector.get_usb_letters_psutil())
-        except Exception:
-            pass
+            letters = getattr(USBEjector, f"get_usb_letters_{name}")()
+        except Exception as e:
+            logger.debug(f"Backend {name} falhou: {e}")
+            letters = set()
+        return letters, time.perf_counter() - start
+
+    @staticmethod
+    def _get_detection_pool() -> ThreadPoolExecutor:
+        with USBEjector._detection_lock:
+            if USBEjector._detection_pool is None:
+                USBEjector._detection_pool = ThreadPoolExecutor(
+                    max_workers=len(USBEjector.DETECTION_BACKENDS),
+                    thread_name_prefix="usb-detect"
+                )
+            return USBEjector._detection_pool
+
+    @staticmethod
+    def shutdown_detection():
+        with USBEjector._detection_lock:
+            pool, USBEjector._detection_pool = USBEjector._detection_pool, None
+            USBEjector._pending_detection.clear()
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    @staticmethod
+    def _detect_usb_letters(deadline: float, report: DetectionReport) -> Set[str]:
+        """Rodar os backends em paralelo e juntar as letras conforme chegam"""
+        all_usb_letters: Set[str] = set()
+        pool = USBEjector._get_detection_pool()
+        futures: Dict[Future, str] = {}
+        
+        with USBEjector._detection_lock:
+            for name in USBEjector.DETECTION_BACKENDS:
+                pending = USBEjector._pending_detection.pop(name, None)
+                if pending is not None and not pending.done():
+                    # Ainda rodando desde a detecção anterior: aguardar o mesmo
+                    futures[pending] = name
+                    continue
+                if pending is not None:
+                    letters, elapsed = pending.result()
+                    all_usb_letters.update(letters)
+                    report.add(name, letters, elapsed)
+                    report.carried_over.append(name)
+                futures[pool.submit(USBEjector._run_detection_backend, name)] = name
+        
+        merged: Set[Future] = set()
         try:
-            all_usb_letters.update(USBEjector.get_usb_letters_fallback())
-        except Exception:
-            pass
+            for future in as_completed(futures, timeout=max(deadline, 0)):
+                letters, elapsed = future.result()
+                all_usb_letters.update(letters)
+                report.add(futures[future], letters, elapsed)
+                merged.add(future)
+        except FutureTimeout:
+            with USBEjector._detection_lock:
+                for future, name in futures.items():
+                    if future in merged:
+                        continue
+                    if future.done():
+                        letters, elapsed = future.result()
+                        all_usb_letters.update(letters)
+                        report.add(name, letters, elapsed)
+                    else:
+                        report.late.append(name)
+                        USBEjector._pending_detection[name] = future
+        
+        return all_usb_letters
+
+    @staticmethod
+    def get_removable_drives(deadline: Optional[float] = None) -> List[USBDevice]:
+        report = DetectionReport()
+        start = time.perf_counter()
+        if deadline is None:
+            deadline = USBEjector.detection_deadline
+        
+        snapshot = USBEjector.drive_snapshot()
+        all_usb_letters = USBEjector._detect_usb_letters(deadline, report)
         
         devices: Dict[str, USBDevice] = {}
         for letter in all_usb_letters:
-            if not USBEjector.is_valid_physical_drive(letter):
+            if not USBEjector.is_valid_physical_drive(letter, snapshot):
                 continue
-            device = USBEjector._build_device(letter, source="USB")
+            device = USBEjector._build_device(letter, source="USB", snapshot=snapshot)
             if device and device.total_size > 0:
                 devices[letter] = device
         
+        report.syscalls = snapshot.syscalls
+        report.total = time.perf_counter() - start
+        USBEjector.last_detection_report = report
+        logger.info(f"⏱ {report.summary()}")
         return list(devices.values())
 
+    @staticmethod
+    def get_devices_for_letters(letters: Set[str]) -> List[USBDevice]:
+        """Detecção direcionada às letras de um evento do monitor"""
+        snapshot = USBEjector.drive_snapshot()
+        removable_opts = {
+            p.device[0].upper() for p in snapshot.partitions()
+            if p.device and 'removable' in p.opts.lower()
+        }
+        wmi_letters: Optional[Set[str]] = None
+        devices: List[USBDevice] = []
+        
+        for letter in sorted(letters):
+            if letter == 'C' or not USBEjector.is_valid_physical_drive(letter, snapshot):
+                continue
+            is_usb = snapshot.drive_type(letter) == DRIVE_REMOVABLE or letter in removable_opts
+            if not is_usb:
+                # HDs USB aparecem como DRIVE_FIXED: confirmar pelo WMI
+                if wmi_letters is None:
+                    wmi_letters = USBEjector.get_usb_letters_wmi()
+                is_usb = letter in wmi_letters
+            if is_usb:
+                device = USBEjector._build_device(letter, source="USB", snapshot=snapshot)
+                if device and device.total_size > 0:
+                    devices.append(device)
+        
+        return devices
+
     @staticmethod
     def get_unmounted_usb_drives() -> List[USBDevice]:
         """Detecção USB não montados"""
         unmounted = []
-        mounted_indices = set()
         
         try:
-            pythoncom.CoInitialize()
-            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-            svc = wmi.ConnectServer(".", "root\\cimv2")
-            
-            query = "SELECT * FROM Win32_DiskDrive WHERE InterfaceType='USB'"
-            for disk in svc.ExecQuery(query):
-                try:
-                    disk_id = disk.DeviceID.replace("\\", "\\\\")
-                    disk_index = int(disk.Index) if disk.Index else -1
-                    
-                    query_parts = f"ASSOCIATORS OF {{Win32_DiskDrive.DeviceID='{disk_id}'}} WHERE AssocClass=Win32_DiskDriveToDiskPartition"
-                    partitions = list(svc.ExecQuery(query_parts))
-                    
-                    if partitions:
-                        for partition in partitions:
-                            part_id = partition.DeviceID.replace("\\", "\\\\")
-                            query_logical = f"ASSOCIATORS OF {{Win32_DiskPartition.DeviceID='{part_id}'}} WHERE AssocClass=Win32_LogicalDiskToPartition"
-                            logical_disks = list(svc.ExecQuery(query_logical))
-                            if logical_disks:
-                                mounted_indices.add(disk_index)
-                                break
-                except Exception as e:
-                    logger.debug(f"Erro processar disco: {e}")
-                    continue
+            topology = USBEjector.get_wmi_topology()
             
+            usb_disks = topology.usb_disks()
+            mounted_indices = {d.index for d in usb_disks if topology.is_mounted(d)}
             logger.info(f"🔍 Discos montados (WMI): {mounted_indices}")
             
-            for disk in svc.ExecQuery(query):
-                try:
-                    disk_index = int(disk.Index) if disk.Index else -1
-                    
-                    if disk_index not in mounted_indices:
-                        size_bytes = int(disk.Size) if disk.Size else 0
-                        model = disk.Model if disk.Model else "USB Drive"
-                        
-                        logger.info(f"🔴 USB NÃO MONTADO (WMI): {model} ({size_bytes / (1024**3):.2f} GB)")
-                        
-                        device = USBDevice(
-                            letter="?", label=model, filesystem="Não montado",
-                            total_size=size_bytes, free_size=0, source="USB",
-                            is_mounted=False, disk_index=disk_index
-                        )
-                        unmounted.append(device)
-                except Exception as e:
-                    logger.debug(f"Erro processar não montado: {e}")
+            for disk in usb_disks:
+                if disk.index in mounted_indices:
                     continue
-            
-            pythoncom.CoUninitialize()
+                logger.info(f"🔴 USB NÃO MONTADO (WMI): {disk.model} ({disk.size / (1024**3):.2f} GB)")
+                
+                device = USBDevice(
+                    letter="?", label=disk.model, filesystem="Não montado",
+                    total_size=disk.size, free_size=0, source="USB",
+                    is_mounted=False, disk_index=disk.index
+                )
+                unmounted.append(device)
         
         except Exception as e:
             logger.warning(f"⚠️ WMI falhou: {e}")
         
         if not unmounted:
-            logger.info("🔧 Tentando diskpart...")
-            unmounted.extend(USBEjector._detect_via_diskpart())
-        
-        if not unmounted:
-            logger.info("🔧 Tentando ctypes...")
-            unmounted.extend(USBEjector._detect_via_ctypes())
+            logger.info("🔧 Tentando IOCTLs de disco...")
+            unmounted.extend(USBEjector._detect_via_ioctl())
         
         logger.info(f"📊 Total não montados: {len(unmounted)}")
         return unmounted
 
     @staticmethod
-    def _detect_via_diskpart() -> List[USBDevice]:
-        """Detectar via diskpart"""
+    def _detect_via_ioctl() -> List[USBDevice]:
+        """USB sem volume com letra, pela sondagem de discos físicos"""
         unmounted = []
         try:
-            script = "list disk\n"
-            result = subprocess.run(
-                ["diskpart"], input=script.encode(), 
-                capture_output=True, timeout=10, text=False
-            )
-            
-            output = result.stdout.decode('cp850', errors='ignore')
-            logger.info(f"📋 Diskpart:\n{output}")
-            
-            lines = output.split('\n')
-            for line in lines:
-                match = re.match(r'\s+Disk\s+(\d+)\s+(\w+)\s+(\d+\s+\w+)', line.strip())
-                if match:
-                    disk_num = int(match.group(1))
-                    status = match.group(2)
-                    size_str = match.group(3)
-                    
-                    if status.lower() not in ['online']:
-                        if USBEjector._is_usb_disk(disk_num):
-                            size_bytes = USBEjector._parse_size(size_str)
-                            device = USBDevice(
-                                letter="?", label=f"Disk {disk_num}", filesystem="Não montado",
-                                total_size=size_bytes, free_size=0, source="USB",
-                                is_mounted=False, disk_index=disk_num
-                            )
-                            unmounted.append(device)
-                            logger.info(f"✅ USB via diskpart: Disk {disk_num}")
-        
+            disks = USBEjector.probe_physical_disks()
+            if any(disk.letters is None for disk in disks):
+                # Disco montado mas não mapeado viraria um card "Não montado" fantasma
+                logger.warning("⚠️ Volumes sem mapeamento para disco: mantendo a resposta do WMI")
+                return []
+            for disk in disks:
+                if not disk.is_usb or disk.letters:
+                    continue
+                unmounted.append(USBDevice(
+                    letter="?", label=disk.model or f"Disk {disk.index}", filesystem="Não montado",
+                    total_size=disk.size, free_size=0, source="USB",
+                    is_mounted=False, disk_index=disk.index
+                ))
+                logger.info(f"✅ USB via IOCTL: Disk {disk.index} ({len(disk.partitions)} partição(ões))")
         except Exception as e:
-            logger.error(f"❌ Erro diskpart: {e}")
-        
+            logger.error(f"❌ Erro IOCTL de disco: {e}")
         return unmounted
 
-    @staticmethod
-    def _detect_via_ctypes() -> List[USBDevice]:
-        """Detectar via ctypes"""
-        unmounted = []
-        try:
-            for i in range(10):
-                drive_name = f"PhysicalDrive{i}"
-                target = (ctypes.c_wchar * 32768)()
-                target_len = ctypes.windll.kernel32.QueryDosDeviceW(drive_name, target, len(target))
-                
-                if target_len:
-                    if USBEjector._is_usb_disk(i):
-                        if not USBEjector._is_disk_mounted(i):
-                            device = USBDevice(
-                                letter="?", label=f"PhysicalDrive{i}", filesystem="Não montado",
-                                total_size=0, free_size=0, source="USB",
-                                is_mounted=False, disk_index=i
-                            )
-                            unmounted.append(device)
-                            logger.info(f"✅ USB via ctypes: {drive_name}")
-        
-        except Exception as e:
-            logger.error(f"❌ Erro ctypes: {e}")
-        
-        return unmounted
+    # Buffers de saída dos IOCTLs de disco (dobram em ERROR_INSUFFICIENT_BUFFER/MORE_DATA)
+    DESCRIPTOR_BUFFER = 1024
+    LAYOUT_BUFFER = DRIVE_LAYOUT_INFORMATION_EX.PartitionEntry.offset + 16 * ctypes.sizeof(PARTITION_INFORMATION_EX)
+    EXTENTS_BUFFER = VOLUME_DISK_EXTENTS.Extents.offset + 4 * ctypes.sizeof(DISK_EXTENT)
 
     @staticmethod
-    def _is_usb_disk(disk_index: int) -> bool:
-        """Verificar se é USB"""
-        try:
-            pythoncom.CoInitialize()
-            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-            svc = wmi.ConnectServer(".", "root\\cimv2")
-            query = f"SELECT * FROM Win32_DiskDrive WHERE Index={disk_index} AND InterfaceType='USB'"
-            result = list(svc.ExecQuery(query))
-            pythoncom.CoUninitialize()
-            return len(result) > 0
-        except Exception:
-            return False
+    def _ioctl_growing(handle, code: int, out_size: int, in_buffer: Optional[bytes] = None,
+                       limit: int = 1024 * 1024) -> bytes:
+        while True:
+            try:
+                return USBEjector.backend.ioctl(handle, code, in_buffer, out_size)
+            except DeviceError as e:
+                if e.winerror not in (ERROR_INSUFFICIENT_BUFFER, ERROR_MORE_DATA) or out_size >= limit:
+                    raise
+                out_size *= 2
 
     @staticmethod
-    def _is_disk_mounted(disk_index: int) -> bool:
-        """Verificar se tem letra"""
-        try:
-            pythoncom.CoInitialize()
-            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-            svc = wmi.ConnectServer(".", "root\\cimv2")
-            disk_id = f"\\\\.\\PHYSICALDRIVE{disk_index}"
-            disk_id_escaped = disk_id.replace("\\", "\\\\")
-            query_parts = f"ASSOCIATORS OF {{Win32_DiskDrive.DeviceID='{disk_id_escaped}'}} WHERE AssocClass=Win32_DiskDriveToDiskPartition"
-            
-            for partition in svc.ExecQuery(query_parts):
-                part_id = partition.DeviceID.replace("\\", "\\\\")
-                query_logical = f"ASSOCIATORS OF {{Win32_DiskPartition.DeviceID='{part_id}'}} WHERE AssocClass=Win32_LogicalDiskToPartition"
-                logical = list(svc.ExecQuery(query_logical))
-                if logical:
-                    pythoncom.CoUninitialize()
-                    return True
-            
-            pythoncom.CoUninitialize()
-            return False
-        except Exception:
-            return False
+    def probe_physical_disks() -> List[PhysicalDisk]:
+        """Todos os discos físicos numa passada: cada um aberto uma vez (barramento, tamanho, partições)"""
+        backend = USBEjector.backend
+        letters = USBEjector._volume_disk_letters()
+        disks = []
+        for index in backend.physical_drives():
+            try:
+                handle = backend.open_physical_drive(index)
+            except DeviceError as e:
+                logger.debug(f"PhysicalDrive{index} inacessível: {e}")
+                continue
+            try:
+                disk = PhysicalDisk(index, *decode_storage_device_descriptor(USBEjector._ioctl_growing(
+                    handle, IOCTL_STORAGE_QUERY_PROPERTY, USBEjector.DESCRIPTOR_BUFFER,
+                    STORAGE_DEVICE_PROPERTY_QUERY
+                )))
+                if disk.is_usb:
+                    # Tamanho e layout exigem leitura; sem admin o disco segue só com o barramento
+                    try:
+                        disk.size = decode_disk_length(backend.ioctl(
+                            handle, IOCTL_DISK_GET_LENGTH_INFO, out_size=ctypes.sizeof(ctypes.c_int64)))
+                        disk.partition_style, disk.partitions = decode_drive_layout(USBEjector._ioctl_growing(
+                            handle, IOCTL_DISK_GET_DRIVE_LAYOUT_EX, USBEjector.LAYOUT_BUFFER))
+                    except (DeviceError, ValueError) as e:
+                        logger.debug(f"PhysicalDrive{index}: tamanho/layout indisponível: {e}")
+            except (DeviceError, ValueError) as e:
+                logger.debug(f"PhysicalDrive{index}: descritor indisponível: {e}")
+                continue
+            finally:
+                backend.close(handle)
+            disk.letters = letters.get(index, []) if letters is not None else None
+            disks.append(disk)
+        return disks
 
     @staticmethod
-    def _parse_size(size_str: str) -> int:
-        """Parser tamanho diskpart"""
-        try:
-            parts = size_str.strip().split()
-            if len(parts) != 2:
-                return 0
-            value = float(parts[0])
-            unit = parts[1].upper()
-            
-            multipliers = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3, 'TB': 1024**4}
-            return int(value * multipliers.get(unit, 0))
-        except Exception:
-            return 0
+    def _volume_disk_letters() -> Optional[Dict[int, List[str]]]:
+        """Disco físico → letras dos volumes com extents nele; None se algum volume não puder ser mapeado"""
+        backend = USBEjector.backend
+        letters: Dict[int, List[str]] = {}
+        for letter in backend.logical_drives():
+            if backend.drive_type(letter) not in (DRIVE_REMOVABLE, DRIVE_FIXED):
+                continue
+            try:
+                # Acesso 0: basta para os extents e não segura o volume em leitura/escrita
+                handle = backend.open_volume(letter, access=0)
+            except DeviceError as e:
+                logger.debug(f"{letter}: volume inacessível para mapeamento: {e}")
+                return None
+            try:
+                extents = decode_volume_disk_extents(USBEjector._ioctl_growing(
+                    handle, IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS, USBEjector.EXTENTS_BUFFER))
+            except (DeviceError, ValueError) as e:
+                logger.debug(f"{letter}: sem extents: {e}")
+                return None
+            finally:
+                backend.close(handle)
+            for disk_number in {extent[0] for extent in extents}:
+                letters.setdefault(disk_number, []).append(letter)
+        return letters
 
     @staticmethod
     def mount_drive(device: USBDevice) -> Tuple[bool, str]:
@@ -563,18 +2036,12 @@ rescan
 """
             
             # Executar diskpart
-            result = subprocess.run(
-                ["diskpart"], 
-                input=script.encode('utf-8'), 
-                capture_output=True, 
-                timeout=15
-            )
-            
-            output = result.stdout.decode('cp850', errors='ignore')
+            output = USBEjector.backend.run_diskpart(script, timeout=15)
             logger.info(f"📋 Diskpart output:\n{output}")
             
             # Aguardar Windows atribuir letra
             time.sleep(0.1)
+            USBEjector.invalidate_drive_snapshot()
             
             # Verificar se apareceu letra
             new_letter = USBEjector._get_disk_letter(device.disk_index)
@@ -598,26 +2065,13 @@ rescan
     def _get_disk_letter(disk_index: int) -> Optional[str]:
         """Obter letra de disco físico"""
         try:
-            pythoncom.CoInitialize()
-            wmi = win32com.client.Dispatch("WbemScripting.SWbemLocator")
-            svc = wmi.ConnectServer(".", "root\\cimv2")
-            
-            disk_id = f"\\\\.\\PHYSICALDRIVE{disk_index}"
-            disk_id_escaped = disk_id.replace("\\", "\\\\")
-            query_parts = f"ASSOCIATORS OF {{Win32_DiskDrive.DeviceID='{disk_id_escaped}'}} WHERE AssocClass=Win32_DiskDriveToDiskPartition"
-            
-            for partition in svc.ExecQuery(query_parts):
-                part_id = partition.DeviceID.replace("\\", "\\\\")
-                query_logical = f"ASSOCIATORS OF {{Win32_DiskPartition.DeviceID='{part_id}'}} WHERE AssocClass=Win32_LogicalDiskToPartition"
-                
-                for logical in svc.ExecQuery(query_logical):
-                    letter = logical.DeviceID
-                    if letter and len(letter) >= 1:
-                        pythoncom.CoUninitialize()
-                        return letter[0].upper()
+            topology = USBEjector.get_wmi_topology()
             
-            pythoncom.CoUninitialize()
-            return None
+            disk = topology.disk_by_index(disk_index)
+            if disk is None:
+                return None
+            letters = topology.letters_for(disk)
+            return letters[0] if letters else None
         except Exception as e:
             logger.debug(f"Erro get letter: {e}")
             return None
@@ -627,11 +2081,7 @@ rescan
         """Atribuir letra automaticamente"""
         try:
             # Encontrar primeira letra disponível
-            used_letters = set()
-            drives = win32api.GetLogicalDriveStrings()
-            for drive in drives.split('\x00')[:-1]:
-                if len(drive) >= 1:
-                    used_letters.add(drive[0].upper())
+            used_letters = set(USBEjector.backend.logical_drives())
             
             # Letras possíveis (D-Z)
             for letter in "DEFGHIJKLMNOPQRSTUVWXYZ":
@@ -641,16 +2091,12 @@ rescan
 select partition 1
 assign letter={letter}
 """
-                    result = subprocess.run(
-                        ["diskpart"], 
-                        input=script.encode('utf-8'), 
-                        capture_output=True, 
-                        timeout=10
-                    )
+                    USBEjector.backend.run_diskpart(script, timeout=10)
                     time.sleep(0.1)
                     
                     # Verificar se funcionou
-                    if os.path.exists(f"{letter}:\\"):
+                    if USBEjector.backend.volume_exists(letter):
+                        USBEjector.invalidate_drive_snapshot()
                         logger.info(f"✅ Letra {letter}: atribuída")
                         return letter
             
@@ -660,31 +2106,25 @@ assign letter={letter}
             return None
 
     @staticmethod
-    def _build_device(letter: str, source: str) -> Optional[USBDevice]:
-        drive = f"{letter}:\\"
+    def _build_device(letter: str, source: str,
+                      snapshot: Optional[DriveInfoSnapshot] = None) -> Optional[USBDevice]:
+        snapshot = snapshot or USBEjector.drive_snapshot()
         try:
             label = "Dispositivo USB"
             filesystem = "FAT32"
-            total_bytes = 0
-            free_bytes = 0
             
-            try:
-                volume_info = win32api.GetVolumeInformation(drive)
-                if volume_info and volume_info[0]:
-                    label = volume_info[0].strip()
-                if volume_info and len(volume_info) > 4 and volume_info[4]:
-                    filesystem = volume_info[4]
-            except Exception:
+            volume_info = snapshot.volume_info(letter)
+            if not volume_info:
                 return None
+            if volume_info[0]:
+                label = volume_info[0].strip()
+            if len(volume_info) > 4 and volume_info[4]:
+                filesystem = volume_info[4]
             
-            try:
-                disk_space = win32api.GetDiskFreeSpaceEx(drive)
-                free_bytes = disk_space[0]
-                total_bytes = disk_space[1]
-                if total_bytes == 0:
-                    return None
-            except Exception:
+            space = snapshot.free_space(letter)
+            if not space or space[1] == 0:
                 return None
+            free_bytes, total_bytes = space
             
             if not label or label.strip() == "":
                 label = f"Removível ({letter}:)"
@@ -694,39 +2134,47 @@ assign letter={letter}
             return None
 
     @staticmethod
-    def find_locking_processes(drive_letter: str) -> List[ProcessInfo]:
-        locking_processes: List[ProcessInfo] = []
-        drive_path = f"{drive_letter.upper()}:\\"
-        
+    def enable_lock_index(**kwargs) -> OpenHandleIndex:
+        """Ligar o índice de handles em segundo plano (opcional)"""
+        if USBEjector.lock_index is None:
+            kwargs.setdefault("list_pids", USBEjector.backend.pids)
+            USBEjector.lock_index = OpenHandleIndex(USBEjector.lock_scanner, **kwargs)
+            USBEjector.lock_index.start()
+        return USBEjector.lock_index
+
+    @staticmethod
+    def disable_lock_index():
+        if USBEjector.lock_index is not None:
+            USBEjector.lock_index.stop()
+            USBEjector.lock_index = None
+
+    @staticmethod
+    def find_locking_processes_multi(drive_letters, first_only: bool = False) -> Dict[str, List[ProcessInfo]]:
+        """Uma única varredura de processos cobrindo várias letras"""
+        letters = {l.upper() for l in drive_letters}
+        results: Dict[str, List[ProcessInfo]] = {l: [] for l in letters}
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe'], ad_value=None):
-                try:
-                    info = proc.info
-                    pid = info.get('pid')
-                    name = info.get('name') or "Desconhecido"
-                    exe = info.get('exe') or ""
-                    open_files: List[str] = []
-                    
-                    try:
-                        for f in proc.open_files():
-                            if f.path.upper().startswith(drive_path.upper()):
-                                open_files.append(f.path)
-                                break
-                    except Exception:
-                        pass
-                    
-                    if exe and exe.upper().startswith(drive_path.upper()):
-                        open_files.append(exe)
-                    
-                    if open_files:
-                        locking_processes.append(ProcessInfo(pid, name, exe, open_files))
-                
-                except Exception:
-                    continue
+            pids = None
+            index = USBEjector.lock_index
+            indexed = [index.lookup(l) for l in letters] if index is not None else [None]
+            if all(entries is not None for entries in indexed):
+                # Re-checar só os PIDs que o índice listou
+                pids = set().union(*[set(entries) for entries in indexed])
+                if not pids:
+                    return results
+            results.update(USBEjector.lock_scanner.scan(letters, first_only=first_only, pids=pids))
         except Exception as e:
             logger.debug(f"Erro processos: {e}")
-        
-        return locking_processes
+        return results
+
+    @staticmethod
+    def find_locking_processes(drive_letter: str, first_only: bool = False) -> List[ProcessInfo]:
+        """Processos com arquivos abertos na unidade (first_only: parar no primeiro)"""
+        return USBEjector.find_locking_processes_multi({drive_letter}, first_only)[drive_letter.upper()]
+
+    @staticmethod
+    def has_locks(drive_letter: str) -> bool:
+        return bool(USBEjector.find_locking_processes(drive_letter, first_only=True))
 
     @staticmethod
     def verify_safe_to_eject(drive_letter: str) -> Tuple[bool, str, List[ProcessInfo]]:
@@ -743,119 +2191,422 @@ assign letter={letter}
         logger.info("✓ Seguro")
         return True, "Seguro", []
 
+    @staticmethod
+    def choose_safe_mode(drive_letter: str) -> Tuple[bool, str]:
+        """Modo auto: (usar modo seguro?, motivo) pela atividade de escrita do disco"""
+        backend = USBEjector.backend
+        try:
+            # Acesso 0: o número do disco só precisa de um handle de consulta (funciona sem admin)
+            handle = backend.open_volume(drive_letter, access=0)
+        except DeviceError as e:
+            return True, f"volume inacessível ({e.winerror})"
+        try:
+            number = USBEjector._disk_number(handle)
+        finally:
+            backend.close(handle)
+        if number is None:
+            return True, "disco físico desconhecido"
+        try:
+            pending = backend.pending_write_bytes(drive_letter)
+        except Exception:
+            pending = None
+        busy, reason = USBEjector.io_activity.classify(f"PhysicalDrive{number}", pending)
+        logger.info(f"🤖 Auto {drive_letter}: {'SEGURO' if busy else 'RÁPIDO'} ({reason})")
+        return busy, reason
+
+    @staticmethod
+    def eject_drives(drive_letters, progress_callback=None, safe_mode: bool = False,
+                     mode: Optional[str] = None) -> Dict[str, Tuple[bool, str, List[ProcessInfo]]]:
+        """⏏ Ejeção em lote: uma varredura de bloqueios e um pipeline por unidade em paralelo
+
+        `mode` ("fast", "safe" ou "auto") substitui `safe_mode`; no auto cada unidade
+        ocupada (escrita em andamento ou recente) segue o caminho seguro.
+        """
+        letters = [l.upper() for l in drive_letters]
+        results: Dict[str, Tuple[bool, str, List[ProcessInfo]]] = {}
+        mode = mode or ("safe" if safe_mode else "fast")
+        logger.info(f"⏏ Ejeção em lote: {', '.join(letters)} ({EJECT_MODE_NAMES[mode]})")
+        
+        if mode == "auto":
+            with ThreadPoolExecutor(max_workers=len(letters) or 1, thread_name_prefix="auto") as pool:
+                decisions = dict(zip(letters, pool.map(USBEjector.choose_safe_mode, letters)))
+            safe_letters = {l for l, (busy, _) in decisions.items() if busy}
+        else:
+            safe_letters = set(letters) if mode == "safe" else set()
+        
+        if safe_letters:
+            for letter in letters:
+                if letter in safe_letters and not USBEjector.is_valid_physical_drive(letter):
+                    results[letter] = (False, "Inacessível", [])
+            locks = USBEjector.find_locking_processes_multi(
+                [l for l in letters if l in safe_letters and l not in results])
+            for letter, procs in locks.items():
+                if procs:
+                    logger.warning(f"⚠️ {letter}: {len(procs)} processo(s) bloqueando")
+                    results[letter] = (False, f"{len(procs)} processo(s)", procs)
+        
+        targets = [l for l in letters if l not in results]
+        if not targets:
+            return results
+        
+        def _eject(letter: str) -> Tuple[bool, str]:
+            cb = (lambda p, info=None: progress_callback(letter, p, info)) if progress_callback else None
+            return USBEjector.eject_drive(letter, cb, safe_mode=letter in safe_letters)
+        
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="eject") as pool:
+            futures = {pool.submit(_eject, letter): letter for letter in targets}
+            for future in as_completed(futures):
+                letter = futures[future]
+                try:
+                    success, msg = future.result()
+                except Exception as e:
+                    success, msg = False, f"Erro: {e}"
+                results[letter] = (success, msg, [])
+        
+        return results
+
     @staticmethod
     def kill_process(pid: int) -> bool:
         try:
-            process = psutil.Process(pid)
-            process.terminate()
-            try:
-                process.wait(timeout=1)
-                return True
-            except Exception:
-                process.kill()
-                return True
+            return USBEjector.backend.kill_process(pid)
         except Exception as e:
             logger.debug(f"Erro kill {pid}: {e}")
             return False
 
+    @staticmethod
+    def _device_identity(letter: str) -> str:
+        """Letra + número de série do volume (para separar mídias nos registros)"""
+        info = USBEjector.drive_snapshot().volume_info(letter)
+        if info and len(info) > 1 and info[1]:
+            return f"{letter}: #{info[1] & 0xFFFFFFFF:08X}"
+        return f"{letter}:"
+
+    @staticmethod
+    def _acquire_volume_lock(handle, drive_letter: str, deadline: float, report=None) -> int:
+        """FSCTL_LOCK_VOLUME com backoff exponencial até `deadline` segundos; retorna as tentativas"""
+        backend = USBEjector.backend
+        delay, max_delay = USBEjector.lock_backoff
+        holders: List[ProcessInfo] = []
+        scan: Optional[threading.Thread] = None
+        started = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                backend.ioctl(handle, FSCTL_LOCK_VOLUME)
+                return attempts
+            except DeviceError as e:
+                # Só handles abertos por outros processos valem nova tentativa
+                if e.winerror not in (ERROR_ACCESS_DENIED, ERROR_SHARING_VIOLATION):
+                    raise
+                error = e
+            
+            remaining = deadline - (time.perf_counter() - started)
+            if remaining <= 0:
+                raise VolumeLockTimeout(error.winerror, attempts, list(holders))
+            if scan is None and USBEjector.identify_lock_holder:
+                scan = threading.Thread(
+                    target=lambda: holders.extend(
+                        USBEjector.find_locking_processes(drive_letter, first_only=True)),
+                    daemon=True
+                )
+                scan.start()
+            if report:
+                report(60 + int(15 * (1 - remaining / deadline)), {
+                    "stage": "lock", "attempt": attempts, "remaining": remaining,
+                    "holder": holders[0].name if holders else None,
+                })
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    @staticmethod
+    def _disk_number(handle) -> Optional[int]:
+        """Disco físico do volume aberto (IOCTL_STORAGE_GET_DEVICE_NUMBER)"""
+        try:
+            out = USBEjector.backend.ioctl(
+                handle, IOCTL_STORAGE_GET_DEVICE_NUMBER, None, ctypes.sizeof(STORAGE_DEVICE_NUMBER))
+            return decode_storage_device_number(out)[1]
+        except (DeviceError, ValueError, TypeError) as e:
+            logger.debug(f"Número do disco indisponível: {e}")
+            return None
+
+    @staticmethod
+    def _flush_progress(handle, drive_letter: str, report) -> FlushProgress:
+        """FlushProgress lendo write_bytes do PhysicalDriveN do volume"""
+        backend = USBEjector.backend
+        number = USBEjector._disk_number(handle)
+        
+        def read_written() -> Optional[int]:
+            if number is None:
+                return None
+            counters = backend.disk_io_counters().get(f"PhysicalDrive{number}")
+            return getattr(counters, "write_bytes", None)
+        
+        try:
+            expected = backend.pending_write_bytes(drive_letter)
+        except Exception as e:
+            logger.debug(f"Bytes pendentes indisponíveis: {e}")
+            expected = None
+        return FlushProgress(read_written, report, expected)
+
     @staticmethod
     def eject_drive(drive_letter: str, progress_callback=None, safe_mode: bool = False) -> Tuple[bool, str]:
+        """progress_callback(percent, info=None); `info` descreve esperas (ex.: lock do volume)"""
+        mode = "safe" if safe_mode else "fast"
         logger.info(f"⏏ Ejetando {drive_letter}: ({'SEGURO' if safe_mode else 'RÁPIDO'})")
-        volume_path = f"\\\\.\\{drive_letter}:"
+        backend = USBEjector.backend
+        trace = EjectTrace(USBEjector.eject_metrics, USBEjector._device_identity(drive_letter), mode)
+        started = time.perf_counter()
+        success = False  # Resultado devolvido ao chamador (registrado no passo "total")
+        
+        def report(percent: int, info: Optional[Dict] = None):
+            if progress_callback:
+                if info is None:
+                    progress_callback(percent)
+                else:
+                    progress_callback(percent, info)
         
         try:
-            handle = win32file.CreateFile(
-                volume_path, GENERIC_READ | GENERIC_WRITE, 
-                FILE_SHARE_READ | FILE_SHARE_WRITE, None, OPEN_EXISTING, 0, None
-            )
+            with trace.step("open"):
+                handle = backend.open_volume(drive_letter)
             
             try:
-                if safe_mode:
-                    # MODO SEGURO: Todas operações
-                    logger.info("  1️⃣ □ Cache...")
-                if progress_callback:
-                    progress_callback(20)
-                try:
-                    win32file.FlushFileBuffers(handle)
-                    logger.info("     ✓ Cache")
-                except Exception:
-                    pass
+                # Ambos os modos gravam o cache e travam o volume antes do dismount;
+                # no modo rápido o GUI só pula a verificação de processos
+                logger.info("  1️⃣ □ Cache...")
+                report(20)
+                flush = USBEjector._flush_progress(handle, drive_letter, report)
+                if trace.optional("flush", lambda: flush.run(lambda: backend.flush(handle))):
+                    logger.info(f"     ✓ Cache ({flush.written / 1024 ** 2:.1f} MB)")
                 
                 logger.info("  2️⃣ □ Bloqueio...")
-                if progress_callback:
-                    progress_callback(40)
-                try:
-                    win32file.DeviceIoControl(handle, IOCTL_STORAGE_MEDIA_REMOVAL, b"\x00", None)
+                report(40)
+                if trace.optional("media_removal", lambda: backend.ioctl(
+                        handle, IOCTL_STORAGE_MEDIA_REMOVAL, b"\x00")):
                     logger.info("     ✓ Bloqueio")
-                except Exception:
-                    pass
                 
                 logger.info("  3️⃣ □ Lock...")
-                if progress_callback:
-                    progress_callback(60)
-                try:
-                    win32file.DeviceIoControl(handle, FSCTL_LOCK_VOLUME, None, None)
+                report(60)
+                if safe_mode:
+                    # Handles transitórios (antivírus, indexador) costumam sair em segundos
+                    try:
+                        with trace.step("lock"):
+                            attempts = USBEjector._acquire_volume_lock(
+                                handle, drive_letter, USBEjector.lock_deadline, report)
+                        logger.info(f"     ✓ Lock ({attempts} tentativa(s))")
+                    except VolumeLockTimeout:
+                        raise
+                    except DeviceError as e:
+                        logger.debug(f"Lock ignorado: {e}")
+                elif trace.optional("lock", lambda: backend.ioctl(
+                        handle, FSCTL_LOCK_VOLUME)):
                     logger.info("     ✓ Lock")
-                except Exception:
-                    pass
                 
                 logger.info("  4️⃣ □ Dismount...")
-                if progress_callback:
-                    progress_callback(80)
-                try:
-                    win32file.DeviceIoControl(handle, FSCTL_DISMOUNT_VOLUME, None, None)
+                report(80)
+                if trace.optional("dismount", lambda: backend.ioctl(
+                        handle, FSCTL_DISMOUNT_VOLUME)):
                     logger.info("     ✓ Dismount")
-                except Exception:
-                    pass
                 
-                else:
-                    # MODO RÁPIDO: Apenas dismount
-                    logger.info("  ⚡ Dismount rápido...")
-                    if progress_callback:
-                        progress_callback(50)
-                    try:
-                        win32file.DeviceIoControl(handle, FSCTL_DISMOUNT_VOLUME, None, None)
-                        logger.info("     ✓ Dismount")
-                    except Exception:
-                        pass
-
                 # Ejeção final (ambos modos)
                 logger.info("  ⏏ Ejetando...")
-                if progress_callback:
-                    progress_callback(90)
-                win32file.DeviceIoControl(handle, IOCTL_STORAGE_EJECT_MEDIA, None, None)
+                report(90)
+                with trace.step("eject"):
+                    backend.ioctl(handle, IOCTL_STORAGE_EJECT_MEDIA)
                 logger.info("     ✓ Ejetado")
                 
-                if progress_callback:
-                    progress_callback(100)
+                report(100)
                 
+                USBEjector.invalidate_drive_snapshot()
                 msg = f"✓ {drive_letter}: removido"
                 logger.info(msg)
+                success = True
                 return True, msg
             
             finally:
-                win32file.CloseHandle(handle)
-        
-        except pywintypes.error as e:
+                backend.close(handle)
+        
+        except VolumeLockTimeout as e:
+            holder = f" ({e.holders[0].name})" if e.holders else ""
+            logger.warning(f"⚠️ {drive_letter}: lock não obtido em {USBEjector.lock_deadline}s"
+                           f" ({e.attempts} tentativas){holder}")
+            return False, f"Em uso{holder}"
+        except DeviceError as e:
             code = e.winerror
-            if code == winerror.ERROR_SHARING_VIOLATION:
+            if code == ERROR_SHARING_VIOLATION:
                 return False, "Em uso"
-            elif code == winerror.ERROR_ACCESS_DENIED:
+            elif code == ERROR_ACCESS_DENIED:
                 return False, "Acesso negado"
             else:
                 return False, f"Erro {code}"
         except Exception as e:
             logger.error(f"Erro ejeção: {e}")
             return False, "Erro"
+        finally:
+            failed = [r for r in trace.records if not r.ok]
+            trace.metrics.record(EjectStepRecord(
+                "total", time.perf_counter() - started,
+                None if success else (failed[-1].error_code if failed else -1),
+                trace.device, mode, success
+            ))
+            logger.info(f"⏱ Ejeção {trace.device} ({mode}): {trace.describe()}")
+
+
+def decode_unitmask(unitmask: int) -> Set[str]:
+    """Bits de dbcv_unitmask → letras (bit 0 = A)"""
+    return {chr(ord('A') + i) for i in range(26) if unitmask & (1 << i)}
+
+
+def decode_device_broadcast(lparam: int) -> Optional[Set[str]]:
+    """Letras de um DEV_BROADCAST_VOLUME; None se o evento não for de volume"""
+    if not lparam:
+        return None
+    header = DEV_BROADCAST_HDR.from_address(lparam)
+    if header.dbch_devicetype != DBT_DEVTYP_VOLUME:
+        return None
+    return decode_unitmask(DEV_BROADCAST_VOLUME.from_address(lparam).dbcv_unitmask)
+
+
+class DeviceChangeCoalescer:
+    """Junta rajadas de WM_DEVICECHANGE numa única notificação (added, removed)"""
+
+    def __init__(self, callback, quiet_window: float = 0.3, timer_factory=threading.Timer):
+        self.callback = callback
+        self.quiet_window = quiet_window
+        self._timer_factory = timer_factory
+        self._lock = threading.Lock()
+        self._timer = None
+        self._last_event: Dict[str, int] = {}
+        self._needs_full_refresh = False
+
+    def feed(self, event: int, letters: Optional[Set[str]]):
+        """Registrar um evento; letters=None quando não dá para saber as letras"""
+        with self._lock:
+            if letters is None:
+                self._needs_full_refresh = True
+            else:
+                for letter in letters:
+                    self._last_event[letter] = event
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = self._timer_factory(self.quiet_window, self.flush)
+            self._timer.start()
+
+    def flush(self):
+        """Emitir o que foi acumulado (último evento por letra vence)"""
+        with self._lock:
+            events, self._last_event = self._last_event, {}
+            full, self._needs_full_refresh = self._needs_full_refresh, False
+            self._timer = None
+        if not events and not full:
+            return
+        if full:
+            self.callback(None, None)
+            return
+        added = {l for l, ev in events.items() if ev == DBT_DEVICEARRIVAL}
+        removed = {l for l, ev in events.items() if ev == DBT_DEVICEREMOVECOMPLETE}
+        self.callback(added, removed)
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+class ProgressAnimator:
+    """Barras de progresso animadas por um único tick (root.after) com FPS limitado
+
+    set_target() só guarda o valor alvo; o tick interpola todas as barras ativas em
+    direção aos alvos e para de se reagendar quando nada mais se move.
+    """
+
+    def __init__(self, schedule, apply, fps: int = 30, time_constant: float = 0.12,
+                 clock=time.perf_counter, cpu_clock=time.thread_time):
+        self._schedule = schedule  # (ms, fn) → agenda fn no loop da UI (root.after)
+        self._apply = apply  # (chave, valor 0–100) → desenha a barra
+        self.interval = 1.0 / fps
+        self.time_constant = time_constant  # Segundos para percorrer ~63% da distância
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self.targets: Dict[str, float] = {}
+        self.values: Dict[str, float] = {}
+        self._running = False
+        self._last_tick = 0.0
+        self.frames = 0
+        self.dropped_frames = 0
+        self.applied = 0
+        self.cpu_time = 0.0
+        self.active_time = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def value(self, key: str, default: float = 0.0) -> float:
+        return self.values.get(key, default)
+
+    def set_target(self, key: str, value: float):
+        self.targets[key] = value
+        self.values.setdefault(key, 0.0)
+        if not self._running:
+            self._running = True
+            self._last_tick = self._clock()
+            self._schedule(0, self._tick)
+
+    def remove(self, key: str):
+        self.targets.pop(key, None)
+        self.values.pop(key, None)
+
+    def _tick(self):
+        cpu_start = self._cpu_clock()
+        now = self._clock()
+        dt = now - self._last_tick
+        self._last_tick = now
+        self.active_time += dt
+        self.frames += 1
+        if dt > 1.5 * self.interval:
+            self.dropped_frames += int(dt / self.interval) - 1
+        
+        alpha = 1.0 - math.exp(-dt / self.time_constant) if self.time_constant > 0 else 1.0
+        moving = False
+        for key, target in list(self.targets.items()):
+            current = self.values.get(key, 0.0)
+            if current == target:
+                continue
+            current += (target - current) * alpha
+            if abs(target - current) < 0.5:
+                current = target
+            else:
+                moving = True
+            self.values[key] = current
+            self._apply(key, current)
+            self.applied += 1
+        
+        self.cpu_time += self._cpu_clock() - cpu_start
+        if moving:
+            spent = self._clock() - now
+            self._schedule(max(1, int((self.interval - spent) * 1000)), self._tick)
+        else:
+            self._running = False  # Ocioso até o próximo set_target
+
+    def stats(self) -> Dict[str, float]:
+        fps = self.frames / self.active_time if self.active_time else 0.0
+        return {
+            "frames": self.frames, "dropped_frames": self.dropped_frames,
+            "applied": self.applied, "fps": round(fps, 1),
+            "cpu_ms": round(self.cpu_time * 1000, 2),
+        }
 
 
 class USBDeviceMonitor:
-    """Monitor USB"""
+    """Monitor USB: callback(added, removed) com as letras; (None, None) = refresh completo"""
     
-    def __init__(self, callback):
+    def __init__(self, callback, quiet_window: float = 0.3):
         self.callback = callback
         self.hwnd = None
         self.running = False
+        self.coalescer = DeviceChangeCoalescer(callback, quiet_window)
 
     def start(self):
         self.running = True
@@ -864,6 +2615,7 @@ class USBDeviceMonitor:
 
     def stop(self):
         self.running = False
+        self.coalescer.cancel()
         if self.hwnd:
             try:
                 win32gui.DestroyWindow(self.hwnd)
@@ -886,723 +2638,40 @@ class USBDeviceMonitor:
 
     def _wnd_proc(self, hwnd, msg, wparam, lparam):
         if msg == win32con.WM_DEVICECHANGE:
-            if wparam in (0x8000, 0x8004):
-                threading.Timer(0.3, self.callback).start()
+            if wparam in (DBT_DEVICEARRIVAL, DBT_DEVICEREMOVECOMPLETE):
+                try:
+                    letters = decode_device_broadcast(lparam)
+                except Exception as e:
+                    logger.debug(f"Erro decodificar broadcast: {e}")
+                    letters = None
+                self.coalescer.feed(wparam, letters)
         return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
 
 
-# =========================
-# UI COMPONENTS
-# =========================
-
-class SpaceCanvas(ctk.CTkCanvas):
-    """Gráfico circular"""
-    
-    def __init__(self, master, device: USBDevice, theme, **kwargs):
-        super().__init__(
-            master, width=32, height=32, 
-            bg=theme.BG_SECONDARY, highlightthickness=0, **kwargs
-        )
-        self.device = device
-        self.theme = theme
-        self.draw_chart()
-    
-    def draw_chart(self):
-        self.delete("all")
-        size = 32
-        cx, cy = size // 2, size // 2
-        radius = 12
-        
-        usage_percent = self.device.get_usage_percent()
-        usage_color = self.device.get_usage_color(self.theme)
-        
-        self.create_oval(
-            cx - radius, cy - radius, cx + radius, cy + radius,
-            fill=self.theme.SPACE_FREE, outline=""
-        )
-        
-        if usage_percent > 0:
-            extent = -360 * (usage_percent / 100)
-            self.create_arc(
-                cx - radius, cy - radius, cx + radius, cy + radius,
-                start=90, extent=extent, fill=usage_color, outline=""
-            )
-        
-        inner_r = 7
-        self.create_oval(
-            cx - inner_r, cy - inner_r, cx + inner_r, cy + inner_r,
-            fill=self.theme.BG_SECONDARY, outline=""
-        )
-        
-        self.create_text(
-            cx, cy, text=f"{usage_percent}%",
-            fill=self.theme.TEXT_PRIMARY,
-            font=("Segoe UI", 7, "bold")
-        )
-
-
-# =========================
-# UI SCREENS
-# =========================
-
-class PremiumUSBEjectorGUI:
-    """Interface Premium COMPLETA"""
-
-    def __init__(self):
-        self.root = ctk.CTk()
-        self.root.overrideredirect(True)
-        
-        w, h = 290, 320
-        sw = self.root.winfo_screenwidth()
-        sh = self.root.winfo_screenheight()
-        # Posição EXATA: canto inferior direito, encostado nas bordas
-        x = sw - w  # Sem margem - encostado na borda direita
-        y = sh - h - 40  # 40px acima (altura da barra de tarefas do Windows)
-        self.root.geometry(f"{w}x{h}+{x}+{y}")
-        self.root.update()
-        self.root.resizable(False, False)
-        self.root.attributes("-topmost", True)
-
-        self.is_dark = True  # Modo escuro inicial
-        self.theme = DesignSystem.Colors.Dark  # Tema escuro
-        self.fonts = DesignSystem.get_fonts()
-        ctk.set_appearance_mode("dark")  # Aparência escura
-
-        self.devices: List[USBDevice] = []
-        self.usb_monitor = USBDeviceMonitor(callback=self.on_usb_change)
-        self.ejecting_drives: Set[str] = set()
-        self.eject_progress: Dict[str, int] = {}
-        self.progress_bars: Dict[str, ctk.CTkFrame] = {}
-        self.progress_containers: Dict[str, ctk.CTkFrame] = {}  # 🔥 NOVO: containers
-        self.last_click_time: Dict[str, float] = {}
-        self.show_unmounted = False
-        self.safe_eject_mode = False  # Modo rápido padrão
-        self.safe_eject_mode = False  # Modo rápido padrão  # 🚀 Modo rápido por padrão
-        
-        
-        self.drag_x = 0
-        self.drag_y = 0
-
-        self.setup_ui()
-        self.refresh_devices()
-        self.usb_monitor.start()
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    def on_closing(self):
-        self.usb_monitor.stop()
-        self.root.destroy()
-
-    def on_usb_change(self):
-        self.root.after(0, self.refresh_devices)
-
-    def toggle_theme(self):
-        self.is_dark = not self.is_dark
-        self.theme = DesignSystem.Colors.Dark if self.is_dark else DesignSystem.Colors.Light
-        ctk.set_appearance_mode("dark" if self.is_dark else "light")
-        self.refresh_ui()
-
-    def toggle_unmounted(self):
-        """Mostrar/ocultar dispositivos não montados"""
-        self.show_unmounted = not self.show_unmounted
-        logger.info(f"👁 Mostrar não montados: {self.show_unmounted}")
-        self.refresh_devices()
-
-    def toggle_theme(self):
-        """Alternar tema claro/escuro"""
-        self.is_dark = not self.is_dark
-        self.theme = DesignSystem.Colors.Dark if self.is_dark else DesignSystem.Colors.Light
-        ctk.set_appearance_mode("dark" if self.is_dark else "light")
-        self.refresh_ui()
-
-
-    def toggle_eject_mode(self):
-        """⚡ Alternar entre modo rápido e seguro"""
-        self.safe_eject_mode = not self.safe_eject_mode
-        mode = "SEGURO" if self.safe_eject_mode else "RÁPIDO"
-        logger.info(f"⚡ Modo: {mode}")
-        self.refresh_devices()
-
-    def refresh_ui(self):
-        for w in self.root.winfo_children():
-            w.destroy()
-        self.setup_ui()
-        self.refresh_devices()
-
-    def start_drag(self, e):
-        self.drag_x = e.x
-        self.drag_y = e.y
-
-    def do_drag(self, e):
-        x = self.root.winfo_x() + e.x - self.drag_x
-        y = self.root.winfo_y() + e.y - self.drag_y
-        self.root.geometry(f"+{x}+{y}")
-
-    def setup_ui(self):
-        main = ctk.CTkFrame(
-            self.root, fg_color=self.theme.BG_PRIMARY,
-            corner_radius=8, border_width=1, border_color=self.theme.BORDER
-        )
-        main.pack(fill="both", expand=True)
-        
-        self.create_titlebar(main)
-        if not USBEjector.is_admin():
-            self.create_admin_banner(main)
-        self.create_devices_container(main)
-
-    def create_titlebar(self, parent):
-        bar = ctk.CTkFrame(
-            parent, fg_color=self.theme.BG_SECONDARY, 
-            height=32, corner_radius=0
-        )
-        bar.pack(fill="x")
-        bar.pack_propagate(False)
-        bar.bind("<Button-1>", self.start_drag)
-        bar.bind("<B1-Motion>", self.do_drag)
-        
-        title = ctk.CTkLabel(
-            bar, text="USB Ejector", 
-            font=self.fonts['title'], 
-            text_color=self.theme.TEXT_PRIMARY
-        )
-        title.pack(side="left", padx=DesignSystem.SPACE_LG)
-        title.bind("<Button-1>", self.start_drag)
-        title.bind("<B1-Motion>", self.do_drag)
-        
-        controls = ctk.CTkFrame(bar, fg_color="transparent")
-        controls.pack(side="right", padx=4)
-        
-        self._create_control_btn(
-            controls, "👁" if self.show_unmounted else "👁‍🗨", 
-            self.toggle_unmounted,
-            fg=self.theme.ACTION_PRIMARY if self.show_unmounted else "transparent"
-        )
-        self._create_control_btn(
-            controls, "⚡" if not self.safe_eject_mode else "🛡",
-            self.toggle_eject_mode,
-            fg=self.theme.ACTION_WARNING if self.safe_eject_mode else self.theme.ACTION_PRIMARY
-        )
-        self._create_control_btn(controls, "🌙" if not self.is_dark else "☀", self.toggle_theme)
-        self._create_control_btn(controls, "↻", self.refresh_devices)
-        self._create_control_btn(controls, "ℹ️", self.show_about, hover=self.theme.BG_TERTIARY)
-        self._create_control_btn(controls, "✕", self.on_closing, hover=self.theme.ACTION_DANGER)
-
-    def _create_control_btn(self, parent, text, cmd, fg="transparent", hover=None):
-        btn = ctk.CTkButton(
-            parent, text=text, width=24, height=24, corner_radius=4,
-            fg_color=fg, hover_color=hover or self.theme.BG_TERTIARY,
-            font=self.fonts['icon_small'], 
-            text_color=self.theme.TEXT_SECONDARY,
-            command=cmd
-        )
-        btn.pack(side="left", padx=2)
-        return btn
-
-    def create_admin_banner(self, parent):
-        banner = ctk.CTkFrame(
-            parent, fg_color=self.theme.ACTION_WARNING, 
-            height=24, corner_radius=0
-        )
-        banner.pack(fill="x")
-        banner.pack_propagate(False)
-        
-        lbl = ctk.CTkLabel(
-            banner, text="⚠ Execute como Admin",
-            font=self.fonts['small'], text_color="#000000"
-        )
-        lbl.pack(expand=True)
-        
-        for w in [banner, lbl]:
-            w.bind("<Button-1>", lambda e: [USBEjector.run_as_admin(), self.root.quit()])
-            w.configure(cursor="hand2")
-
-    def create_devices_container(self, parent):
-        self.devices_scroll = ctk.CTkScrollableFrame(
-            parent, fg_color=self.theme.BG_PRIMARY, corner_radius=0, border_width=0,
-            scrollbar_button_color=self.theme.BG_TERTIARY,
-            scrollbar_button_hover_color=self.theme.BORDER_FOCUS
-        )
-        self.devices_scroll.pack(
-            fill="both", expand=True, 
-            padx=DesignSystem.SPACE_SM, pady=DesignSystem.SPACE_SM
-        )
-
-    def refresh_devices(self):
-        """🔥 Refresh SEM piscar barra de progresso"""
-        for w in self.devices_scroll.winfo_children():
-            w.destroy()
-        
-        # NÃO limpar progress_bars/containers se estiver ejetando
-        # (mantém referências para atualização)
-        
-        self.devices = USBEjector.get_removable_drives()
-        unmounted = []
-        if self.show_unmounted:
-            unmounted = USBEjector.get_unmounted_usb_drives()
-        
-        all_devs = self.devices + unmounted
-        
-        if not all_devs:
-            self.show_empty_state()
-        else:
-            for dev in all_devs:
-                if dev.is_mounted:
-                    self.create_device_card(dev)
-                else:
-                    self.create_unmounted_card(dev)
-
-    def show_empty_state(self):
-        empty = ctk.CTkFrame(self.devices_scroll, fg_color="transparent")
-        empty.pack(expand=True, pady=40)
-        ctk.CTkLabel(empty, text="🔌", font=ctk.CTkFont(size=32)).pack()
-        ctk.CTkLabel(
-            empty, text="Nenhum USB", font=self.fonts['small'], 
-            text_color=self.theme.TEXT_SECONDARY
-        ).pack(pady=(6, 0))
-
-    def create_unmounted_card(self, device: USBDevice):
-        """Card USB não montado"""
-        card = ctk.CTkFrame(
-            self.devices_scroll, fg_color=self.theme.BG_SECONDARY,
-            corner_radius=8, border_width=1, border_color=self.theme.BORDER, height=52
-        )
-        card.pack(fill="x", pady=3)
-        card.pack_propagate(False)
-        
-        content = ctk.CTkFrame(card, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=DesignSystem.SPACE_SM, pady=DesignSystem.SPACE_SM)
-        
-        icon = ctk.CTkFrame(
-            content, fg_color="transparent", 
-            border_width=2, border_color=self.theme.TEXT_TERTIARY,
-            corner_radius=999, width=36, height=36
-        )
-        icon.pack(side="left")
-        icon.pack_propagate(False)
-        
-        ctk.CTkLabel(
-            icon, text="?", font=self.fonts['icon'], 
-            text_color=self.theme.TEXT_TERTIARY
-        ).place(relx=0.5, rely=0.5, anchor="center")
-        
-        info = ctk.CTkFrame(content, fg_color="transparent")
-        info.pack(side="left", fill="both", expand=True, padx=(DesignSystem.SPACE_SM, 0))
-        
-        ctk.CTkLabel(
-            info, text=device.label[:16] if len(device.label) <= 16 else device.label[:13] + "...",
-            font=self.fonts['body'], text_color=self.theme.TEXT_SECONDARY, anchor="w"
-        ).pack(fill="x", anchor="w")
-        
-        size_text = f"Não montado • {device.get_size_gb()}" if device.total_size > 0 else "Não montado"
-        ctk.CTkLabel(
-            info, text=size_text,
-            font=self.fonts['micro'], text_color=self.theme.TEXT_TERTIARY, anchor="w"
-        ).pack(fill="x", anchor="w")
-        
-        ctk.CTkButton(
-            content, text="📁", width=32, height=32, corner_radius=6,
-            fg_color=self.theme.ACTION_PRIMARY, hover_color=self.theme.ACTION_PRIMARY,
-            font=self.fonts['icon'], text_color="#ffffff",
-            command=lambda: self.mount_device(device)
-        ).pack(side="right")
-
-    def mount_device(self, device: USBDevice):
-        """Montar USB"""
-        def _mount():
-            success, msg = USBEjector.mount_drive(device)
-            self.root.after(0, lambda: self._handle_mount_result(success, msg, device))
-        threading.Thread(target=_mount, daemon=True).start()
-
-    def _handle_mount_result(self, success: bool, msg: str, device: USBDevice):
-        if success:
-            CTkMessagebox(title="Sucesso", message=f"✓ {device.label}\n\n{msg}", icon="check")
-            self.root.after(1500, self.refresh_devices)
-        else:
-            CTkMessagebox(title="Erro", message=f"Falha:\n{msg}", icon="warning")
-
-    def create_device_card(self, device: USBDevice):
-        """🎨 CARD USB MONTADO PREMIUM"""
-        is_ejecting = device.letter in self.ejecting_drives
-        progress = self.eject_progress.get(device.letter, 0)
-        
-        card_container = ctk.CTkFrame(self.devices_scroll, fg_color="transparent")
-        card_container.pack(fill="x", pady=3)
-        
-        card = ctk.CTkFrame(
-            card_container, fg_color=self.theme.BG_SECONDARY,
-            corner_radius=8, border_width=1, border_color=self.theme.BORDER, height=58
-        )
-        card.pack(fill="x")
-        card.pack_propagate(False)
-        
-        content = ctk.CTkFrame(card, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=DesignSystem.SPACE_SM, pady=DesignSystem.SPACE_SM)
-        
-        # Ícone outline
-        icon_frame = ctk.CTkFrame(
-            content, fg_color="transparent",
-            border_width=2, border_color=self.theme.ACTION_PRIMARY,
-            corner_radius=999, width=36, height=36
-        )
-        icon_frame.pack(side="left")
-        icon_frame.pack_propagate(False)
-        
-        ctk.CTkLabel(
-            icon_frame, text=device.letter, 
-            font=self.fonts['icon'], 
-            text_color=self.theme.ACTION_PRIMARY
-        ).place(relx=0.5, rely=0.5, anchor="center")
-        
-        # Info
-        info = ctk.CTkFrame(content, fg_color="transparent")
-        info.pack(side="left", fill="both", expand=True, padx=(DesignSystem.SPACE_SM, 0))
-        
-        name_lbl = ctk.CTkLabel(
-            info, text=device.label[:16] if len(device.label) <= 16 else device.label[:13] + "...",
-            font=self.fonts['body'], text_color=self.theme.TEXT_PRIMARY, anchor="w"
-        )
-        name_lbl.pack(fill="x", anchor="w")
-        
-        # Informação progressiva
-        usage = device.get_usage_percent()
-        meta_text_normal = f"{device.letter}: • {device.get_size_gb()}"
-        meta_text_hover = f"{device.get_free_gb()} livre • {usage}% usado"
-        
-        meta_lbl = ctk.CTkLabel(
-            info, text=meta_text_normal,
-            font=self.fonts['micro'], 
-            text_color=device.get_usage_color(self.theme) if usage >= 80 else self.theme.TEXT_TERTIARY,
-            anchor="w"
-        )
-        meta_lbl.pack(fill="x", anchor="w")
-        
-        # Gráfico
-        SpaceCanvas(content, device, self.theme).pack(side="right", padx=(4, 0))
-        
-        # Botão ejetar
-        eject_btn = ctk.CTkButton(
-            content, text="⏏" if not is_ejecting else "⏳",
-            width=32, height=32, corner_radius=6, fg_color="transparent",
-            hover_color=self.theme.BG_TERTIARY, border_width=1,
-            border_color=self.theme.BORDER, font=self.fonts['icon'],
-            text_color=self.theme.TEXT_SECONDARY,
-            command=lambda: self.eject_device(device)
-        )
-        eject_btn.pack(side="right", padx=(4, 0))
-        
-        # 🔥 Barra progresso SEMPRE CRIADA (visível desde início)
-        prog_container = ctk.CTkFrame(
-            card_container, fg_color=self.theme.PROGRESS_BG, 
-            height=2, corner_radius=1
-        )
-        
-        if is_ejecting:
-            prog_container.pack(fill="x", pady=(2, 0))
-            prog_container.pack_propagate(False)
-            
-            prog_fill = ctk.CTkFrame(
-                prog_container, fg_color=self.theme.PROGRESS_FILL, 
-                height=2, corner_radius=1
-            )
-            prog_fill.place(relx=0, rely=0, relwidth=progress/100, relheight=1)
-            
-            # Salvar referências
-            self.progress_bars[device.letter] = prog_fill
-            self.progress_containers[device.letter] = prog_container
-        
-        # Micro-interações
-        def on_double_click(e):
-            if device.letter not in self.ejecting_drives:
-                self.eject_device(device)
-        
-        def on_enter(e):
-            if device.letter not in self.ejecting_drives:
-                card.configure(
-                    fg_color=self.theme.BG_TERTIARY, 
-                    border_color=self.theme.BORDER_FOCUS,
-                    cursor="hand2"
-                )
-                meta_lbl.configure(text=meta_text_hover)
-            elif is_ejecting:
-                card.configure(cursor="watch")
-        
-        def on_leave(e):
-            if device.letter not in self.ejecting_drives:
-                card.configure(
-                    fg_color=self.theme.BG_SECONDARY, 
-                    border_color=self.theme.BORDER,
-                    cursor=""
-                )
-                meta_lbl.configure(text=meta_text_normal)
-        
-        for w in [card, content, info, name_lbl]:
-            w.bind("<Double-Button-1>", on_double_click)
-            w.bind("<Button-3>", lambda e, d=device: self.show_context_menu(d, e.x_root, e.y_root))
-        
-        card.bind("<Enter>", on_enter)
-        card.bind("<Leave>", on_leave)
-
-    def update_progress(self, letter: str, progress: int):
-        """Atualizar barra SEM redesenhar"""
-        self.eject_progress[letter] = progress
-        if letter in self.progress_bars:
-            try:
-                self.progress_bars[letter].place_configure(relwidth=progress/100)
-                self.root.update()  # Forçar atualização visual
-            except Exception:
-                pass
-
-    def eject_device(self, device: USBDevice):
-        """🔥 Ejeção SEM PISCAR"""
-        letter = device.letter
-        now = time.time()
-        
-        # Debounce
-        if letter in self.last_click_time:
-            if now - self.last_click_time[letter] < 1.5:
-                return
-        self.last_click_time[letter] = now
-        
-        if letter in self.ejecting_drives:
-            return
-        
-        # Marcar como ejetando
-        self.ejecting_drives.add(letter)
-        self.eject_progress[letter] = 0
-        
-        # 🔥 Refresh IMEDIATO para mostrar barra desde início
-        self.refresh_devices()
-        
-        def progress_cb(p):
-            self.root.after(0, lambda: self.update_progress(letter, p))
-        
-        def _eject():
-            try:
-                # MODO RÁPIDO: pula verificação de processos
-                if self.safe_eject_mode:
-                    safe, msg, procs = USBEjector.verify_safe_to_eject(letter)
-                    if not safe and procs:
-                        self.root.after(0, lambda: self.show_lock_warning(device, procs))
-                        return
-                success, result = USBEjector.eject_drive(letter, progress_cb, safe_mode=self.safe_eject_mode)
-                self.root.after(0, lambda: self._handle_eject_result(success, result, device))
-            finally:
-                if letter in self.ejecting_drives:
-                    self.ejecting_drives.remove(letter)
-                if letter in self.eject_progress:
-                    del self.eject_progress[letter]
-                if letter in self.progress_bars:
-                    del self.progress_bars[letter]
-                if letter in self.progress_containers:
-                    del self.progress_containers[letter]
-                self.root.after(300, self.refresh_devices)
-        
-        threading.Thread(target=_eject, daemon=True).start()
-
-    def show_context_menu(self, device: USBDevice, x: int, y: int):
-        """🎯 MENU CONTEXTO COM EXPLORER"""
-        if device.letter in self.ejecting_drives:
-            return
-        
-        menu = ctk.CTkToplevel(self.root)
-        menu.overrideredirect(True)
-        menu.attributes("-topmost", True)
-        menu.geometry(f"180x120+{x}+{y}")  # +30px altura
-        menu.configure(fg_color=self.theme.BG_SECONDARY)
-        
-        frame = ctk.CTkFrame(
-            menu, fg_color=self.theme.BG_SECONDARY, corner_radius=6,
-            border_width=1, border_color=self.theme.BORDER
-        )
-        frame.pack(fill="both", expand=True, padx=3, pady=3)
-        
-        # 🆕 OPÇÃO ABRIR NO EXPLORER
-        ctk.CTkButton(
-            frame, text="📂 Abrir no Explorer", fg_color="transparent", hover_color=self.theme.BG_TERTIARY,
-            anchor="w", height=26, font=self.fonts['small'], 
-            text_color=self.theme.TEXT_PRIMARY,
-            command=lambda: [menu.destroy(), self.open_in_explorer(device)]
-        ).pack(fill="x", padx=4, pady=(4, 2))
-        
-        for txt, cmd in [
-            ("Ejetar", lambda: [menu.destroy(), self.eject_device(device)]),
-            ("Ver Bloqueios", lambda: [menu.destroy(), self.check_locks(device)]),
-            ("Forçar Ejeção", lambda: [menu.destroy(), self.force_eject(device)])
-        ]:
-            ctk.CTkButton(
-                frame, text=txt, fg_color="transparent", hover_color=self.theme.BG_TERTIARY,
-                anchor="w", height=26, font=self.fonts['small'], 
-                text_color=self.theme.ACTION_WARNING if "Forçar" in txt else self.theme.TEXT_PRIMARY,
-                command=cmd
-            ).pack(fill="x", padx=4, pady=2)
-        
-        
-        # About - Créditos
-        ctk.CTkButton(
-            frame, text="ℹ️ About - by olverclock",
-            fg_color="transparent",
-            hover_color=self.theme.BG_TERTIARY,
-            anchor="w", height=26,
-            font=self.fonts["small"],
-            text_color=self.theme.TEXT_TERTIARY,
-            command=lambda: (menu.destroy(), self.show_about())
-        ).pack(fill="x", padx=4, pady=(2, 4))
-
-        self.root.after(100, lambda: self.root.bind("<Button-1>", lambda e: menu.destroy()))
-
-    def open_in_explorer(self, device: USBDevice):
-        """🆕 Abrir USB no Windows Explorer"""
-        try:
-            path = f"{device.letter}:\\"
-            os.startfile(path)
-            logger.info(f"📂 Abrindo {path} no Explorer")
-        except Exception as e:
-            logger.error(f"❌ Erro ao abrir Explorer: {e}")
-            CTkMessagebox(title="Erro", message=f"Não foi possível abrir:\n{str(e)}", icon="warning")
-
-    def check_locks(self, device: USBDevice):
-        """Verificar processos"""
-        def _check():
-            procs = USBEjector.find_locking_processes(device.letter)
-            self.root.after(0, lambda: self._show_lock_result(device, procs))
-        threading.Thread(target=_check, daemon=True).start()
-
-    def _show_lock_result(self, device: USBDevice, procs: List[ProcessInfo]):
-        if not procs:
-            CTkMessagebox(title="Verificação", message=f"✓ Nenhum bloqueio\n\nSeguro para ejetar {device.label}", icon="check")
-        else:
-            self.show_lock_warning(device, procs)
-
-    def show_lock_warning(self, device: USBDevice, procs: List[ProcessInfo]):
-        """Diálogo processos"""
-        if device.letter in self.ejecting_drives:
-            self.ejecting_drives.remove(device.letter)
-            self.refresh_devices()
-        
-        dlg = ctk.CTkToplevel(self.root)
-        dlg.title("Processos Bloqueando")
-        dlg.geometry("320x280")
-        dlg.transient(self.root)
-        dlg.grab_set()
-        dlg.configure(fg_color=self.theme.BG_PRIMARY)
-        
-        ctk.CTkLabel(
-            dlg, text=f"⚠ {len(procs)} processo(s) usando {device.letter}:",
-            font=self.fonts['body']
-        ).pack(pady=10)
-        
-        scroll = ctk.CTkScrollableFrame(dlg, fg_color=self.theme.BG_SECONDARY, corner_radius=6)
-        scroll.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-        
-        for proc in procs:
-            pf = ctk.CTkFrame(scroll, fg_color=self.theme.BG_TERTIARY, corner_radius=6)
-            pf.pack(fill="x", pady=3)
-            
-            info = ctk.CTkFrame(pf, fg_color="transparent")
-            info.pack(side="left", fill="both", expand=True, padx=8, pady=6)
-            
-            ctk.CTkLabel(info, text=proc.name, font=self.fonts['small'], anchor="w", text_color=self.theme.TEXT_PRIMARY).pack(fill="x")
-            ctk.CTkLabel(info, text=f"PID {proc.pid}", font=self.fonts['micro'], text_color=self.theme.TEXT_TERTIARY, anchor="w").pack(fill="x")
-            
-            ctk.CTkButton(
-                pf, text="✖", width=28, height=28, corner_radius=999,
-                fg_color=self.theme.ACTION_DANGER, hover_color="#b01f23",
-                font=self.fonts['icon_small'],
-                command=lambda p=proc: self._kill_and_retry(p, device, dlg)
-            ).pack(side="right", padx=6)
-        
-        btns = ctk.CTkFrame(dlg, fg_color="transparent")
-        btns.pack(fill="x", padx=10, pady=(0, 10))
-        
-        ctk.CTkButton(
-            btns, text="Cancelar", height=32, corner_radius=6,
-            fg_color=self.theme.BG_TERTIARY, hover_color=self.theme.BORDER_FOCUS,
-            font=self.fonts['small'], command=dlg.destroy
-        ).pack(side="left", fill="x", expand=True, padx=(0, 4))
-        
-        ctk.CTkButton(
-            btns, text="Encerrar Tudo", height=32, corner_radius=6,
-            fg_color=self.theme.ACTION_DANGER, hover_color="#b01f23",
-            font=self.fonts['small'],
-            command=lambda: [dlg.destroy(), self._force_eject_all(device, procs)]
-        ).pack(side="right", fill="x", expand=True, padx=(4, 0))
-
-    def _kill_and_retry(self, proc: ProcessInfo, device: USBDevice, dlg):
-        if USBEjector.kill_process(proc.pid):
-            dlg.destroy()
-            self.root.after(200, lambda: self.eject_device(device))
-
-    def force_eject(self, device: USBDevice):
-        """Forçar ejeção"""
-        def _force():
-            procs = USBEjector.find_locking_processes(device.letter)
-            if procs:
-                self.root.after(0, lambda: self._confirm_force(device, procs))
-            else:
-                self.eject_device(device)
-        threading.Thread(target=_force, daemon=True).start()
-
-    def _confirm_force(self, device: USBDevice, procs: List[ProcessInfo]):
-        mb = CTkMessagebox(
-            title="Confirmar", 
-            message=f"Encerrar {len(procs)} processo(s)?\n\n⚠ Dados não salvos serão perdidos!",
-            icon="warning", option_1="Cancelar", option_2="Forçar"
-        )
-        if mb.get() == "Forçar":
-            self._force_eject_all(device, procs)
-
-    def _force_eject_all(self, device: USBDevice, procs: List[ProcessInfo]):
-        def _force():
-            for proc in procs:
-                USBEjector.kill_process(proc.pid)
-                time.sleep(0.1)
-            time.sleep(0.05)
-            success, msg = USBEjector.eject_drive(device.letter)
-            self.root.after(0, lambda: self._handle_eject_result(success, msg, device))
-        threading.Thread(target=_force, daemon=True).start()
-
-    def _handle_eject_result(self, success: bool, msg: str, device: USBDevice):
-        if device.letter in self.ejecting_drives:
-            self.ejecting_drives.remove(device.letter)
-        
-        if success:
-            CTkMessagebox(title="Sucesso", message=f"✓ {device.label} ejetado\n\nPode remover o dispositivo.", icon="check")
-            self.root.after(300, self.refresh_devices)
-        else:
-            CTkMessagebox(title="Erro", message=f"Falha:\n{msg}", icon="warning")
-            self.refresh_devices()
-
-    def show_about(self):
-        """Mostrar informações sobre o desenvolvedor"""
-        try:
-            CTkMessagebox(
-                title="About - USB Safe Ejector Pro",
-                message="USB Safe Ejector Pro v7.3\n\n"
-                       "Desenvolvido por: olverclock\n\n"
-                       "✨ Recursos:\n"
-                       "• Ejeção rápida e segura\n"
-                       "• Detecção inteligente de USBs\n"
-                       "• Interface moderna\n"
-                       "• Modo claro/escuro\n\n"
-                       "© 2025 olverclock",
-                icon="info",
-                option_1="OK"
-            )
-        except:
-            logger.info("About: Desenvolvido por olverclock")
-
-    def run(self):
-        logger.info("=== USB Safe Ejector Pro v7.2 PROFESSIONAL FIX ===")
-        self.root.mainloop()
+def platform_ejector():
+    """USBEjector no Windows, LinuxEjector (sysfs/procfs) no Linux"""
+    if sys.platform.startswith("linux"):
+        from linux_backend import LinuxEjector
+        return LinuxEjector
+    return USBEjector
 
 
-def main():
-    try:
-        app = PremiumUSBEjectorGUI()
-        app.run()
-    except Exception as e:
-        logger.error(f"Erro fatal: {e}", exc_info=True)
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    show_startup_report = argv == ["--startup-report"]
+    if argv and not show_startup_report:
+        # Linha de comando: não carrega Tk/CustomTkinter
+        from usb_ejector_cli import main as cli_main
+        sys.exit(cli_main(argv))
+    if not (win32file.available and psutil.available):
+        print("Erro: pip install customtkinter pywin32 psutil")
         sys.exit(1)
+    startup_report.mark("verificação de dependências")
+    from usb_ejector_gui import main as gui_main
+    gui_main(show_startup_report)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # O GUI importa "usb_ejector": reaproveitar este módulo em vez de carregá-lo de novo
+    sys.modules.setdefault("usb_ejector", sys.modules[__name__])
+    main()
@@ -0,0 +1,187 @@
+"""
+USB Safe Ejector Pro - Linha de comando
+Usa o serviço de ejeção diretamente, sem carregar Tk/CustomTkinter.
+
+Uso:
+    python usb_ejector.py --list [--json]
+    python usb_ejector.py --eject E [--eject F] [--safe | --auto]
+    python usb_ejector.py --eject-all [--safe | --auto]
+    python usb_ejector.py --locks E
+    python usb_ejector.py --mount 2
+
+Códigos de saída:
+    0 sucesso · 1 falha · 2 uso incorreto · 3 unidade em uso · 4 não encontrada
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_LOCKED = 3
+EXIT_NOT_FOUND = 4
+
+_started = time.perf_counter()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="usb_ejector", description="USB Safe Ejector Pro (modo linha de comando)"
+    )
+    actions = parser.add_mutually_exclusive_group(required=True)
+    actions.add_argument("--list", action="store_true", help="listar dispositivos USB")
+    actions.add_argument("--eject", metavar="E", action="append", help="ejetar a unidade (repetível)")
+    actions.add_argument("--eject-all", action="store_true", help="ejetar todas as unidades USB")
+    actions.add_argument("--locks", metavar="E", help="listar processos que bloqueiam a unidade")
+    actions.add_argument("--mount", metavar="DISK", type=int, help="montar o disco físico de índice DISK")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("--safe", action="store_true", help="modo seguro (verifica processos antes)")
+    modes.add_argument("--auto", action="store_true",
+                       help="modo automático (seguro só se o disco estiver gravando)")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    parser.add_argument("--verbose", action="store_true", help="mostrar o log em stderr")
+    parser.add_argument("--simulate", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def _normalize(name: str) -> str:
+    """"e", "E:", "E:\\" → "E"; nomes Linux (sdb1) ficam como estão"""
+    name = name.strip().rstrip("\\/").rstrip(":")
+    return name.upper() if len(name) == 1 else name
+
+
+def _device_dict(device) -> Dict:
+    return {
+        "letter": device.letter, "label": device.label, "filesystem": device.filesystem,
+        "total_bytes": device.total_size, "free_bytes": device.free_size,
+        "mounted": device.is_mounted, "disk_index": device.disk_index,
+        "device": device.device, "mountpoint": device.mountpoint, "key": device.key,
+    }
+
+
+def _process_dict(proc) -> Dict:
+    return {"pid": proc.pid, "name": proc.name, "path": proc.path, "files": proc.files}
+
+
+def _emit(args, data, text_lines: List[str]):
+    if args.json:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    else:
+        for line in text_lines:
+            print(line)
+
+
+def _ejector(args):
+    import usb_ejector
+    if args.simulate:
+        from simulated_backend import SimulatedBackend
+        backend = SimulatedBackend()
+        backend.add_disk("SanDisk Cruzer", 16 * 1024 ** 3)
+        backend.add_disk("Kingston DataTraveler", 32 * 1024 ** 3)
+        backend.add_disk("USB Offline", 8 * 1024 ** 3, mounted=False)
+        usb_ejector.USBEjector.use_backend(backend)
+        return usb_ejector.USBEjector
+    return usb_ejector.platform_ejector()
+
+
+def cmd_list(args, ejector) -> int:
+    devices = sorted(ejector.get_removable_drives(), key=lambda d: d.letter)
+    unmounted = ejector.get_unmounted_usb_drives()
+    lines = [
+        f"{d.letter + ':':<6} {d.label:<24} {d.filesystem:<6} {d.get_free_gb():>9} livres de {d.get_size_gb()}"
+        for d in devices
+    ] + [f"{'Disk ' + str(d.disk_index):<6} {d.label:<24} (não montado) {d.get_size_gb()}" for d in unmounted]
+    _emit(args, {"devices": [_device_dict(d) for d in devices + unmounted]},
+          lines or ["Nenhum dispositivo USB"])
+    return EXIT_OK
+
+
+def _eject(args, ejector, names: List[str], usb_names: Set[str]) -> int:
+    if not names:
+        _emit(args, {"results": {}}, ["Nenhum dispositivo USB"])
+        return EXIT_NOT_FOUND
+    mode = "auto" if args.auto else ("safe" if args.safe else "fast")
+    # Só unidades USB enumeradas chegam ao backend (nunca o volume do sistema)
+    found = [n for n in names if n in usb_names]
+    results = ejector.eject_drives(found, mode=mode) if found else {}
+    data = {}
+    for name in names:
+        ok, msg, procs = results.get(name, (False, "Não encontrado", []))
+        data[name] = {"ok": ok, "message": msg, "processes": [_process_dict(p) for p in procs]}
+    lines = [r["message"] if r["ok"] else f"✗ {name}: {r['message']}" for name, r in data.items()]
+    _emit(args, {"results": data}, lines)
+    if all(r["ok"] for r in data.values()):
+        return EXIT_OK
+    if any(r["processes"] or r["message"].startswith("Em uso") for r in data.values()):
+        return EXIT_LOCKED
+    if any(r["message"] in ("Inacessível", "Não encontrado") for r in data.values()):
+        return EXIT_NOT_FOUND
+    return EXIT_ERROR
+
+
+def cmd_eject(args, ejector) -> int:
+    usb_names = {d.letter for d in ejector.get_removable_drives()}
+    return _eject(args, ejector, [_normalize(n) for n in args.eject], usb_names)
+
+
+def cmd_eject_all(args, ejector) -> int:
+    letters = [d.letter for d in ejector.get_removable_drives()]
+    return _eject(args, ejector, letters, set(letters))
+
+
+def cmd_locks(args, ejector) -> int:
+    name = _normalize(args.locks)
+    procs = ejector.find_locking_processes(name)
+    lines = [f"{p.pid:>7} {p.name:<24} {', '.join(p.files[:3])}" for p in procs]
+    _emit(args, {"drive": name, "processes": [_process_dict(p) for p in procs]},
+          lines or [f"✓ {name}: nenhum processo bloqueando"])
+    return EXIT_LOCKED if procs else EXIT_OK
+
+
+def cmd_mount(args, ejector) -> int:
+    if not hasattr(ejector, "mount_drive"):
+        _emit(args, {"ok": False, "message": "Montagem não suportada nesta plataforma"},
+              ["✗ Montagem não suportada nesta plataforma"])
+        return EXIT_ERROR
+    device = next((d for d in ejector.get_unmounted_usb_drives() if d.disk_index == args.mount), None)
+    if device is None:
+        _emit(args, {"ok": False, "message": f"Disco {args.mount} não encontrado"},
+              [f"✗ Disco {args.mount} não encontrado entre os USB não montados"])
+        return EXIT_NOT_FOUND
+    ok, msg = ejector.mount_drive(device)
+    _emit(args, {"ok": ok, "message": msg}, [f"{'✓' if ok else '✗'} {msg}"])
+    return EXIT_OK if ok else EXIT_ERROR
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    try:
+        args = _parser().parse_args(argv)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_USAGE
+
+    ejector = _ejector(args)
+    import usb_ejector
+    usb_ejector.logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    if args.list:
+        code = cmd_list(args, ejector)
+    elif args.eject:
+        code = cmd_eject(args, ejector)
+    elif args.eject_all:
+        code = cmd_eject_all(args, ejector)
+    elif args.locks:
+        code = cmd_locks(args, ejector)
+    else:
+        code = cmd_mount(args, ejector)
+
+    usb_ejector.logger.info(f"⏱ CLI: {(time.perf_counter() - _started) * 1000:.1f}ms")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1576 @@
+"""
+USB Safe Ejector Pro - Interface gráfica
+Janela CustomTkinter sobre os serviços de usb_ejector (detecção, ejeção, montagem).
+"""
+
+from usb_ejector import (
+    USBEjector, USBDevice, ProcessInfo, USBDeviceMonitor, logger,
+    startup_report, enable_file_logging, EJECT_MODES, EJECT_MODE_NAMES, ProgressAnimator,
+)
+
+startup_report.mark("import usb_ejector")
+
+import customtkinter as ctk
+from usage_chart import ChartImageCache, UsageChart, CHART_SIZE
+import threading
+import time
+import sys
+import os
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Optional, Set, Tuple
+
+startup_report.mark("import customtkinter")
+
+
+_messagebox_cls = None
+
+
+def CTkMessagebox(*args, **kwargs):
+    """CTkMessagebox importado só quando a primeira caixa de diálogo é aberta"""
+    global _messagebox_cls
+    if _messagebox_cls is None:
+        start = time.perf_counter()
+        from CTkMessagebox import CTkMessagebox as _messagebox_cls
+        startup_report.record_import("CTkMessagebox", time.perf_counter() - start)
+    return _messagebox_cls(*args, **kwargs)
+
+
+# =========================
+# DESIGN SYSTEM PREMIUM
+# =========================
+
+class DesignSystem:
+    """Design System Windows 11"""
+    
+    class Colors:
+        class Light:
+            BG_PRIMARY = "#ffffff"
+            BG_SECONDARY = "#f8f8f8"
+            BG_TERTIARY = "#ececec"
+            BORDER = "#e0e0e0"
+            BORDER_FOCUS = "#d0d0d0"
+            ACTION_PRIMARY = "#0067c0"
+            ACTION_DANGER = "#d32f2f"
+            ACTION_WARNING = "#f9a825"
+            TEXT_PRIMARY = "#1a1a1a"
+            TEXT_SECONDARY = "#666666"
+            TEXT_TERTIARY = "#999999"
+            PROGRESS_BG = "#e8e8e8"
+            PROGRESS_FILL = "#0067c0"
+            SPACE_OK = "#0067c0"
+            SPACE_WARNING = "#f9a825"
+            SPACE_CRITICAL = "#d32f2f"
+            SPACE_FREE = "#e8e8e8"
+        
+        class Dark:
+            BG_PRIMARY = "#0f0f0f"
+            BG_SECONDARY = "#1a1a1a"
+            BG_TERTIARY = "#252525"
+            BORDER = "#2a2a2a"
+            BORDER_FOCUS = "#3a3a3a"
+            ACTION_PRIMARY = "#1e88e5"
+            ACTION_DANGER = "#e53935"
+            ACTION_WARNING = "#ffa726"
+            TEXT_PRIMARY = "#ffffff"
+            TEXT_SECONDARY = "#b0b0b0"
+            TEXT_TERTIARY = "#808080"
+            PROGRESS_BG = "#2a2a2a"
+            PROGRESS_FILL = "#1e88e5"
+            SPACE_OK = "#1e88e5"
+            SPACE_WARNING = "#ffa726"
+            SPACE_CRITICAL = "#e53935"
+            SPACE_FREE = "#2a2a2a"
+    
+    SPACE_XS = 4
+    SPACE_SM = 6
+    SPACE_MD = 8
+    SPACE_LG = 12
+    SPACE_XL = 16
+    RADIUS_SM = 4
+    RADIUS_MD = 6
+    RADIUS_LG = 8
+    RADIUS_FULL = 999
+    
+    @staticmethod
+    def get_fonts():
+        return {
+            'title': ctk.CTkFont(family="Segoe UI", size=11, weight="bold"),
+            'body': ctk.CTkFont(family="Segoe UI", size=10),
+            'small': ctk.CTkFont(family="Segoe UI", size=9),
+            'micro': ctk.CTkFont(family="Segoe UI", size=8),
+            'icon': ctk.CTkFont(family="Segoe UI", size=14, weight="bold"),
+            'icon_small': ctk.CTkFont(family="Segoe UI", size=12),
+        }
+    
+    ANIM_FAST = 150
+    ANIM_NORMAL = 250
+    ANIM_SLOW = 350
+
+
+# =========================
+# UI COMPONENTS
+# =========================
+
+class ThemeStyler:
+    """Cores dos widgets por papel do DesignSystem.Colors; apply() recolore no lugar"""
+
+    def __init__(self):
+        self._entries: List[Tuple[object, Dict[str, object]]] = []
+
+    @staticmethod
+    def resolve(style: Dict[str, object], theme) -> Dict[str, str]:
+        """Papel ("BG_SECONDARY") ou função do tema → cor de cada opção"""
+        return {
+            option: role(theme) if callable(role) else getattr(theme, role)
+            for option, role in style.items()
+        }
+
+    def create(self, cls, theme, *args, style: Dict[str, object], **kwargs):
+        """Criar o widget já com as cores do tema e registrá-lo"""
+        widget = cls(*args, **kwargs, **self.resolve(style, theme))
+        self._entries.append((widget, style))
+        return widget
+
+    def register(self, widget, **style):
+        self._entries.append((widget, style))
+        return widget
+
+    def apply(self, theme) -> int:
+        """configure() das cores em todos os widgets vivos; devolve quantos foram recoloridos"""
+        alive = []
+        for widget, style in self._entries:
+            try:
+                widget.configure(**self.resolve(style, theme))
+            except Exception:
+                continue  # Widget destruído
+            alive.append((widget, style))
+        self._entries = alive
+        return len(alive)
+
+
+class SpaceCanvas(ctk.CTkCanvas):
+    """Gráfico circular (anel em cache por percentual/cor/tema, atualizado no lugar)"""
+    
+    def __init__(self, master, device: USBDevice, theme, **kwargs):
+        super().__init__(
+            master, width=CHART_SIZE, height=CHART_SIZE,
+            bg=theme.BG_SECONDARY, highlightthickness=0, **kwargs
+        )
+        self.device = device
+        self.theme = theme
+        self.chart = UsageChart(self, ChartImageCache.shared())
+        self.draw_chart()
+    
+    def set_device(self, device: USBDevice, theme):
+        """Redesenhar só quando uso, cor ou tema mudarem"""
+        self.device = device
+        if theme is not self.theme:
+            self.theme = theme
+            self.configure(bg=theme.BG_SECONDARY)
+        self.draw_chart()
+    
+    def draw_chart(self) -> bool:
+        return self.chart.render(
+            self.device.get_usage_percent(), self.device.get_usage_color(self.theme), self.theme
+        )
+
+
+class BaseCard:
+    """Card reconciliável: cria widgets uma vez e aplica só o que mudou"""
+
+    ROW_HEIGHT = 58  # Altura reservada na lista virtual (sem o espaçamento)
+
+    def __init__(self, gui, parent, device: USBDevice):
+        self.gui = gui
+        self.device = device
+        self.widgets_created = 0
+        self._applied: Dict[Tuple[int, str], object] = {}
+        self.styles = ThemeStyler()
+        self.container = self._widget(ctk.CTkFrame, parent, fg_color="transparent")
+        self.build()
+        self.update(device)
+
+    def _widget(self, cls, *args, style: Optional[Dict[str, object]] = None, **kwargs):
+        self.widgets_created += 1
+        if style:
+            return self.styles.create(cls, self.gui.theme, *args, style=style, **kwargs)
+        return cls(*args, **kwargs)
+
+    def _set(self, widget, **options):
+        """configure() apenas das opções que mudaram"""
+        changed = {}
+        for name, value in options.items():
+            key = (id(widget), name)
+            if self._applied.get(key, self) != value:
+                self._applied[key] = value
+                changed[name] = value
+        if changed:
+            widget.configure(**changed)
+
+    @staticmethod
+    def _short_label(label: str) -> str:
+        return label[:16] if len(label) <= 16 else label[:13] + "..."
+
+    def build(self):
+        raise NotImplementedError
+
+    def update(self, device: USBDevice):
+        raise NotImplementedError
+
+    def _bind_progress(self, letter: str, bar, container):
+        """Registrar a barra deste card para update_progress/_apply_progress"""
+        self.gui.progress_bars[letter] = bar
+        self.gui.progress_containers[letter] = container
+
+    def _release_progress(self, letter: str, bar):
+        """Card reciclado para outra unidade: a barra deixa de pertencer à letra antiga"""
+        if self.gui.progress_bars.get(letter) is bar:
+            self.gui.progress_bars.pop(letter, None)
+            self.gui.progress_containers.pop(letter, None)
+
+    def apply_theme(self) -> int:
+        """Recolorir os widgets do card e reaplicar as cores que dependem do estado"""
+        restyled = self.styles.apply(self.gui.theme)
+        self._applied.clear()
+        self.update(self.device)
+        return restyled
+
+    def destroy(self):
+        self.container.destroy()
+
+
+class DeviceCard(BaseCard):
+    """🎨 CARD USB MONTADO PREMIUM"""
+
+    ROW_HEIGHT = 62  # Card + barra de progresso
+
+    def build(self):
+        gui, theme = self.gui, self.gui.theme
+        self.hovered = False
+        self.progress_visible = False
+        
+        self.card = self._widget(
+            ctk.CTkFrame, self.container, style={"fg_color": "BG_SECONDARY"},
+            corner_radius=8, border_width=1, border_color=theme.BORDER, height=58
+        )
+        self.card.pack(fill="x")
+        self.card.pack_propagate(False)
+        
+        self.content = self._widget(ctk.CTkFrame, self.card, fg_color="transparent")
+        self.content.pack(fill="both", expand=True, padx=DesignSystem.SPACE_SM, pady=DesignSystem.SPACE_SM)
+        
+        # Ícone outline
+        icon_frame = self._widget(
+            ctk.CTkFrame, self.content, fg_color="transparent",
+            border_width=2, style={"border_color": "ACTION_PRIMARY"},
+            corner_radius=999, width=36, height=36
+        )
+        icon_frame.pack(side="left")
+        icon_frame.pack_propagate(False)
+        
+        self.icon_lbl = self._widget(
+            ctk.CTkLabel, icon_frame, text="",
+            font=gui.fonts['icon'], text_color=theme.ACTION_PRIMARY
+        )
+        self.icon_lbl.place(relx=0.5, rely=0.5, anchor="center")
+        
+        # Info
+        self.info = self._widget(ctk.CTkFrame, self.content, fg_color="transparent")
+        self.info.pack(side="left", fill="both", expand=True, padx=(DesignSystem.SPACE_SM, 0))
+        
+        self.name_lbl = self._widget(
+            ctk.CTkLabel, self.info, text="",
+            font=gui.fonts['body'], text_color=theme.TEXT_PRIMARY, anchor="w"
+        )
+        self.name_lbl.pack(fill="x", anchor="w")
+        
+        self.meta_lbl = self._widget(
+            ctk.CTkLabel, self.info, text="",
+            font=gui.fonts['micro'], text_color=theme.TEXT_TERTIARY, anchor="w"
+        )
+        self.meta_lbl.pack(fill="x", anchor="w")
+        
+        # Gráfico
+        self.chart = self._widget(SpaceCanvas, self.content, self.device, theme)
+        self.chart.pack(side="right", padx=(4, 0))
+        
+        # Botão ejetar
+        self.eject_btn = self._widget(
+            ctk.CTkButton, self.content, text="⏏",
+            width=32, height=32, corner_radius=6, fg_color="transparent", border_width=1,
+            style={"hover_color": "BG_TERTIARY", "border_color": "BORDER", "text_color": "TEXT_SECONDARY"},
+            font=gui.fonts['icon'], command=lambda: gui.eject_device(self.device)
+        )
+        self.eject_btn.pack(side="right", padx=(4, 0))
+        
+        # 🔥 Barra progresso SEMPRE CRIADA (exibida só durante a ejeção)
+        self.prog_container = self._widget(
+            ctk.CTkFrame, self.container, style={"fg_color": "PROGRESS_BG"},
+            height=2, corner_radius=1
+        )
+        self.prog_container.pack_propagate(False)
+        self.prog_fill = self._widget(
+            ctk.CTkFrame, self.prog_container, style={"fg_color": "PROGRESS_FILL"},
+            height=2, corner_radius=1
+        )
+        self.prog_fill.place(relx=0, rely=0, relwidth=0, relheight=1)
+        
+        # Micro-interações
+        def on_double_click(e):
+            if self.device.letter not in gui.ejecting_drives:
+                gui.eject_device(self.device)
+        
+        def on_enter(e):
+            self.hovered = True
+            if self.device.letter not in gui.ejecting_drives:
+                self._set(
+                    self.card, fg_color=gui.theme.BG_TERTIARY,
+                    border_color=gui.theme.BORDER_FOCUS, cursor="hand2"
+                )
+                self._set(self.meta_lbl, text=self.meta_text_hover)
+            else:
+                self._set(self.card, cursor="watch")
+        
+        def on_leave(e):
+            self.hovered = False
+            if self.device.letter not in gui.ejecting_drives:
+                self._set(
+                    self.card, fg_color=gui.theme.BG_SECONDARY,
+                    border_color=self._rest_border(), cursor=""
+                )
+                self._set(self.meta_lbl, text=self.meta_text_normal)
+        
+        def on_select(e):
+            gui.toggle_selection(self.device)
+        
+        for w in [self.card, self.content, self.info, self.name_lbl]:
+            w.bind("<Double-Button-1>", on_double_click)
+            w.bind("<Control-Button-1>", on_select)
+            w.bind("<Button-3>", lambda e: gui.show_context_menu(self.device, e.x_root, e.y_root))
+        
+        self.card.bind("<Enter>", on_enter)
+        self.card.bind("<Leave>", on_leave)
+
+    def _rest_border(self) -> str:
+        """Borda fora do hover (destacada quando o card está selecionado)"""
+        theme = self.gui.theme
+        return theme.ACTION_PRIMARY if self.device.letter in self.gui.selected_letters else theme.BORDER
+
+    def update(self, device: USBDevice):
+        gui, theme = self.gui, self.gui.theme
+        if device.letter != self.device.letter:
+            self._release_progress(self.device.letter, self.prog_fill)
+        self.device = device
+        letter = device.letter
+        is_ejecting = letter in gui.ejecting_drives
+        if not self.hovered:
+            self._set(self.card, border_color=self._rest_border())
+        
+        # Informação progressiva
+        usage = device.get_usage_percent()
+        self.meta_text_normal = f"{letter}: • {device.get_size_gb()}"
+        self.meta_text_hover = f"{device.get_free_gb()} livre • {usage}% usado"
+        show_hover = self.hovered and not is_ejecting
+        
+        if device.stale:
+            self.meta_text_normal += " • ⟳"
+            self.meta_text_hover = "Verificando..."
+        elif is_ejecting and gui.eject_status.get(letter):
+            self.meta_text_normal = gui.eject_status[letter]
+        
+        self._set(self.icon_lbl, text=letter,
+                  text_color=theme.TEXT_TERTIARY if device.stale else theme.ACTION_PRIMARY)
+        self._set(self.name_lbl, text=self._short_label(device.label),
+                  text_color=theme.TEXT_SECONDARY if device.stale else theme.TEXT_PRIMARY)
+        self._set(
+            self.meta_lbl,
+            text=self.meta_text_hover if show_hover else self.meta_text_normal,
+            text_color=device.get_usage_color(theme) if usage >= 80 and not device.stale else theme.TEXT_TERTIARY
+        )
+        self.chart.set_device(device, theme)
+        self._set(self.eject_btn, text="⏳" if is_ejecting else "⏏",
+                  state="disabled" if device.stale else "normal")
+        
+        if is_ejecting:
+            if not self.progress_visible:
+                self.prog_container.pack(fill="x", pady=(2, 0))
+                self.progress_visible = True
+            self.prog_fill.place_configure(relwidth=gui.progress_anim.value(letter) / 100)
+            # Referências para update_progress
+            self._bind_progress(letter, self.prog_fill, self.prog_container)
+        elif self.progress_visible:
+            self.prog_container.pack_forget()
+            self.progress_visible = False
+            self._release_progress(letter, self.prog_fill)
+
+
+class UnmountedCard(BaseCard):
+    """Card USB não montado"""
+
+    ROW_HEIGHT = 52
+
+    def build(self):
+        gui = self.gui
+        
+        card = self._widget(
+            ctk.CTkFrame, self.container, style={"fg_color": "BG_SECONDARY", "border_color": "BORDER"},
+            corner_radius=8, border_width=1, height=52
+        )
+        card.pack(fill="x")
+        card.pack_propagate(False)
+        
+        content = self._widget(ctk.CTkFrame, card, fg_color="transparent")
+        content.pack(fill="both", expand=True, padx=DesignSystem.SPACE_SM, pady=DesignSystem.SPACE_SM)
+        
+        icon = self._widget(
+            ctk.CTkFrame, content, fg_color="transparent",
+            border_width=2, style={"border_color": "TEXT_TERTIARY"},
+            corner_radius=999, width=36, height=36
+        )
+        icon.pack(side="left")
+        icon.pack_propagate(False)
+        
+        self._widget(
+            ctk.CTkLabel, icon, text="?", font=gui.fonts['icon'],
+            style={"text_color": "TEXT_TERTIARY"}
+        ).place(relx=0.5, rely=0.5, anchor="center")
+        
+        info = self._widget(ctk.CTkFrame, content, fg_color="transparent")
+        info.pack(side="left", fill="both", expand=True, padx=(DesignSystem.SPACE_SM, 0))
+        
+        self.name_lbl = self._widget(
+            ctk.CTkLabel, info, text="",
+            font=gui.fonts['body'], style={"text_color": "TEXT_SECONDARY"}, anchor="w"
+        )
+        self.name_lbl.pack(fill="x", anchor="w")
+        
+        self.size_lbl = self._widget(
+            ctk.CTkLabel, info, text="",
+            font=gui.fonts['micro'], style={"text_color": "TEXT_TERTIARY"}, anchor="w"
+        )
+        self.size_lbl.pack(fill="x", anchor="w")
+        
+        self.mount_btn = self._widget(
+            ctk.CTkButton, content, text="📁", width=32, height=32, corner_radius=6,
+            style={"fg_color": "ACTION_PRIMARY", "hover_color": "ACTION_PRIMARY"},
+            font=gui.fonts['icon'], text_color="#ffffff",
+            command=lambda: gui.mount_device(self.device)
+        )
+        self.mount_btn.pack(side="right")
+
+    def update(self, device: USBDevice):
+        self.device = device
+        size_text = f"Não montado • {device.get_size_gb()}" if device.total_size > 0 else "Não montado"
+        if device.stale:
+            size_text += " • ⟳"
+        self._set(self.name_lbl, text=self._short_label(device.label))
+        self._set(self.size_lbl, text=size_text)
+        self._set(self.mount_btn, state="disabled" if device.stale else "normal")
+
+
+class CompactRow(BaseCard):
+    """Linha compacta (hubs e torres duplicadoras): letra, nome, uso e ação numa linha"""
+
+    ROW_HEIGHT = 26
+
+    def build(self):
+        gui = self.gui
+        self.progress_visible = False
+        
+        self.row = self._widget(
+            ctk.CTkFrame, self.container, style={"fg_color": "BG_SECONDARY"},
+            corner_radius=6, border_width=1, height=self.ROW_HEIGHT
+        )
+        self.row.pack(fill="x")
+        self.row.pack_propagate(False)
+        
+        self.letter_lbl = self._widget(ctk.CTkLabel, self.row, text="", width=24, font=gui.fonts['body'])
+        self.letter_lbl.pack(side="left", padx=(6, 2))
+        
+        self.action_btn = self._widget(
+            ctk.CTkButton, self.row, text="", width=22, height=20, corner_radius=4,
+            fg_color="transparent", font=gui.fonts['icon_small'],
+            style={"hover_color": "BG_TERTIARY", "text_color": "TEXT_SECONDARY"},
+            command=self._action
+        )
+        self.action_btn.pack(side="right", padx=(2, 3))
+        
+        self.usage_lbl = self._widget(ctk.CTkLabel, self.row, text="", width=34, font=gui.fonts['micro'])
+        self.usage_lbl.pack(side="right")
+        
+        self.name_lbl = self._widget(
+            ctk.CTkLabel, self.row, text="", font=gui.fonts['small'],
+            style={"text_color": "TEXT_PRIMARY"}, anchor="w"
+        )
+        self.name_lbl.pack(side="left", fill="x", expand=True)
+        
+        # Barra de progresso na borda inferior (exibida só durante a ejeção)
+        self.prog_fill = self._widget(
+            ctk.CTkFrame, self.row, style={"fg_color": "PROGRESS_FILL"}, height=2, corner_radius=0
+        )
+        
+        def on_double_click(e):
+            if self.device.letter not in gui.ejecting_drives:
+                self._action()
+        
+        for w in [self.row, self.letter_lbl, self.name_lbl, self.usage_lbl]:
+            w.bind("<Double-Button-1>", on_double_click)
+            w.bind("<Control-Button-1>", lambda e: gui.toggle_selection(self.device))
+            w.bind("<Button-3>", lambda e: gui.show_context_menu(self.device, e.x_root, e.y_root)
+                   if self.device.is_mounted else None)
+
+    def _action(self):
+        if self.device.is_mounted:
+            self.gui.eject_device(self.device)
+        else:
+            self.gui.mount_device(self.device)
+
+    def update(self, device: USBDevice):
+        gui, theme = self.gui, self.gui.theme
+        if device.letter != self.device.letter:
+            self._release_progress(self.device.letter, self.prog_fill)
+        self.device = device
+        letter, mounted, stale = device.letter, device.is_mounted, device.stale
+        is_ejecting = mounted and letter in gui.ejecting_drives
+        usage = device.get_usage_percent()
+        
+        if is_ejecting and gui.eject_status.get(letter):
+            name = gui.eject_status[letter]
+        else:
+            name = device.label if mounted else f"{device.label} (não montado)"
+        if stale:
+            usage_text = "⟳"
+        elif mounted:
+            usage_text = f"{usage}%"
+        else:
+            usage_text = device.get_size_gb() if device.total_size > 0 else "—"
+        
+        selected = mounted and letter in gui.selected_letters
+        self._set(self.row, border_color=theme.ACTION_PRIMARY if selected else theme.BORDER)
+        self._set(self.letter_lbl, text=f"{letter}:" if mounted else "?",
+                  text_color=theme.ACTION_PRIMARY if mounted and not stale else theme.TEXT_TERTIARY)
+        self._set(self.name_lbl, text=name[:28] if len(name) <= 28 else name[:25] + "...")
+        self._set(self.usage_lbl, text=usage_text,
+                  text_color=device.get_usage_color(theme) if mounted and usage >= 80 and not stale
+                  else theme.TEXT_TERTIARY)
+        self._set(self.action_btn, text="⏳" if is_ejecting else ("⏏" if mounted else "📁"),
+                  state="disabled" if stale else "normal")
+        
+        if is_ejecting:
+            self.prog_fill.place(relx=0, rely=1, anchor="sw", relwidth=gui.progress_anim.value(letter) / 100)
+            self.progress_visible = True
+            self._bind_progress(letter, self.prog_fill, self.row)
+        elif self.progress_visible:
+            self.prog_fill.place_forget()
+            self.progress_visible = False
+            self._release_progress(letter, self.prog_fill)
+
+
+class VirtualDeviceList:
+    """Lista virtualizada: widgets só para as linhas visíveis (+ overscan), reciclados por tipo de card"""
+
+    GAP = 6  # Espaço entre linhas
+    SCROLL_UNIT = 30  # px por passo da roda/seta
+    DEFAULT_HEIGHT = 260  # Altura assumida antes do primeiro <Configure>
+
+    def __init__(self, gui, parent, overscan: int = 2):
+        self.gui = gui
+        self.overscan = overscan
+        self.compact = False
+        self.items: List[USBDevice] = []
+        self.offsets: List[int] = []  # y de cada linha no conteúdo
+        self.content_height = 0
+        self.top = 0  # Deslocamento da rolagem em px
+        self.visible: Dict[str, BaseCard] = {}  # Cards em uso por USBDevice.key
+        self.pools: Dict[type, List[BaseCard]] = {}  # Cards livres para reciclar
+        self.widgets_created = 0
+        
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.scrollbar = gui._styled(
+            ctk.CTkScrollbar, self.frame, command=self.on_scrollbar,
+            style={"button_color": "BG_TERTIARY", "button_hover_color": "BORDER_FOCUS"}
+        )
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport = gui._styled(ctk.CTkFrame, self.frame, style={"fg_color": "BG_PRIMARY"}, corner_radius=0)
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", lambda e: self.layout())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            gui.root.bind_all(sequence, self._on_wheel, add="+")
+
+    @staticmethod
+    def visible_range(offsets: List[int], top: int, height: int, overscan: int) -> Tuple[int, int]:
+        """Índices [first, last) das linhas que cruzam a janela [top, top + height), com overscan"""
+        first = max(bisect_right(offsets, top) - 1 - overscan, 0)
+        last = min(bisect_left(offsets, top + height) + overscan, len(offsets))
+        return first, last
+
+    def card_class(self, device: USBDevice) -> type:
+        if self.compact:
+            return CompactRow
+        return DeviceCard if device.is_mounted else UnmountedCard
+
+    def all_cards(self) -> List[BaseCard]:
+        """Cards visíveis e livres (todos recebem a troca de tema)"""
+        return list(self.visible.values()) + [card for pool in self.pools.values() for card in pool]
+
+    def _height(self) -> int:
+        height = self.viewport.winfo_height()
+        return height if height > 1 else self.DEFAULT_HEIGHT
+
+    def set_items(self, devices: List[USBDevice]) -> Dict[str, int]:
+        """Nova lista (já filtrada): recalcula as posições e reconcilia só as linhas visíveis"""
+        self.items = devices
+        self.offsets = []
+        y = 0
+        for device in devices:
+            self.offsets.append(y)
+            y += self.card_class(device).ROW_HEIGHT + self.GAP
+        self.content_height = y
+        self.top = min(self.top, max(self.content_height - self._height(), 0))
+        return self.layout(refresh=True)
+
+    def layout(self, refresh: bool = False) -> Dict[str, int]:
+        """Posicionar as linhas visíveis; as que saem da janela voltam ao pool"""
+        height = self._height()
+        first, last = self.visible_range(self.offsets, self.top, height, self.overscan)
+        wanted = {self.items[i].key: i for i in range(first, last)}
+        stats = {"created": 0, "recycled": 0, "updated": 0, "released": 0, "widgets_created": 0}
+        
+        for key in list(self.visible):
+            card = self.visible[key]
+            index = wanted.get(key)
+            if index is None or type(card) is not self.card_class(self.items[index]):
+                del self.visible[key]
+                card.container.place_forget()
+                self.pools.setdefault(type(card), []).append(card)
+                stats["released"] += 1
+        
+        for key, index in wanted.items():
+            device = self.items[index]
+            card = self.visible.get(key)
+            if card is None:
+                cls = self.card_class(device)
+                pool = self.pools.get(cls)
+                if pool:
+                    card = pool.pop()
+                    card.update(device)
+                    stats["recycled"] += 1
+                else:
+                    card = cls(self.gui, self.viewport, device)
+                    stats["created"] += 1
+                    stats["widgets_created"] += card.widgets_created
+                self.visible[key] = card
+            elif refresh:
+                card.update(device)
+                stats["updated"] += 1
+            card.container.place(x=0, y=self.offsets[index] - self.top, relwidth=1)
+        
+        self.widgets_created += stats["widgets_created"]
+        if self.content_height > height:
+            self.scrollbar.set(self.top / self.content_height, (self.top + height) / self.content_height)
+        else:
+            self.scrollbar.set(0, 1)
+        return stats
+
+    def scroll_to(self, top: int):
+        top = int(min(max(top, 0), max(self.content_height - self._height(), 0)))
+        if top != self.top:
+            self.top = top
+            self.layout()
+
+    def on_scrollbar(self, action: str, *args):
+        """command do CTkScrollbar: ("moveto", fração) ou ("scroll", n, "units"/"pages")"""
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * self.content_height)
+        elif action == "scroll":
+            step = self._height() if args[1] == "pages" else self.SCROLL_UNIT
+            self.scroll_to(self.top + int(args[0]) * step)
+
+    def _on_wheel(self, event):
+        if not str(event.widget).startswith(str(self.viewport)):
+            return
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -1 if event.delta > 0 else 1
+        self.scroll_to(self.top + steps * self.SCROLL_UNIT)
+
+
+# =========================
+# UI SCREENS
+# =========================
+
+class PremiumUSBEjectorGUI:
+    """Interface Premium COMPLETA"""
+
+    def __init__(self, show_startup_report: bool = False):
+        self.show_startup_report = show_startup_report
+        self.root = ctk.CTk()
+        self.root.overrideredirect(True)
+        
+        w, h = 290, 320
+        sw = self.root.winfo_screenwidth()
+        sh = self.root.winfo_screenheight()
+        # Posição EXATA: canto inferior direito, encostado nas bordas
+        x = sw - w  # Sem margem - encostado na borda direita
+        y = sh - h - 40  # 40px acima (altura da barra de tarefas do Windows)
+        self.root.geometry(f"{w}x{h}+{x}+{y}")
+        self.root.resizable(False, False)
+        self.root.attributes("-topmost", True)
+
+        self.is_dark = True  # Modo escuro inicial
+        self.theme = DesignSystem.Colors.Dark  # Tema escuro
+        self.fonts = DesignSystem.get_fonts()
+        ctk.set_appearance_mode("dark")  # Aparência escura
+
+        self.devices: List[USBDevice] = []
+        self.usb_monitor = USBDeviceMonitor(callback=self.on_usb_change)
+        self.ejecting_drives: Set[str] = set()
+        self.eject_progress: Dict[str, int] = {}
+        self.eject_status: Dict[str, str] = {}  # Texto de espera exibido no card (ex.: lock)
+        self.progress_bars: Dict[str, ctk.CTkFrame] = {}
+        self.progress_containers: Dict[str, ctk.CTkFrame] = {}  # 🔥 NOVO: containers
+        # Todas as barras animadas por um único tick a 30 FPS (sem root.update())
+        self.progress_anim = ProgressAnimator(self.root.after, self._apply_progress, fps=30)
+        self.device_list: Optional[VirtualDeviceList] = None  # Criada em setup_ui
+        self.empty_state: Optional[ctk.CTkFrame] = None
+        self.filter_text = ""  # Filtro por letra/nome (digitar na janela)
+        self.compact_mode: Optional[bool] = None  # None: automático pelo número de dispositivos
+        self.compact_threshold = 8  # Acima disso, linhas compactas
+        self.filter_bar_threshold = 6  # Acima disso, a barra de filtro fica sempre visível
+        self.render_stats: Dict[str, float] = {}
+        self.unmounted_devices: List[USBDevice] = []
+        self.refresh_btn: Optional[ctk.CTkButton] = None
+        self._refresh_generation = 0  # Incrementado a cada pedido de refresh
+        self._refresh_running = False
+        self._refresh_pending = False
+        self.last_click_time: Dict[str, float] = {}
+        self.selected_letters: Set[str] = set()  # Ctrl+clique para ejeção em lote
+        self.show_unmounted = False
+        self.use_lock_index = True  # Índice de handles em segundo plano (bloqueios instantâneos)
+        self.eject_mode = "fast"  # 🚀 Modo rápido por padrão ("fast", "safe" ou "auto")
+        self.mode_btn: Optional[ctk.CTkButton] = None
+        self.theme_btn: Optional[ctk.CTkButton] = None
+        self.styles = ThemeStyler()  # Cores da janela; a troca de tema só recolore
+        self.io_observe_interval = 2000  # ms entre leituras de I/O no modo auto
+        self._observe_after_id: Optional[str] = None  # Próxima leitura agendada (uma cadeia só)
+        
+        
+        self.drag_x = 0
+        self.drag_y = 0
+
+        self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        startup_report.mark("janela (shell)")
+        # Última lista conhecida (estilo "stale") até a enumeração real terminar
+        cached = USBEjector.device_cache.load()
+        self.devices = [d for d in cached if d.is_mounted]
+        self.unmounted_devices = [d for d in cached if not d.is_mounted]
+        self.rerender_devices()
+        startup_report.mark(f"cache de dispositivos ({len(cached)})")
+        # Enumeração, monitor e log em arquivo só depois que a janela aparece
+        self._background_started = False
+        self.root.bind("<Map>", self._on_first_map, add="+")
+
+    def _on_first_map(self, event):
+        if self._background_started or event.widget is not self.root:
+            return
+        self._background_started = True
+        self.root.after_idle(self._start_background)
+
+    def _start_background(self):
+        startup_report.mark("primeira pintura")
+        first_paint_ms = startup_report.elapsed_ms()
+        enable_file_logging()
+        self.refresh_devices()
+        self.usb_monitor.start()
+        if self.use_lock_index:
+            USBEjector.enable_lock_index()
+        startup_report.mark("serviços em segundo plano")
+        logger.info(f"⏱ Primeira pintura em {first_paint_ms:.0f}ms")
+        if self.show_startup_report:
+            print(startup_report.format())
+
+    def on_closing(self):
+        if self.progress_anim.frames:
+            logger.debug(f"🎞 Animação de progresso: {self.progress_anim.stats()}")
+        if USBEjector.eject_metrics.records:
+            try:
+                USBEjector.eject_metrics.dump("usb_ejector_metrics.json")
+            except Exception as e:
+                logger.debug(f"Erro salvar métricas: {e}")
+        self._cancel_observe_io()
+        self.usb_monitor.stop()
+        USBEjector.disable_lock_index()
+        USBEjector.wmi.release()
+        USBEjector.shutdown_detection()
+        self.root.destroy()
+
+    def on_usb_change(self, added: Optional[Set[str]] = None, removed: Optional[Set[str]] = None):
+        USBEjector.invalidate_drive_snapshot()
+        self.root.after(0, lambda: self._apply_usb_change(added, removed))
+
+    def _apply_usb_change(self, added: Optional[Set[str]], removed: Optional[Set[str]]):
+        """Atualizar só os cards das letras do evento"""
+        if added is None or removed is None or self.show_unmounted or self._refresh_running:
+            self.refresh_devices()
+            return
+        logger.info(f"🔌 Evento USB: +{sorted(added)} -{sorted(removed)}")
+        if removed:
+            self.devices = [d for d in self.devices if d.letter not in removed]
+            self.rerender_devices()
+            if not any(d.stale for d in self.devices):
+                self._persist_devices()
+        if added:
+            self.refresh_letters(added)
+
+    def refresh_letters(self, letters: Set[str]):
+        """Enumerar apenas as letras informadas (em segundo plano)"""
+        generation = self._refresh_generation
+        
+        def _probe():
+            devices: List[USBDevice] = []
+            try:
+                with USBEjector.wmi.thread_scope():
+                    devices = USBEjector.get_devices_for_letters(letters)
+            except Exception as e:
+                logger.error(f"❌ Erro enumeração: {e}")
+            try:
+                self.root.after(0, lambda: self._on_letters_done(generation, letters, devices))
+            except Exception:
+                pass  # Janela já fechada
+        
+        threading.Thread(target=_probe, daemon=True).start()
+
+    def _on_letters_done(self, generation: int, letters: Set[str], devices: List[USBDevice]):
+        if generation != self._refresh_generation:
+            return  # Um refresh completo já cobre essas letras
+        self.devices = [d for d in self.devices if d.letter not in letters] + devices
+        self.rerender_devices()
+        if not any(d.stale for d in self.devices):
+            self._persist_devices()
+
+    def toggle_unmounted(self):
+        """Mostrar/ocultar dispositivos não montados"""
+        self.show_unmounted = not self.show_unmounted
+        logger.info(f"👁 Mostrar não montados: {self.show_unmounted}")
+        self.rerender_devices()
+        if self.show_unmounted:
+            self.refresh_devices()
+
+    def toggle_theme(self):
+        """Alternar tema claro/escuro (só recolore: sem enumerar nem recriar widgets)"""
+        self.is_dark = not self.is_dark
+        self.theme = DesignSystem.Colors.Dark if self.is_dark else DesignSystem.Colors.Light
+        ctk.set_appearance_mode("dark" if self.is_dark else "light")
+        self.apply_theme()
+
+    def apply_theme(self):
+        """Passada de estilo: reaplicar as cores do tema atual nos widgets existentes"""
+        start = time.perf_counter()
+        restyled = self.styles.apply(self.theme)
+        if self.theme_btn is not None:
+            self.theme_btn.configure(text="🌙" if not self.is_dark else "☀")
+        self._set_refreshing(self._refresh_running)
+        for card in self.device_list.all_cards():
+            restyled += card.apply_theme()
+        self.root.update_idletasks()
+        self.render_stats["theme_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.debug(f"🎨 Tema: {restyled} widgets recoloridos em {self.render_stats['theme_ms']}ms")
+
+    MODE_ICONS = {"fast": "⚡", "safe": "🛡", "auto": "🤖"}
+
+    def _mode_color(self) -> str:
+        return self.theme.ACTION_WARNING if self.eject_mode == "safe" else self.theme.ACTION_PRIMARY
+
+    def toggle_eject_mode(self):
+        """⚡ → 🛡 → 🤖: rápido, seguro e automático (pela atividade de I/O do disco)"""
+        self.eject_mode = EJECT_MODES[(EJECT_MODES.index(self.eject_mode) + 1) % len(EJECT_MODES)]
+        logger.info(f"⚡ Modo: {EJECT_MODE_NAMES[self.eject_mode]}")
+        if self.mode_btn is not None:
+            self.mode_btn.configure(text=self.MODE_ICONS[self.eject_mode], fg_color=self._mode_color())
+        if self.eject_mode == "auto":
+            if self._observe_after_id is None:
+                self._observe_io()
+        else:
+            self._cancel_observe_io()
+        self.rerender_devices()
+
+    def _observe_io(self):
+        """Modo auto: leituras periódicas dos contadores (base para "escrita recente")"""
+        self._observe_after_id = None
+        if self.eject_mode != "auto":
+            return
+        threading.Thread(target=USBEjector.io_activity.observe, daemon=True).start()
+        self._observe_after_id = self.root.after(self.io_observe_interval, self._observe_io)
+
+    def _cancel_observe_io(self):
+        if self._observe_after_id is not None:
+            self.root.after_cancel(self._observe_after_id)
+            self._observe_after_id = None
+
+    def start_drag(self, e):
+        self.drag_x = e.x
+        self.drag_y = e.y
+
+    def do_drag(self, e):
+        x = self.root.winfo_x() + e.x - self.drag_x
+        y = self.root.winfo_y() + e.y - self.drag_y
+        self.root.geometry(f"+{x}+{y}")
+
+    def _styled(self, cls, *args, style: Dict[str, object], **kwargs):
+        """Widget da janela com cores por papel (recoloridas em apply_theme)"""
+        return self.styles.create(cls, self.theme, *args, style=style, **kwargs)
+
+    def setup_ui(self):
+        main = self._styled(
+            ctk.CTkFrame, self.root, style={"fg_color": "BG_PRIMARY", "border_color": "BORDER"},
+            corner_radius=8, border_width=1
+        )
+        main.pack(fill="both", expand=True)
+        
+        self.create_titlebar(main)
+        if not USBEjector.is_admin():
+            self.create_admin_banner(main)
+        self.create_devices_container(main)
+
+    def create_titlebar(self, parent):
+        bar = self._styled(
+            ctk.CTkFrame, parent, style={"fg_color": "BG_SECONDARY"},
+            height=32, corner_radius=0
+        )
+        bar.pack(fill="x")
+        bar.pack_propagate(False)
+        bar.bind("<Button-1>", self.start_drag)
+        bar.bind("<B1-Motion>", self.do_drag)
+        
+        title = self._styled(
+            ctk.CTkLabel, bar, text="USB Ejector",
+            font=self.fonts['title'],
+            style={"text_color": "TEXT_PRIMARY"}
+        )
+        title.pack(side="left", padx=DesignSystem.SPACE_LG)
+        title.bind("<Button-1>", self.start_drag)
+        title.bind("<B1-Motion>", self.do_drag)
+        
+        controls = ctk.CTkFrame(bar, fg_color="transparent")
+        controls.pack(side="right", padx=4)
+        
+        self._create_control_btn(
+            controls, "👁" if self.show_unmounted else "👁‍🗨", 
+            self.toggle_unmounted,
+            fg=lambda theme: theme.ACTION_PRIMARY if self.show_unmounted else "transparent"
+        )
+        self.mode_btn = self._create_control_btn(
+            controls, self.MODE_ICONS[self.eject_mode],
+            self.toggle_eject_mode, fg=lambda theme: self._mode_color()
+        )
+        self.theme_btn = self._create_control_btn(controls, "🌙" if not self.is_dark else "☀", self.toggle_theme)
+        self._create_control_btn(controls, "⏏", self.eject_all_devices)
+        self.refresh_btn = self._create_control_btn(controls, "↻", self.refresh_devices)
+        self._set_refreshing(self._refresh_running)
+        self._create_control_btn(controls, "ℹ️", self.show_about, hover="BG_TERTIARY")
+        self._create_control_btn(controls, "✕", self.on_closing, hover="ACTION_DANGER")
+
+    def _create_control_btn(self, parent, text, cmd, fg=None, hover="BG_TERTIARY"):
+        """fg/hover: papel do tema ou função do tema (fundo transparente por padrão)"""
+        style = {"hover_color": hover, "text_color": "TEXT_SECONDARY"}
+        options = {}
+        if fg is not None:
+            style["fg_color"] = fg
+        else:
+            options["fg_color"] = "transparent"
+        btn = self._styled(
+            ctk.CTkButton, parent, text=text, width=24, height=24, corner_radius=4,
+            font=self.fonts['icon_small'], command=cmd, style=style, **options
+        )
+        btn.pack(side="left", padx=2)
+        return btn
+
+    def create_admin_banner(self, parent):
+        banner = self._styled(
+            ctk.CTkFrame, parent, style={"fg_color": "ACTION_WARNING"},
+            height=24, corner_radius=0
+        )
+        banner.pack(fill="x")
+        banner.pack_propagate(False)
+        
+        lbl = ctk.CTkLabel(
+            banner, text="⚠ Execute como Admin",
+            font=self.fonts['small'], text_color="#000000"
+        )
+        lbl.pack(expand=True)
+        
+        for w in [banner, lbl]:
+            w.bind("<Button-1>", lambda e: [USBEjector.run_as_admin(), self.root.quit()])
+            w.configure(cursor="hand2")
+
+    def create_devices_container(self, parent):
+        # Filtro por letra/nome + modo compacto (aparece com muitos dispositivos ou ao digitar)
+        self.filter_bar = ctk.CTkFrame(parent, fg_color="transparent", height=26)
+        self.filter_entry = self._styled(
+            ctk.CTkEntry, self.filter_bar, height=24, corner_radius=4, border_width=1,
+            placeholder_text="🔍 Letra ou nome", font=self.fonts['small'],
+            style={
+                "fg_color": "BG_SECONDARY", "border_color": "BORDER",
+                "text_color": "TEXT_PRIMARY", "placeholder_text_color": "TEXT_TERTIARY",
+            }
+        )
+        self.filter_entry.pack(side="left", fill="x", expand=True)
+        self.filter_entry.bind("<KeyRelease>", self._on_filter_changed)
+        self.filter_entry.bind("<Escape>", lambda e: self.clear_filter())
+        self.compact_btn = self._create_control_btn(self.filter_bar, "☰", self.toggle_compact)
+        self.filter_count = self._styled(
+            ctk.CTkLabel, self.filter_bar, text="", width=40, font=self.fonts['micro'],
+            style={"text_color": "TEXT_TERTIARY"}
+        )
+        self.filter_count.pack(side="right")
+        
+        self.device_list = VirtualDeviceList(self, parent)
+        self.device_list.frame.pack(
+            fill="both", expand=True, 
+            padx=DesignSystem.SPACE_SM, pady=DesignSystem.SPACE_SM
+        )
+        self.root.bind("<Key>", self._on_key, add="+")
+
+    def _on_key(self, event):
+        """Digitar em qualquer lugar da janela começa a filtrar; Esc limpa"""
+        if str(event.widget).startswith(str(self.filter_entry)):
+            return  # A própria caixa trata
+        if event.keysym == "Escape":
+            self.clear_filter()
+        elif event.char and event.char.isprintable() and event.char.strip() and not event.state & 0x4:
+            self._show_filter_bar(True)
+            self.filter_entry.focus_set()
+            self.filter_entry.insert("end", event.char)
+            self._on_filter_changed()
+
+    def _on_filter_changed(self, event=None):
+        text = self.filter_entry.get().strip()
+        if text != self.filter_text:
+            self.filter_text = text
+            self.device_list.scroll_to(0)
+            self.rerender_devices()
+
+    def clear_filter(self):
+        self.filter_entry.delete(0, "end")
+        self.root.focus_set()
+        self._on_filter_changed()
+
+    def _filter_devices(self, devices: List[USBDevice]) -> List[USBDevice]:
+        """Uma letra (ou "E:") filtra pela unidade/início do nome; mais texto, por trecho do nome"""
+        query = self.filter_text.lower().rstrip(":\\")
+        if not query:
+            return devices
+        if len(query) == 1:
+            return [d for d in devices if d.letter.lower() == query or d.label.lower().startswith(query)]
+        return [d for d in devices if d.letter.lower() == query or query in d.label.lower()]
+
+    def _show_filter_bar(self, show: bool):
+        if show and not self.filter_bar.winfo_manager():
+            self.filter_bar.pack(fill="x", padx=DesignSystem.SPACE_SM, pady=(DesignSystem.SPACE_SM, 0),
+                                 before=self.device_list.frame)
+        elif not show and self.filter_bar.winfo_manager():
+            self.filter_bar.pack_forget()
+
+    def _is_compact(self, count: int) -> bool:
+        """Automático (acima de compact_threshold dispositivos) até o usuário escolher"""
+        return count > self.compact_threshold if self.compact_mode is None else self.compact_mode
+
+    def toggle_compact(self):
+        """☰ Alternar entre cards e linhas compactas"""
+        self.compact_mode = not self.device_list.compact
+        logger.info(f"☰ Modo compacto: {self.compact_mode}")
+        self.rerender_devices()
+
+    def refresh_devices(self):
+        """🔥 Refresh em segundo plano (pedidos sobrepostos viram uma só enumeração)"""
+        self._refresh_generation += 1
+        if self._refresh_running:
+            self._refresh_pending = True
+            return
+        self._start_refresh_worker()
+
+    def _start_refresh_worker(self):
+        generation = self._refresh_generation
+        show_unmounted = self.show_unmounted
+        self._refresh_running = True
+        self._refresh_pending = False
+        self._set_refreshing(True)
+        
+        def _enumerate():
+            devices: List[USBDevice] = []
+            unmounted: List[USBDevice] = []
+            ok = False
+            try:
+                with USBEjector.wmi.thread_scope():
+                    devices = USBEjector.get_removable_drives()
+                    if show_unmounted:
+                        unmounted = USBEjector.get_unmounted_usb_drives()
+                ok = True
+                USBEjector.io_activity.observe()
+            except Exception as e:
+                logger.error(f"❌ Erro enumeração: {e}")
+            try:
+                self.root.after(0, lambda: self._on_refresh_done(generation, devices, unmounted, ok))
+            except Exception:
+                pass  # Janela já fechada
+        
+        threading.Thread(target=_enumerate, daemon=True).start()
+
+    def _on_refresh_done(self, generation: int, devices: List[USBDevice], unmounted: List[USBDevice],
+                         ok: bool = True):
+        self._refresh_running = False
+        if self._refresh_pending or generation != self._refresh_generation:
+            # Chegou pedido mais novo durante a enumeração: descartar e rodar de novo
+            logger.debug(f"Refresh #{generation} descartado (atual #{self._refresh_generation})")
+            self._start_refresh_worker()
+            return
+        
+        self._set_refreshing(False)
+        if not ok:
+            # Enumeração falhou: manter o último snapshot, marcado como stale (como o do cache)
+            logger.warning(f"⚠️ Refresh #{generation} falhou: mantendo {len(self.devices)} dispositivo(s) anteriores")
+            for device in self.devices + self.unmounted_devices:
+                device.stale = True
+            self.rerender_devices()
+            return
+        self.devices = devices
+        self.unmounted_devices = unmounted
+        self.rerender_devices()
+        self._persist_devices()
+
+    def _persist_devices(self):
+        """Gravar a lista atual no cache (pula se nada mudou)"""
+        USBEjector.device_cache.save(self.devices + self.unmounted_devices)
+
+    def _set_refreshing(self, refreshing: bool):
+        """Indicador discreto no botão ↻"""
+        if self.refresh_btn is None:
+            return
+        try:
+            self.refresh_btn.configure(
+                text_color=self.theme.ACTION_PRIMARY if refreshing else self.theme.TEXT_SECONDARY
+            )
+        except Exception:
+            pass
+
+    def rerender_devices(self):
+        """Renderizar o último snapshot sem enumerar de novo"""
+        if USBEjector.lock_index is not None:
+            USBEjector.lock_index.set_watched_letters({d.letter for d in self.devices})
+        unmounted = self.unmounted_devices if self.show_unmounted else []
+        self.render_devices(self.devices + unmounted)
+
+    def render_devices(self, all_devs: List[USBDevice]):
+        """Lista virtual: filtrar e reconciliar só as linhas visíveis (custo independe do total)"""
+        start = time.perf_counter()
+        rows = self._filter_devices(all_devs)
+        compact = self._is_compact(len(all_devs))
+        if compact != self.device_list.compact:
+            self.device_list.compact = compact
+            self.compact_btn.configure(text="▭" if compact else "☰")
+        stats = self.device_list.set_items(rows)
+        
+        if not rows:
+            stats["widgets_created"] += self.show_empty_state("Nenhum resultado" if all_devs else "Nenhum USB")
+        elif self.empty_state is not None:
+            self.empty_state.place_forget()
+        
+        self._show_filter_bar(bool(self.filter_text) or len(all_devs) > self.filter_bar_threshold)
+        self.filter_count.configure(text=f"{len(rows)}/{len(all_devs)}" if self.filter_text else str(len(all_devs)))
+        
+        self.root.update_idletasks()
+        self.render_stats = {
+            **stats, "rows": len(rows), "cards": len(self.device_list.all_cards()),
+            "frame_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        logger.debug(f"🎨 Render: {self.render_stats}")
+
+    def show_empty_state(self, text: str) -> int:
+        if self.empty_state is not None:
+            self.empty_label.configure(text=text)
+            self.empty_state.place(relx=0.5, rely=0.4, anchor="center")
+            return 0
+        empty = ctk.CTkFrame(self.device_list.viewport, fg_color="transparent")
+        empty.place(relx=0.5, rely=0.4, anchor="center")
+        ctk.CTkLabel(empty, text="🔌", font=ctk.CTkFont(size=32)).pack()
+        self.empty_label = self._styled(
+            ctk.CTkLabel, empty, text=text, font=self.fonts['small'],
+            style={"text_color": "TEXT_SECONDARY"}
+        )
+        self.empty_label.pack(pady=(6, 0))
+        self.empty_state = empty
+        return 3
+
+    def mount_device(self, device: USBDevice):
+        """Montar USB"""
+        if device.stale:
+            return  # Ainda não confirmado pela enumeração
+        def _mount():
+            with USBEjector.wmi.thread_scope():
+                success, msg = USBEjector.mount_drive(device)
+            self.root.after(0, lambda: self._handle_mount_result(success, msg, device))
+        threading.Thread(target=_mount, daemon=True).start()
+
+    def _handle_mount_result(self, success: bool, msg: str, device: USBDevice):
+        if success:
+            CTkMessagebox(title="Sucesso", message=f"✓ {device.label}\n\n{msg}", icon="check")
+            self.root.after(1500, self.refresh_devices)
+        else:
+            CTkMessagebox(title="Erro", message=f"Falha:\n{msg}", icon="warning")
+
+    def update_progress(self, letter: str, progress: int, info: Optional[Dict] = None):
+        """Atualizar barra SEM redesenhar"""
+        self.eject_progress[letter] = progress
+        status = self._progress_status(info)
+        if status != self.eject_status.get(letter, ""):
+            self.eject_status[letter] = status
+            card = self.device_list.visible.get(f"vol:{letter}")
+            if card is not None:
+                card.update(card.device)
+        self.progress_anim.set_target(letter, progress)
+
+    def _apply_progress(self, letter: str, value: float):
+        """Desenhar um quadro da barra (chamado pelo ProgressAnimator)"""
+        bar = self.progress_bars.get(letter)
+        if bar is not None:
+            try:
+                bar.place_configure(relwidth=value / 100)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _progress_status(info: Optional[Dict]) -> str:
+        """Descrição curta de uma espera reportada pelo pipeline de ejeção"""
+        stage = info.get("stage") if info else None
+        if stage == "lock":
+            holder = f" • {info['holder']}" if info.get("holder") else ""
+            return f"🔒 Aguardando lock {info['remaining']:.0f}s{holder}"
+        if stage == "flush":
+            eta = f" • {info['eta']:.0f}s" if info.get("eta") is not None else ""
+            return f"💾 {info['bytes'] / 1024 ** 2:.0f} MB • {info['throughput'] / 1024 ** 2:.1f} MB/s{eta}"
+        return ""
+
+    def eject_device(self, device: USBDevice):
+        """🔥 Ejeção SEM PISCAR"""
+        if device.stale:
+            return  # Ainda não confirmado pela enumeração
+        letter = device.letter
+        now = time.time()
+        
+        # Debounce
+        if letter in self.last_click_time:
+            if now - self.last_click_time[letter] < 1.5:
+                return
+        self.last_click_time[letter] = now
+        
+        if letter in self.ejecting_drives:
+            return
+        
+        # Marcar como ejetando
+        self.ejecting_drives.add(letter)
+        self.eject_progress[letter] = 0
+        
+        # 🔥 Render IMEDIATO (sem enumerar) para mostrar barra desde início
+        self.rerender_devices()
+        
+        def progress_cb(p, info=None):
+            self.root.after(0, lambda: self.update_progress(letter, p, info))
+        
+        eject_mode = self.eject_mode
+        
+        def _eject():
+            try:
+                # MODO RÁPIDO: pula verificação de processos; AUTO decide pela atividade de I/O
+                safe_mode = eject_mode == "safe"
+                if eject_mode == "auto":
+                    safe_mode, _ = USBEjector.choose_safe_mode(letter)
+                if safe_mode:
+                    safe, msg, procs = USBEjector.verify_safe_to_eject(letter)
+                    if not safe and procs:
+                        self.root.after(0, lambda: self.show_lock_warning(device, procs))
+                        return
+                success, result = USBEjector.eject_drive(letter, progress_cb, safe_mode=safe_mode)
+                self.root.after(0, lambda: self._handle_eject_result(success, result, device))
+            finally:
+                if letter in self.ejecting_drives:
+                    self.ejecting_drives.remove(letter)
+                if letter in self.eject_progress:
+                    del self.eject_progress[letter]
+                self.eject_status.pop(letter, None)
+                if letter in self.progress_bars:
+                    del self.progress_bars[letter]
+                if letter in self.progress_containers:
+                    del self.progress_containers[letter]
+                self.root.after(0, lambda: self.progress_anim.remove(letter))
+                self.root.after(300, self.refresh_devices)
+        
+        threading.Thread(target=_eject, daemon=True).start()
+
+    def toggle_selection(self, device: USBDevice):
+        """Ctrl+clique: selecionar/desselecionar para ejeção em lote"""
+        if device.stale or device.letter in self.ejecting_drives:
+            return
+        self.selected_letters ^= {device.letter}
+        self.rerender_devices()
+
+    def eject_all_devices(self):
+        """⏏ Ejetar selecionados (ou todos, sem seleção) de uma vez"""
+        mounted = {d.letter: d for d in self.devices if not d.stale and d.letter not in self.ejecting_drives}
+        letters = [l for l in sorted(mounted) if l in self.selected_letters] or sorted(mounted)
+        if not letters:
+            return
+        eject_mode = self.eject_mode
+        
+        for letter in letters:
+            self.ejecting_drives.add(letter)
+            self.eject_progress[letter] = 0
+        self.selected_letters -= set(letters)
+        self.rerender_devices()
+        
+        def progress_cb(letter, p, info=None):
+            self.root.after(0, lambda: self.update_progress(letter, p, info))
+        
+        def _eject_all():
+            results = {}
+            try:
+                results = USBEjector.eject_drives(letters, progress_cb, mode=eject_mode)
+            finally:
+                for letter in letters:
+                    self.ejecting_drives.discard(letter)
+                    self.eject_progress.pop(letter, None)
+                    self.eject_status.pop(letter, None)
+                    self.progress_bars.pop(letter, None)
+                    self.progress_containers.pop(letter, None)
+                    self.root.after(0, lambda l=letter: self.progress_anim.remove(l))
+                self.root.after(0, lambda: self._handle_batch_result(results, mounted))
+        
+        threading.Thread(target=_eject_all, daemon=True).start()
+
+    def _handle_batch_result(self, results: Dict[str, Tuple[bool, str, List[ProcessInfo]]],
+                             devices: Dict[str, USBDevice]):
+        """Resumo por unidade da ejeção em lote"""
+        lines = []
+        for letter in sorted(results):
+            success, msg, procs = results[letter]
+            label = devices[letter].label if letter in devices else f"{letter}:"
+            lines.append(f"{'✓' if success else '✗'} {letter}: {label[:16]} — {msg if not success else 'removido'}")
+        ok = all(r[0] for r in results.values())
+        CTkMessagebox(
+            title="Ejeção em lote",
+            message="\n".join(lines) or "Nenhuma unidade",
+            icon="check" if ok else "warning"
+        )
+        self.refresh_devices()
+
+    def show_context_menu(self, device: USBDevice, x: int, y: int):
+        """🎯 MENU CONTEXTO COM EXPLORER"""
+        if device.stale or device.letter in self.ejecting_drives:
+            return
+        
+        menu = ctk.CTkToplevel(self.root)
+        menu.overrideredirect(True)
+        menu.attributes("-topmost", True)
+        menu.geometry(f"180x120+{x}+{y}")  # +30px altura
+        menu.configure(fg_color=self.theme.BG_SECONDARY)
+        
+        frame = ctk.CTkFrame(
+            menu, fg_color=self.theme.BG_SECONDARY, corner_radius=6,
+            border_width=1, border_color=self.theme.BORDER
+        )
+        frame.pack(fill="both", expand=True, padx=3, pady=3)
+        
+        # 🆕 OPÇÃO ABRIR NO EXPLORER
+        ctk.CTkButton(
+            frame, text="📂 Abrir no Explorer", fg_color="transparent", hover_color=self.theme.BG_TERTIARY,
+            anchor="w", height=26, font=self.fonts['small'], 
+            text_color=self.theme.TEXT_PRIMARY,
+            command=lambda: [menu.destroy(), self.open_in_explorer(device)]
+        ).pack(fill="x", padx=4, pady=(4, 2))
+        
+        for txt, cmd in [
+            ("Ejetar", lambda: [menu.destroy(), self.eject_device(device)]),
+            ("Ver Bloqueios", lambda: [menu.destroy(), self.check_locks(device)]),
+            ("Forçar Ejeção", lambda: [menu.destroy(), self.force_eject(device)])
+        ]:
+            ctk.CTkButton(
+                frame, text=txt, fg_color="transparent", hover_color=self.theme.BG_TERTIARY,
+                anchor="w", height=26, font=self.fonts['small'], 
+                text_color=self.theme.ACTION_WARNING if "Forçar" in txt else self.theme.TEXT_PRIMARY,
+                command=cmd
+            ).pack(fill="x", padx=4, pady=2)
+        
+        
+        # About - Créditos
+        ctk.CTkButton(
+            frame, text="ℹ️ About - by olverclock",
+            fg_color="transparent",
+            hover_color=self.theme.BG_TERTIARY,
+            anchor="w", height=26,
+            font=self.fonts["small"],
+            text_color=self.theme.TEXT_TERTIARY,
+            command=lambda: (menu.destroy(), self.show_about())
+        ).pack(fill="x", padx=4, pady=(2, 4))
+
+        self.root.after(100, lambda: self.root.bind("<Button-1>", lambda e: menu.destroy()))
+
+    def open_in_explorer(self, device: USBDevice):
+        """🆕 Abrir USB no Windows Explorer"""
+        try:
+            path = f"{device.letter}:\\"
+            os.startfile(path)
+            logger.info(f"📂 Abrindo {path} no Explorer")
+        except Exception as e:
+            logger.error(f"❌ Erro ao abrir Explorer: {e}")
+            CTkMessagebox(title="Erro", message=f"Não foi possível abrir:\n{str(e)}", icon="warning")
+
+    def check_locks(self, device: USBDevice):
+        """Verificar processos"""
+        def _check():
+            procs = USBEjector.find_locking_processes(device.letter)
+            self.root.after(0, lambda: self._show_lock_result(device, procs))
+        threading.Thread(target=_check, daemon=True).start()
+
+    def _show_lock_result(self, device: USBDevice, procs: List[ProcessInfo]):
+        if not procs:
+            CTkMessagebox(title="Verificação", message=f"✓ Nenhum bloqueio\n\nSeguro para ejetar {device.label}", icon="check")
+        else:
+            self.show_lock_warning(device, procs)
+
+    def show_lock_warning(self, device: USBDevice, procs: List[ProcessInfo]):
+        """Diálogo processos"""
+        if device.letter in self.ejecting_drives:
+            self.ejecting_drives.remove(device.letter)
+            self.rerender_devices()
+        
+        dlg = ctk.CTkToplevel(self.root)
+        dlg.title("Processos Bloqueando")
+        dlg.geometry("320x280")
+        dlg.transient(self.root)
+        dlg.grab_set()
+        dlg.configure(fg_color=self.theme.BG_PRIMARY)
+        
+        ctk.CTkLabel(
+            dlg, text=f"⚠ {len(procs)} processo(s) usando {device.letter}:",
+            font=self.fonts['body']
+        ).pack(pady=10)
+        
+        scroll = ctk.CTkScrollableFrame(dlg, fg_color=self.theme.BG_SECONDARY, corner_radius=6)
+        scroll.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        
+        for proc in procs:
+            pf = ctk.CTkFrame(scroll, fg_color=self.theme.BG_TERTIARY, corner_radius=6)
+            pf.pack(fill="x", pady=3)
+            
+            info = ctk.CTkFrame(pf, fg_color="transparent")
+            info.pack(side="left", fill="both", expand=True, padx=8, pady=6)
+            
+            ctk.CTkLabel(info, text=proc.name, font=self.fonts['small'], anchor="w", text_color=self.theme.TEXT_PRIMARY).pack(fill="x")
+            ctk.CTkLabel(info, text=f"PID {proc.pid}", font=self.fonts['micro'], text_color=self.theme.TEXT_TERTIARY, anchor="w").pack(fill="x")
+            
+            ctk.CTkButton(
+                pf, text="✖", width=28, height=28, corner_radius=999,
+                fg_color=self.theme.ACTION_DANGER, hover_color="#b01f23",
+                font=self.fonts['icon_small'],
+                command=lambda p=proc: self._kill_and_retry(p, device, dlg)
+            ).pack(side="right", padx=6)
+        
+        btns = ctk.CTkFrame(dlg, fg_color="transparent")
+        btns.pack(fill="x", padx=10, pady=(0, 10))
+        
+        ctk.CTkButton(
+            btns, text="Cancelar", height=32, corner_radius=6,
+            fg_color=self.theme.BG_TERTIARY, hover_color=self.theme.BORDER_FOCUS,
+            font=self.fonts['small'], command=dlg.destroy
+        ).pack(side="left", fill="x", expand=True, padx=(0, 4))
+        
+        ctk.CTkButton(
+            btns, text="Encerrar Tudo", height=32, corner_radius=6,
+            fg_color=self.theme.ACTION_DANGER, hover_color="#b01f23",
+            font=self.fonts['small'],
+            command=lambda: [dlg.destroy(), self._force_eject_all(device, procs)]
+        ).pack(side="right", fill="x", expand=True, padx=(4, 0))
+
+    def _kill_and_retry(self, proc: ProcessInfo, device: USBDevice, dlg):
+        if USBEjector.kill_process(proc.pid):
+            dlg.destroy()
+            self.root.after(200, lambda: self.eject_device(device))
+
+    def force_eject(self, device: USBDevice):
+        """Forçar ejeção"""
+        def _force():
+            procs = USBEjector.find_locking_processes(device.letter)
+            if procs:
+                self.root.after(0, lambda: self._confirm_force(device, procs))
+            else:
+                self.eject_device(device)
+        threading.Thread(target=_force, daemon=True).start()
+
+    def _confirm_force(self, device: USBDevice, procs: List[ProcessInfo]):
+        mb = CTkMessagebox(
+            title="Confirmar", 
+            message=f"Encerrar {len(procs)} processo(s)?\n\n⚠ Dados não salvos serão perdidos!",
+            icon="warning", option_1="Cancelar", option_2="Forçar"
+        )
+        if mb.get() == "Forçar":
+            self._force_eject_all(device, procs)
+
+    def _force_eject_all(self, device: USBDevice, procs: List[ProcessInfo]):
+        def _force():
+            for proc in procs:
+                USBEjector.kill_process(proc.pid)
+                time.sleep(0.1)
+            time.sleep(0.05)
+            success, msg = USBEjector.eject_drive(device.letter)
+            self.root.after(0, lambda: self._handle_eject_result(success, msg, device))
+        threading.Thread(target=_force, daemon=True).start()
+
+    def _handle_eject_result(self, success: bool, msg: str, device: USBDevice):
+        if device.letter in self.ejecting_drives:
+            self.ejecting_drives.remove(device.letter)
+        
+        if success:
+            CTkMessagebox(title="Sucesso", message=f"✓ {device.label} ejetado\n\nPode remover o dispositivo.", icon="check")
+            self.root.after(300, self.refresh_devices)
+        else:
+            CTkMessagebox(title="Erro", message=f"Falha:\n{msg}", icon="warning")
+            self.refresh_devices()
+
+    def show_about(self):
+        """Mostrar informações sobre o desenvolvedor"""
+        try:
+            CTkMessagebox(
+                title="About - USB Safe Ejector Pro",
+                message="USB Safe Ejector Pro v7.3\n\n"
+                       "Desenvolvido por: olverclock\n\n"
+                       "✨ Recursos:\n"
+                       "• Ejeção rápida e segura\n"
+                       "• Detecção inteligente de USBs\n"
+                       "• Interface moderna\n"
+                       "• Modo claro/escuro\n\n"
+                       "© 2025 olverclock",
+                icon="info",
+                option_1="OK"
+            )
+        except:
+            logger.info("About: Desenvolvido por olverclock")
+
+    def run(self):
+        logger.info("=== USB Safe Ejector Pro v7.2 PROFESSIONAL FIX ===")
+        self.root.mainloop()
+
+
+def main(show_startup_report: bool = False):
+    try:
+        app = PremiumUSBEjectorGUI(show_startup_report)
+        app.run()
+    except Exception as e:
+        logger.error(f"Erro fatal: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()